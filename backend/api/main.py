@@ -0,0 +1,335 @@
+"""
+Read API for DeFi Terrain Protocol
+----------------------------------
+Async HTTP API served from the in-memory position book
+- paginated positions (cursor based)
+- liquidatable positions
+- per-token risk (risk_engine)
+- price history
+- SSE stream of per-block updates (stream.py)
+- events forwarded to the security supervisor (offchain_security)
+
+No RPC call is issued per request: the book is fed by
+the events listener running in a background thread.
+Responses are cached per book version, with ETag and gzip.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+
+from aiohttp import web
+
+from position_book import PositionBook, DEFAULT_PAGE_SIZE
+from risk_engine import assess_position
+from stream import UpdateHub, stream_updates
+from settings import EVENT_STORE_PATH, SECURITY_STATE_PATH
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", 8080))
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1_024
+RESPONSE_CACHE_SIZE = 4_096
+
+# -------------------------------------------------
+# RESPONSE CACHE
+# -------------------------------------------------
+
+class ResponseCache:
+    """
+    Serialized responses keyed by path+query
+
+    An entry is valid while the book version has not changed,
+    so JSON encoding and gzip run once per (query, version).
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key: str, version: int):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry
+
+    def put(self, key: str, version: int, etag: str, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        gzipped = gzip.compress(body, 5) if len(body) >= GZIP_MIN_SIZE else None
+
+        if len(self._entries) >= self.max_entries:
+            # entries of older versions are dead anyway
+            self._entries.clear()
+
+        entry = (version, etag, body, gzipped)
+        self._entries[key] = entry
+        return entry
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+
+def _int_param(request, name, default=None):
+    value = request.query.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"invalid {name}: {value}")
+
+
+def _float_param(request, name, default=None):
+    value = request.query.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"invalid {name}: {value}")
+
+
+def _page_payload(book, items, next_cursor):
+    return {
+        "block_number": book.block_number,
+        "count": len(items),
+        "next_cursor": next_cursor,
+        "items": [p.to_dict() for p in items],
+    }
+
+
+def cached(handler):
+    """
+    ETag / block-number caching + gzip for read handlers
+
+    The handler returns a JSON-serializable payload.
+    """
+    async def wrapper(request):
+        book = request.app["book"]
+        cache = request.app["cache"]
+
+        version = book.version
+        etag = book.etag()
+
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(
+                status=304,
+                headers={"ETag": etag, "X-Block-Number": str(book.block_number)}
+            )
+
+        key = request.path_qs
+        entry = cache.get(key, version)
+        if entry is None:
+            payload = handler(request, book)
+            entry = cache.put(key, version, etag, payload)
+
+        _, etag, body, gzipped = entry
+        headers = {
+            "ETag": etag,
+            "X-Block-Number": str(book.block_number),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        if gzipped is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = gzipped
+
+        return web.Response(
+            body=body,
+            content_type="application/json",
+            headers=headers
+        )
+
+    return wrapper
+
+# -------------------------------------------------
+# HANDLERS
+# -------------------------------------------------
+
+async def health(request):
+    book = request.app["book"]
+    return web.json_response({
+        "status": "ok",
+        "block_number": book.block_number,
+        "positions": len(book),
+    })
+
+
+@cached
+def list_positions(request, book):
+    items, next_cursor = book.page(
+        cursor=_int_param(request, "cursor"),
+        limit=_int_param(request, "limit", DEFAULT_PAGE_SIZE),
+        owner=request.query.get("owner"),
+    )
+    return _page_payload(book, items, next_cursor)
+
+
+@cached
+def get_position(request, book):
+    token_id = int(request.match_info["token_id"])
+    position = book.get(token_id)
+    if position is None:
+        raise web.HTTPNotFound(text=f"no position for tokenId {token_id}")
+    return position.to_dict()
+
+
+@cached
+def list_liquidatable(request, book):
+    items, next_cursor = book.page(
+        cursor=_int_param(request, "cursor"),
+        limit=_int_param(request, "limit", DEFAULT_PAGE_SIZE),
+        max_health_factor=_float_param(request, "threshold", 1.0),
+    )
+    return _page_payload(book, items, next_cursor)
+
+
+@cached
+def get_risk(request, book):
+    token_id = int(request.match_info["token_id"])
+    position = book.get(token_id)
+    if position is None:
+        raise web.HTTPNotFound(text=f"no position for tokenId {token_id}")
+
+    risk = assess_position(
+        token_id=token_id,
+        price=position.price,
+        debt=position.debt,
+        rarity=position.rarity or "COMMON",
+        volatility=_float_param(request, "volatility", 0.0),
+        zone_risk=_float_param(request, "zone_risk", 0.0),
+    )
+    if risk["health_factor"] == float("inf"):
+        risk["health_factor"] = None
+
+    risk["block_number"] = book.block_number
+    return risk
+
+
+@cached
+def get_price_history(request, book):
+    token_id = int(request.match_info["token_id"])
+    points = book.history(token_id, since_block=_int_param(request, "since"))
+    return {
+        "tokenId": token_id,
+        "block_number": book.block_number,
+        "prices": [{"block": b, "price": p} for b, p in points],
+    }
+
+# -------------------------------------------------
+# APP
+# -------------------------------------------------
+
+async def _bind_hub(app):
+    app["hub"].bind(asyncio.get_running_loop())
+
+
+def create_app(book: PositionBook = None, hub: UpdateHub = None) -> web.Application:
+    app = web.Application()
+    app["book"] = book if book is not None else PositionBook()
+    app["hub"] = hub if hub is not None else UpdateHub(app["book"])
+    app["cache"] = ResponseCache()
+    app.on_startup.append(_bind_hub)
+
+    app.router.add_get("/health", health)
+    app.router.add_get("/positions", list_positions)
+    app.router.add_get("/positions/{token_id:\\d+}", get_position)
+    app.router.add_get("/liquidatable", list_liquidatable)
+    app.router.add_get("/risk/{token_id:\\d+}", get_risk)
+    app.router.add_get("/prices/{token_id:\\d+}", get_price_history)
+    app.router.add_get("/stream", stream_updates)
+
+    return app
+
+
+def start_supervisor():
+    """
+    Security supervisor (offchain_security), guard state
+    restored from SECURITY_STATE_PATH
+    """
+    from state_store import SecurityStateStore
+    from supervisor import Supervisor
+
+    return Supervisor(store=SecurityStateStore(SECURITY_STATE_PATH)).start()
+
+
+def start_indexer(book: PositionBook, hub: UpdateHub = None, supervisor=None):
+    """
+    Seed the book, then follow events in a background thread
+    (and push them to the hub and the security supervisor)
+
+    Cold start uses the local event store when one exists: it is
+    backfilled to the head first, then replayed (last snapshot +
+    tail), so the listener only catches up on the blocks mined
+    since. Polled ranges are appended to the store. Without a
+    store, the book is seeded by a full RPC sync.
+    """
+    import events_listener
+    from sync import full_sync, sync_prices, w3
+
+    store_path = None
+
+    if os.path.exists(EVENT_STORE_PATH):
+        from event_store import EventStore
+        from backfill import backfill
+        from replay import replay
+
+        store_path = EVENT_STORE_PATH
+        store = EventStore(EVENT_STORE_PATH)
+        try:
+            # history is ingested here, not replayed through the
+            # listener (and pushed to the hub / supervisor as live)
+            backfill(store, to_block=w3.eth.block_number)
+            replayed = replay(store)
+        finally:
+            store.close()
+
+        book.load(
+            [p.to_dict() for p in replayed.positions.values()],
+            block_number=replayed.block_number
+        )
+        sync_prices(book)
+    else:
+        # pinned: events after `block` are left to the listener
+        block = w3.eth.block_number
+        book.load(full_sync(block), block_number=block)
+
+    callbacks = []
+    if hub is not None:
+        hub.prime()
+        callbacks.append(hub.publish)
+    if supervisor is not None:
+        callbacks.append(supervisor.on_events)
+
+    def on_events(events, to_block):
+        for callback in callbacks:
+            callback(events, to_block)
+
+    thread = threading.Thread(
+        target=events_listener.run,
+        kwargs={"book": book, "on_events": on_events, "store_path": store_path},
+        name="events-listener",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+# -------------------------------------------------
+# ENTRYPOINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    book = PositionBook()
+    hub = UpdateHub(book)
+    start_indexer(book, hub, start_supervisor())
+
+    print(f"[🌐] API listening on {API_HOST}:{API_PORT}")
+    web.run_app(create_app(book, hub), host=API_HOST, port=API_PORT, access_log=None)
@@ -0,0 +1,331 @@
+"""
+Update Stream
+-------------
+Server-Sent-Events push of per-block deltas:
+- positions whose health factor bucket changed
+- liquidations (CollateralSeized)
+- oracle price updates
+- governance events
+
+Deltas are coalesced per block and encoded once,
+then filtered per subscriber (tokenId, owner, HF threshold).
+"""
+
+import asyncio
+import json
+
+from aiohttp import web
+
+from risk_engine import SAFE_HF, WARNING_HF, LIQUIDATION_HF
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+SUBSCRIBER_QUEUE_SIZE = 256   # blocks buffered per slow consumer
+HEARTBEAT_INTERVAL = 15       # seconds
+
+TOPICS = ("positions", "liquidations", "prices", "governance")
+
+LIQUIDATION_EVENTS = {"CollateralSeized"}
+PRICE_EVENTS = {"PriceUpdated"}
+GOVERNANCE_EVENTS = {"ProposalCreated", "ProposalExecuted"}
+
+# -------------------------------------------------
+# HEALTH FACTOR BUCKETS (same bands as risk_engine)
+# -------------------------------------------------
+
+def hf_bucket(hf: float) -> str:
+    if hf >= SAFE_HF:
+        return "SAFE"
+    if hf >= WARNING_HF:
+        return "WARNING"
+    if hf >= LIQUIDATION_HF:
+        return "DANGER"
+    return "LIQUIDATABLE"
+
+# -------------------------------------------------
+# SUBSCRIPTION
+# -------------------------------------------------
+
+class Subscription:
+    """
+    One stream consumer
+
+    Empty filters match everything. A position/liquidation item
+    matches if any of tokenIds / owners / threshold matches.
+    """
+
+    def __init__(
+        self,
+        token_ids: set = None,
+        owners: set = None,
+        threshold: float = None,
+        topics: set = None
+    ):
+        self.token_ids = token_ids or set()
+        self.owners = {o.lower() for o in owners or ()}
+        self.threshold = threshold
+        self.topics = set(topics) if topics else set(TOPICS)
+
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    @property
+    def unfiltered(self) -> bool:
+        return (
+            not self.token_ids
+            and not self.owners
+            and self.threshold is None
+            and self.topics == set(TOPICS)
+        )
+
+    def _match(self, item: dict) -> bool:
+        if not self.token_ids and not self.owners and self.threshold is None:
+            return True
+        if item.get("tokenId") in self.token_ids:
+            return True
+        owner = item.get("owner") or item.get("user")
+        if owner is not None and owner.lower() in self.owners:
+            return True
+        hf = item.get("health_factor")
+        return self.threshold is not None and hf is not None and hf < self.threshold
+
+    def filter(self, message: dict) -> dict:
+        """
+        Subscriber view of a block message (None if nothing matches)
+        """
+        out = {"block": message["block"]}
+        matched = False
+
+        for topic in self.topics:
+            items = message.get(topic)
+            if not items:
+                continue
+            if topic in ("positions", "liquidations"):
+                items = [i for i in items if self._match(i)]
+            if items:
+                out[topic] = items
+                matched = True
+
+        return out if matched else None
+
+    def offer(self, block: int, data: bytes):
+        # never block the publisher: drop the oldest block for slow consumers
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((block, data))
+
+# -------------------------------------------------
+# HUB
+# -------------------------------------------------
+
+class UpdateHub:
+    """
+    Builds per-block deltas from the listener and fans them out
+
+    publish() is called from the listener thread; delivery runs
+    on the API event loop.
+    """
+
+    def __init__(self, book):
+        self.book = book
+        self.subscribers = set()
+        self._buckets = {}    # tokenId -> last published HF bucket
+        self._owners = {}     # tokenId -> owner (kept for CLOSED deltas)
+        self._loop = None
+
+    def bind(self, loop):
+        self._loop = loop
+
+    def prime(self):
+        """
+        Record current buckets without publishing (after a full load)
+        """
+        self.book.drain_dirty()
+        positions = list(self.book.positions.items())
+        self._buckets = {
+            token_id: hf_bucket(position.health_factor)
+            for token_id, position in positions
+        }
+        self._owners = {
+            token_id: position.owner
+            for token_id, position in positions
+        }
+
+    # ------------------
+    # Subscriptions
+    # ------------------
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    # ------------------
+    # Delta building
+    # ------------------
+
+    def _position_deltas(self) -> list:
+        deltas = []
+
+        for token_id in sorted(self.book.drain_dirty()):
+            position = self.book.get(token_id)
+            previous = self._buckets.get(token_id)
+
+            if position is None:
+                owner = self._owners.pop(token_id, None)
+                if previous is not None:
+                    del self._buckets[token_id]
+                    deltas.append({
+                        "tokenId": token_id,
+                        "owner": owner,
+                        "from": previous,
+                        "to": "CLOSED",
+                    })
+                continue
+
+            self._owners[token_id] = position.owner
+            hf = position.health_factor
+            bucket = hf_bucket(hf)
+            if bucket == previous:
+                continue
+
+            self._buckets[token_id] = bucket
+            deltas.append({
+                "tokenId": token_id,
+                "owner": position.owner,
+                "health_factor": hf if hf != float("inf") else None,
+                "from": previous,
+                "to": bucket,
+            })
+
+        return deltas
+
+    def build_messages(self, events: list, to_block: int) -> list:
+        """
+        One message per block; HF deltas are attached to `to_block`
+        since the book is only consistent at the end of the range
+        """
+        blocks = {}
+
+        def message(block):
+            return blocks.setdefault(block, {"block": block})
+
+        for event in events:
+            name = event["event"]
+            args = dict(event["args"])
+            block = event["blockNumber"]
+
+            if name in LIQUIDATION_EVENTS:
+                topic = "liquidations"
+            elif name in PRICE_EVENTS:
+                topic = "prices"
+            elif name in GOVERNANCE_EVENTS:
+                topic = "governance"
+            else:
+                continue
+
+            args["event"] = name
+            args["tx"] = event["transactionHash"].hex()
+            message(block).setdefault(topic, []).append(args)
+
+        deltas = self._position_deltas()
+        if deltas:
+            message(to_block)["positions"] = deltas
+
+        return [blocks[b] for b in sorted(blocks)]
+
+    # ------------------
+    # Fan-out
+    # ------------------
+
+    def publish(self, events: list, to_block: int):
+        """
+        Listener callback (events_listener.poll on_events)
+        """
+        messages = self.build_messages(events, to_block)
+        if messages and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, messages)
+
+    def _deliver(self, messages: list):
+        for message in messages:
+            shared = None   # encoded once for all unfiltered subscribers
+
+            for sub in list(self.subscribers):
+                if sub.unfiltered:
+                    if shared is None:
+                        shared = _encode(message)
+                    sub.offer(message["block"], shared)
+                    continue
+
+                view = sub.filter(message)
+                if view is not None:
+                    sub.offer(message["block"], _encode(view))
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":"), default=str).encode()
+
+# -------------------------------------------------
+# SSE HANDLER
+# -------------------------------------------------
+
+def _csv(request, name) -> set:
+    value = request.query.get(name, "")
+    return {v for v in value.split(",") if v}
+
+
+async def stream_updates(request):
+    """
+    GET /stream?tokenId=1,2&owner=0x..&threshold=1.1&topics=positions,liquidations
+    """
+    hub = request.app["hub"]
+
+    try:
+        token_ids = {int(t) for t in _csv(request, "tokenId")}
+        threshold = request.query.get("threshold")
+        threshold = float(threshold) if threshold else None
+    except ValueError:
+        raise web.HTTPBadRequest(text="invalid tokenId or threshold")
+
+    topics = _csv(request, "topics")
+    if topics - set(TOPICS):
+        raise web.HTTPBadRequest(text=f"unknown topics: {topics - set(TOPICS)}")
+
+    sub = hub.subscribe(Subscription(
+        token_ids=token_ids,
+        owners=_csv(request, "owner"),
+        threshold=threshold,
+        topics=topics,
+    ))
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+
+    try:
+        while True:
+            try:
+                block, data = await asyncio.wait_for(
+                    sub.queue.get(), HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                await response.write(b": ping\n\n")
+                continue
+
+            await response.write(
+                b"id: %d\nevent: block\ndata: %s\n\n" % (block, data)
+            )
+    except ConnectionResetError:
+        pass
+    finally:
+        hub.unsubscribe(sub)
+
+    return response
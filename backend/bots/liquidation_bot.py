@@ -4,6 +4,8 @@ Liquidation Bot for NFT-backed Lending Protocol
 - Monitors NFT collateral positions
 - Checks health factor via oracle & lending pool
 - Triggers liquidation when under threshold
+- Scans positions by forecast risk tier (hot every block, cold rarely)
+- Sends liveness heartbeats to the security supervisor
 
 Requirements:
 - web3.py
@@ -12,8 +14,14 @@ Requirements:
 
 import time
 import os
+from typing import List, Tuple
 from web3 import Web3
 from dotenv import load_dotenv
+from gas_oracle import GasOracle
+from interest_simulator import RAY, get_borrow_rate
+from liquidation_forecaster import LiquidationForecaster, ScanScheduler
+from position_book import PositionBook
+from state_store import SecurityStateStore
 
 # -------------------------------------------------
 # ENVIRONMENT
@@ -29,10 +37,19 @@ LENDING_POOL = os.getenv("LENDING_POOL")
 LIQUIDATION_MANAGER = os.getenv("LIQUIDATION_MANAGER")
 NFT_COLLATERAL_MANAGER = os.getenv("NFT_COLLATERAL_MANAGER")
 ORACLE = os.getenv("PRICE_ORACLE")
-
-CHECK_INTERVAL = 30  # seconds
+TERRAIN_NFT = os.getenv("TERRAIN_NFT")
+SECURITY_STATE_PATH = os.getenv("SECURITY_STATE_PATH", "security_state.db")
+
+BLOCK_POLL_INTERVAL = 2  # seconds between new-block polls
+HEARTBEAT_INTERVAL = 60  # seconds between liveness heartbeats
+VOLATILITY_REFRESH_BLOCKS = 300  # re-estimate zone / rarity volatility
+MAX_TOKEN_ID = 10_000  # adapt to NFT supply
+MAX_GAS_LIMIT = 600_000
 LIQUIDATION_THRESHOLD_WAD = 1e18  # HF < 1 => liquidatable
 
+# TerrainNFT rarity (uint) -> PositionBook / ltv_calculator label
+RARITY_LABELS = ("COMMON", "RARE", "EPIC", "LEGENDARY")
+
 # -------------------------------------------------
 # WEB3 SETUP
 # -------------------------------------------------
@@ -42,14 +59,20 @@ assert w3.is_connected(), "RPC not connected"
 
 account = w3.eth.account.from_key(PRIVATE_KEY)
 
+gas_oracle = GasOracle(w3)
+
+# heartbeats read by the supervisor (Keeper_guard)
+heartbeats = SecurityStateStore(SECURITY_STATE_PATH)
+
 # -------------------------------------------------
 # ABI PLACEHOLDERS (replace with real ABIs)
 # -------------------------------------------------
 
-LENDING_POOL_ABI = []              # getUserDebt(), getNFTDebt()
+LENDING_POOL_ABI = []              # getUserDebt(), getNFTDebt(), total_borrowed(), total_liquidity()
 NFT_MANAGER_ABI = []               # isCollateral(), ownerOfCollateral()
 ORACLE_ABI = []                    # getNFTPrice()
 LIQUIDATION_MANAGER_ABI = []       # liquidate()
+TERRAIN_NFT_ABI = []               # zone(), rarity()
 
 lending_pool = w3.eth.contract(
     address=LENDING_POOL,
@@ -71,44 +94,90 @@ liquidation_manager = w3.eth.contract(
     abi=LIQUIDATION_MANAGER_ABI
 )
 
+terrain_nft = w3.eth.contract(
+    address=TERRAIN_NFT,
+    abi=TERRAIN_NFT_ABI
+)
+
 # -------------------------------------------------
 # HELPERS
 # -------------------------------------------------
 
-def get_health_factor(token_id: int) -> float:
+def get_position(token_id: int):
     """
-    HF = collateral_value / debt
+    (owner, price, debt), or None without a collateral owner
     """
     owner = nft_manager.functions.ownerOfCollateral(token_id).call()
     if owner == "0x0000000000000000000000000000000000000000":
-        return float("inf")
+        return None
 
     debt = lending_pool.functions.getNFTDebt(token_id).call()
     if debt == 0:
-        return float("inf")
+        return owner, 0, 0
 
     price = oracle.functions.getNFTPrice(
         NFT_COLLATERAL_MANAGER,
         token_id
     ).call()
 
+    return owner, price, debt
+
+
+def get_traits(token_id: int):
+    """
+    (zone, rarity label) of a terrain NFT (immutable, read once per
+    position), or (None, None) when they cannot be read: TerrainNFT
+    does not expose zone / rarity getters on every deployment, and
+    the forecaster then falls back to the global volatility
+    """
+    try:
+        zone = terrain_nft.functions.zone(token_id).call()
+        rarity = terrain_nft.functions.rarity(token_id).call()
+    except Exception as e:
+        print(f"[⚠️] NFT {token_id} traits unavailable: {e}")
+        return None, None
+
+    label = RARITY_LABELS[rarity] if 0 <= rarity < len(RARITY_LABELS) else None
+    return zone or None, label
+
+
+def get_health_factor(token_id: int) -> float:
+    """
+    HF = collateral_value / debt
+    """
+    position = get_position(token_id)
+    if position is None or position[2] == 0:
+        return float("inf")
+
+    _, price, debt = position
     return price / debt
 
 
+def current_borrow_rate() -> float:
+    """
+    Annual borrow rate (InterestRateStrategy curve)
+    """
+    borrowed = lending_pool.functions.total_borrowed().call()
+    liquidity = lending_pool.functions.total_liquidity().call()
+    return get_borrow_rate(borrowed, liquidity) / RAY
+
+
 def liquidate(token_id: int):
     """
     Calls liquidation manager
     """
     nonce = w3.eth.get_transaction_count(BOT_ADDRESS)
 
+    # liquidations are competitive: bid in the high urgency tier
     tx = liquidation_manager.functions.liquidate(
         token_id
     ).build_transaction({
         "from": BOT_ADDRESS,
         "nonce": nonce,
-        "gas": 600_000,
-        "gasPrice": w3.eth.gas_price
+        "gas": MAX_GAS_LIMIT,
+        **gas_oracle.fees("high"),
     })
+    tx["gas"] = gas_oracle.gas_limit(tx, MAX_GAS_LIMIT)
 
     signed = w3.eth.account.sign_transaction(tx, PRIVATE_KEY)
     tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
@@ -116,29 +185,118 @@ def liquidate(token_id: int):
     print(f"[🔥] Liquidation sent for tokenId {token_id}: {tx_hash.hex()}")
 
 
+def send_heartbeat():
+    """
+    Liveness ping: without it a quiet market reads as a dead bot
+    """
+    try:
+        heartbeats.heartbeat(BOT_ADDRESS)
+    except Exception as e:
+        print(f"[⚠️] Heartbeat error: {e}")
+
+
 # -------------------------------------------------
 # MAIN LOOP
 # -------------------------------------------------
 
+def scan(book: PositionBook, token_ids: list, block: int) -> Tuple[List[int], List[int]]:
+    """
+    Refresh the given positions from chain
+
+    Zone / rarity are read on first sight of a position, so the
+    forecaster can use the (zone, rarity) group volatility.
+    Returns (tokenIds with debt, tokenIds that failed)
+    """
+    indebted = []
+    failed = []
+
+    for token_id in token_ids:
+        try:
+            if not nft_manager.functions.isCollateral(token_id).call():
+                book.remove(token_id)
+                continue
+
+            position = get_position(token_id)
+        except Exception as e:
+            print(f"[⚠️] NFT {token_id} error: {e}")
+            failed.append(token_id)
+            continue
+
+        if position is None or position[2] == 0:
+            book.remove(token_id)
+            continue
+
+        # best effort, first sight only: a missing trait never
+        # holds back a liquidation, nor costs a call every block
+        zone = rarity = None
+        if book.get(token_id) is None:
+            zone, rarity = get_traits(token_id)
+
+        owner, price, debt = position
+        book.upsert(
+            token_id,
+            owner=owner,
+            debt=debt,
+            price=price,
+            zone=zone,
+            rarity=rarity,
+            block_number=block
+        )
+        indebted.append(token_id)
+
+    return indebted, failed
+
+
 def run():
     print("[🤖] Liquidation bot started")
 
-    token_id = 0  # example start
-    MAX_TOKEN_ID = 10_000  # adapt to NFT supply
+    book = PositionBook()
+    forecaster = LiquidationForecaster()
+    scheduler = ScanScheduler()
+
+    # first pass scans every tokenId
+    scheduler.schedule_now(range(MAX_TOKEN_ID), 0)
+    last_block = None
+    last_refresh = None
+    last_heartbeat = 0.0
 
     while True:
         try:
-            for token_id in range(MAX_TOKEN_ID):
-                if not nft_manager.functions.isCollateral(token_id).call():
-                    continue
-
-                hf = get_health_factor(token_id)
+            # also while no block comes in
+            if time.time() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                send_heartbeat()
+                last_heartbeat = time.time()
+
+            block = w3.eth.block_number
+            if block == last_block:
+                time.sleep(BLOCK_POLL_INTERVAL)
+                continue
+
+            # elapsed blocks, not block % N: polls can skip blocks
+            if last_refresh is None or block - last_refresh >= VOLATILITY_REFRESH_BLOCKS:
+                forecaster.refresh_volatility(book)
+                forecaster.borrow_rate = current_borrow_rate()
+                last_refresh = block
+            last_block = block
+
+            due = scheduler.due(block)
+            indebted, failed = scan(book, due, block)
+
+            # empty slots and debt-free NFTs: cold rescans
+            for token_id in set(due) - set(indebted) - set(failed):
+                scheduler.schedule(token_id, block, "cold")
+            for token_id in failed:
+                scheduler.schedule(token_id, block, "hot")
+
+            for f in forecaster.forecast(book, indebted):
+                token_id = f["tokenId"]
+                hf = f["health_factor"]
 
                 if hf < 1:
                     print(f"[⚠️] Liquidatable NFT {token_id} | HF={hf:.2f}")
                     liquidate(token_id)
 
-            time.sleep(CHECK_INTERVAL)
+                scheduler.schedule(token_id, block, f["tier"])
 
         except Exception as e:
             print(f"[❌] Error: {e}")
@@ -70,6 +70,30 @@ MAX_GAS_LIMIT = int(
 NFT_START_ID = int(os.getenv("NFT_START_ID", 0))
 NFT_MAX_ID = int(os.getenv("NFT_MAX_ID", 10_000))
 
+# -------------------------------------------------
+# INDEXER / EVENT STORE
+# -------------------------------------------------
+
+# Block the protocol contracts were deployed at (backfill start)
+DEPLOYMENT_BLOCK = int(os.getenv("DEPLOYMENT_BLOCK", 0))
+
+EVENT_STORE_PATH = os.getenv("EVENT_STORE_PATH", "terrain_events.db")
+
+# Blocks per get_logs call / parallel RPC workers
+BACKFILL_CHUNK_SIZE = int(os.getenv("BACKFILL_CHUNK_SIZE", 2_000))
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", 8))
+
+# Position book snapshot every N blocks (replay)
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", 50_000))
+
+# -------------------------------------------------
+# SECURITY SUPERVISOR
+# -------------------------------------------------
+
+# Guard state and keeper heartbeats (offchain_security),
+# shared by the API process and the bots
+SECURITY_STATE_PATH = os.getenv("SECURITY_STATE_PATH", "security_state.db")
+
 # -------------------------------------------------
 # SAFETY
 # -------------------------------------------------
@@ -0,0 +1,174 @@
+"""
+Historical Backfill for DeFi Terrain Protocol
+---------------------------------------------
+Ingests every lending, collateral, liquidation and governance
+log since the deployment block into the local event store
+
+- parallel block-range workers (RPC bound)
+- single writer, one transaction per range
+- resumable: ingested ranges are recorded and skipped
+- idempotent: events keyed by (block, logIndex)
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from settings import (
+    DEPLOYMENT_BLOCK,
+    EVENT_STORE_PATH,
+    BACKFILL_CHUNK_SIZE,
+    BACKFILL_WORKERS,
+)
+from events_listener import w3, event_sources
+from event_store import EventStore
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+MIN_SPLIT_SIZE = 10      # blocks; below this a failing range is an error
+REPORT_EVERY = 20        # ranges between progress reports
+
+# -------------------------------------------------
+# FETCH
+# -------------------------------------------------
+
+def fetch_range(from_block: int, to_block: int) -> list:
+    """
+    All protocol events in [from_block, to_block]
+
+    Ranges rejected by the provider (too many results, timeouts)
+    are split in two and retried.
+    """
+    try:
+        events = []
+        for contract, name, _handler, filters in event_sources():
+            events.extend(
+                getattr(contract.events, name)().get_logs(
+                    fromBlock=from_block, toBlock=to_block, argument_filters=filters
+                )
+            )
+        return events
+
+    except Exception:
+        if to_block - from_block + 1 <= MIN_SPLIT_SIZE:
+            raise
+        middle = (from_block + to_block) // 2
+        return fetch_range(from_block, middle) + fetch_range(middle + 1, to_block)
+
+# -------------------------------------------------
+# BACKFILL
+# -------------------------------------------------
+
+def backfill(
+    store: EventStore,
+    from_block: int = DEPLOYMENT_BLOCK,
+    to_block: int = None,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+    workers: int = BACKFILL_WORKERS
+) -> dict:
+    """
+    Ingest all missing ranges of [from_block, to_block]
+    """
+    if to_block is None:
+        to_block = w3.eth.block_number
+
+    ranges = store.missing_ranges(from_block, to_block, chunk_size)
+    total_blocks = sum(end - start + 1 for start, end in ranges)
+
+    print(
+        f"[📚] Backfill {from_block} → {to_block}: "
+        f"{len(ranges)} ranges / {total_blocks} blocks to fetch"
+    )
+
+    started = time.time()
+    done_blocks = 0
+    done_ranges = 0
+    new_events = 0
+    failed = []
+
+    # at most 2x workers ranges in flight: memory stays bounded
+    # and results are written as soon as they arrive
+    pending = iter(ranges)
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next():
+            chunk = next(pending, None)
+            if chunk is not None:
+                in_flight[executor.submit(fetch_range, *chunk)] = chunk
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while in_flight:
+            future = next(as_completed(in_flight))
+            start, end = in_flight.pop(future)
+            submit_next()
+
+            try:
+                events = future.result()
+            except Exception as e:
+                print(f"[⚠️] Range {start}-{end} failed: {e}")
+                failed.append((start, end))
+                continue
+
+            new_events += store.ingest_range(start, end, events)
+            done_blocks += end - start + 1
+            done_ranges += 1
+
+            if done_ranges % REPORT_EVERY == 0:
+                _report(started, done_blocks, total_blocks, new_events)
+
+    _report(started, done_blocks, total_blocks, new_events)
+
+    if failed:
+        print(f"[❌] {len(failed)} ranges failed, rerun to resume")
+
+    return {
+        "ranges": done_ranges,
+        "blocks": done_blocks,
+        "new_events": new_events,
+        "failed_ranges": failed,
+        "synced_to": store.last_contiguous_block(from_block),
+        "elapsed": time.time() - started,
+    }
+
+
+def _report(started, done_blocks, total_blocks, new_events):
+    elapsed = max(time.time() - started, 1e-9)
+    pct = 100 * done_blocks / total_blocks if total_blocks else 100.0
+    print(
+        f"[📈] {done_blocks}/{total_blocks} blocks ({pct:.1f}%) | "
+        f"{done_blocks / elapsed:,.0f} blocks/s | "
+        f"{new_events / elapsed:,.0f} events/s | "
+        f"{new_events} new events"
+    )
+
+# -------------------------------------------------
+# ENTRYPOINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill protocol events")
+    parser.add_argument("--db", default=EVENT_STORE_PATH)
+    parser.add_argument("--from-block", type=int, default=DEPLOYMENT_BLOCK)
+    parser.add_argument("--to-block", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    args = parser.parse_args()
+
+    store = EventStore(args.db)
+    try:
+        summary = backfill(
+            store,
+            from_block=args.from_block,
+            to_block=args.to_block,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+        )
+        print(f"[✅] Backfill done: {summary}")
+    finally:
+        store.close()
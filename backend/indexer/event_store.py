@@ -0,0 +1,249 @@
+"""
+Event Store
+-----------
+Compact local store of decoded protocol events (SQLite)
+Indexed by block, tokenId and user
+
+Writes are idempotent: an event is keyed by (block, log_index),
+so re-ingesting a block range never duplicates rows.
+Position book snapshots (replay.py) live in the same file.
+"""
+
+import json
+import sqlite3
+import zlib
+
+# -------------------------------------------------
+# SCHEMA
+# -------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    block       INTEGER NOT NULL,
+    log_index   INTEGER NOT NULL,
+    tx_hash     TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    token_id    INTEGER,
+    user        TEXT,
+    args        TEXT NOT NULL,
+    PRIMARY KEY (block, log_index)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS events_by_token
+    ON events (token_id, block) WHERE token_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS events_by_user
+    ON events (user, block) WHERE user IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS ingested_ranges (
+    from_block  INTEGER PRIMARY KEY,
+    to_block    INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    block       INTEGER PRIMARY KEY,
+    state       BLOB NOT NULL
+);
+"""
+
+# -------------------------------------------------
+# ENCODING
+# -------------------------------------------------
+
+def _jsonable(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def encode_event(event) -> tuple:
+    """
+    web3 decoded log -> events row
+    """
+    args = {k: _jsonable(v) for k, v in dict(event["args"]).items()}
+
+    user = args.get("user") or args.get("borrower") or args.get("proposer")
+    tx_hash = event["transactionHash"]
+    if not isinstance(tx_hash, str):
+        tx_hash = "0x" + bytes(tx_hash).hex()
+
+    return (
+        event["blockNumber"],
+        event["logIndex"],
+        tx_hash,
+        event["event"],
+        args.get("tokenId"),
+        user.lower() if isinstance(user, str) else None,
+        json.dumps(args, separators=(",", ":")),
+    )
+
+
+def decode_row(row) -> dict:
+    block, log_index, tx_hash, name, _token_id, _user, args = row
+    return {
+        "blockNumber": block,
+        "logIndex": log_index,
+        "transactionHash": tx_hash,
+        "event": name,
+        "args": json.loads(args),
+    }
+
+# -------------------------------------------------
+# STORE
+# -------------------------------------------------
+
+class EventStore:
+    """
+    Single-writer event store
+
+    Use one instance per thread (SQLite connections are not shared).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ------------------
+    # Writes
+    # ------------------
+
+    def ingest_range(self, from_block: int, to_block: int, events: list) -> int:
+        """
+        Store all events of a fully fetched block range, atomically
+
+        Returns the number of new rows.
+        """
+        rows = [encode_event(e) for e in events]
+
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            inserted = self.db.total_changes - before
+
+            self.db.execute(
+                "INSERT OR REPLACE INTO ingested_ranges VALUES (?, ?)",
+                (from_block, to_block)
+            )
+
+        return inserted
+
+    # ------------------
+    # Progress
+    # ------------------
+
+    def ingested_ranges(self) -> list:
+        return self.db.execute(
+            "SELECT from_block, to_block FROM ingested_ranges ORDER BY from_block"
+        ).fetchall()
+
+    def missing_ranges(self, from_block: int, to_block: int, chunk_size: int) -> list:
+        """
+        Chunks of [from_block, to_block] not ingested yet
+        """
+        missing = []
+        cursor = from_block
+
+        for start, end in self.ingested_ranges():
+            if end < cursor:
+                continue
+            if start > to_block:
+                break
+            if start > cursor:
+                missing.append((cursor, start - 1))
+            cursor = max(cursor, end + 1)
+
+        if cursor <= to_block:
+            missing.append((cursor, to_block))
+
+        chunks = []
+        for start, end in missing:
+            for lo in range(start, end + 1, chunk_size):
+                chunks.append((lo, min(lo + chunk_size - 1, end)))
+        return chunks
+
+    def last_contiguous_block(self, from_block: int) -> int:
+        """
+        Highest block such that [from_block, block] is fully ingested
+        """
+        last = from_block - 1
+        for start, end in self.ingested_ranges():
+            if end <= last:
+                continue
+            if start > last + 1:
+                break
+            last = end
+        return last
+
+    # ------------------
+    # Reads
+    # ------------------
+
+    def events(self, from_block: int = 0, to_block: int = None):
+        """
+        Events in chain order
+        """
+        query = "SELECT * FROM events WHERE block >= ?"
+        params = [from_block]
+        if to_block is not None:
+            query += " AND block <= ?"
+            params.append(to_block)
+        query += " ORDER BY block, log_index"
+
+        for row in self.db.execute(query, params):
+            yield decode_row(row)
+
+    def events_for_token(self, token_id: int) -> list:
+        rows = self.db.execute(
+            "SELECT * FROM events WHERE token_id = ? ORDER BY block, log_index",
+            (token_id,)
+        )
+        return [decode_row(r) for r in rows]
+
+    def events_for_user(self, user: str) -> list:
+        rows = self.db.execute(
+            "SELECT * FROM events WHERE user = ? ORDER BY block, log_index",
+            (user.lower(),)
+        )
+        return [decode_row(r) for r in rows]
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    # ------------------
+    # Snapshots
+    # ------------------
+
+    def save_snapshot(self, block: int, state: dict):
+        blob = zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?)",
+                (block, blob)
+            )
+
+    def latest_snapshot(self, at_or_before: int = None) -> dict:
+        """
+        Most recent snapshot taken at or before a block (None if none)
+        """
+        query = "SELECT state FROM snapshots"
+        params = []
+        if at_or_before is not None:
+            query += " WHERE block <= ?"
+            params.append(at_or_before)
+        query += " ORDER BY block DESC LIMIT 1"
+
+        row = self.db.execute(query, params).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
@@ -11,10 +11,15 @@ from settings import (
     LENDING_POOL,
     NFT_COLLATERAL_MANAGER,
     LIQUIDATION_MANAGER,
+    PRICE_ORACLE,
     GOVERNOR,
-    CHECK_INTERVAL
+    TERRAIN_TOKEN,
+    CHECK_INTERVAL,
+    BACKFILL_CHUNK_SIZE
 )
 
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
 # -------------------------------------------------
 # WEB3 SETUP
 # -------------------------------------------------
@@ -29,7 +34,9 @@ assert w3.is_connected(), "RPC connection failed"
 LENDING_POOL_ABI = []              # Borrowed, Repaid
 NFT_MANAGER_ABI = []               # CollateralDeposited, Withdrawn
 LIQUIDATION_MANAGER_ABI = []       # Liquidated
+ORACLE_ABI = []                    # PriceUpdated, getNFTPrice()
 GOVERNOR_ABI = []                  # ProposalCreated, Executed
+TOKEN_ABI = []                     # Transfer
 
 # -------------------------------------------------
 # CONTRACTS
@@ -50,12 +57,23 @@ liquidation_manager = w3.eth.contract(
     abi=LIQUIDATION_MANAGER_ABI
 )
 
+oracle = w3.eth.contract(
+    address=PRICE_ORACLE,
+    abi=ORACLE_ABI
+)
+
 governor = (
     w3.eth.contract(address=GOVERNOR, abi=GOVERNOR_ABI)
     if GOVERNOR
     else None
 )
 
+token = (
+    w3.eth.contract(address=TERRAIN_TOKEN, abi=TOKEN_ABI)
+    if TERRAIN_TOKEN
+    else None
+)
+
 # -------------------------------------------------
 # EVENT HANDLERS
 # -------------------------------------------------
@@ -103,6 +121,14 @@ def on_liquidation(event):
     )
 
 
+def on_price_update(event):
+    args = event["args"]
+    print(
+        f"[📈 ORACLE UPDATE] "
+        f"param={args['param']} value={args['value']}"
+    )
+
+
 def on_proposal_created(event):
     args = event["args"]
     print(
@@ -117,64 +143,179 @@ def on_proposal_executed(event):
         f"[✅ PROPOSAL EXECUTED] id={args['proposalId']}"
     )
 
+
+def on_mint(event):
+    args = event["args"]
+    print(
+        f"[🪙 MINT] to={args['receiver']} value={args['value']}"
+    )
+
+# -------------------------------------------------
+# PRICES
+# -------------------------------------------------
+
+def reprice(book, block, token_ids=None):
+    """
+    Re-read the oracle price of every position (or of `token_ids`) at `block`
+
+    PriceUpdated carries a DAO parameter (ZONE / RARITY / BASE value),
+    not a token price, and does not say which zone or rarity changed:
+    any of them can move every position, so all are re-priced.
+    """
+    touched = set()
+
+    for token_id in list(book.positions if token_ids is None else token_ids):
+        try:
+            price = oracle.functions.getNFTPrice(
+                NFT_COLLATERAL_MANAGER,
+                token_id
+            ).call(block_identifier=block)
+        except Exception as e:
+            print(f"[⚠️] Price error NFT {token_id}: {e}")
+            continue
+
+        position = book.get(token_id)
+        if position is not None and position.price != price:
+            book.record_price(token_id, price, block)
+            touched.add(token_id)
+
+    return touched
+
+# -------------------------------------------------
+# EVENT SOURCES
+# -------------------------------------------------
+
+def event_sources():
+    """
+    (contract, event name, handler, argument filters) for every watched event
+
+    Token transfers are filtered on the indexed sender: only
+    mints (Transfer from the zero address) are watched.
+    """
+    sources = [
+        (lending_pool, "Borrowed", on_borrow, None),
+        (lending_pool, "Repaid", on_repay, None),
+        (nft_manager, "CollateralDeposited", on_collateral_deposit, None),
+        (nft_manager, "CollateralWithdrawn", on_collateral_withdraw, None),
+        (liquidation_manager, "CollateralSeized", on_liquidation, None),
+        (oracle, "PriceUpdated", on_price_update, None),
+    ]
+
+    if governor:
+        sources += [
+            (governor, "ProposalCreated", on_proposal_created, None),
+            (governor, "ProposalExecuted", on_proposal_executed, None),
+        ]
+
+    if token:
+        sources.append(
+            (token, "Transfer", on_mint, {"sender": ZERO_ADDRESS})
+        )
+
+    return sources
+
+
+def with_timestamps(events):
+    """
+    Copies of the events with their block timestamp
+
+    Logs carry no time: consumers that reason in time (keeper
+    liveness) need the block's, not the time the log was polled.
+    One get_block per distinct block.
+    """
+    timestamps = {}
+    stamped = []
+
+    for event in events:
+        block = event["blockNumber"]
+        if block not in timestamps:
+            timestamps[block] = w3.eth.get_block(block)["timestamp"]
+        stamped.append({**event, "timestamp": timestamps[block]})
+
+    return stamped
+
+
+def poll(from_block, to_block, book=None, on_events=None):
+    """
+    Fetch and dispatch all events in [from_block, to_block]
+
+    If a PositionBook is given, events are also folded into it,
+    and positions are re-priced when the range holds a PriceUpdated;
+    positions created in the range are priced in any case (a new
+    position has price 0, i.e. HF 0, until its first price read).
+    on_events(events, to_block) is called once the book is up to date,
+    with block timestamps attached.
+    """
+    events = []
+
+    for contract, name, handler, filters in event_sources():
+        for event in getattr(contract.events, name)().get_logs(
+            fromBlock=from_block, toBlock=to_block, argument_filters=filters
+        ):
+            handler(event)
+            events.append(event)
+
+    # chain order, whatever the source contract
+    events.sort(key=lambda e: (e["blockNumber"], e["logIndex"]))
+
+    if book is not None:
+        touched = set()
+        for event in events:
+            touched |= book.apply_event(
+                event["event"],
+                event["args"],
+                event["blockNumber"]
+            )
+        if any(event["event"] == "PriceUpdated" for event in events):
+            reprice(book, to_block)
+        else:
+            unpriced = book.unpriced(touched)
+            if unpriced:
+                reprice(book, to_block, unpriced)
+        book.advance(to_block)
+
+    if on_events is not None:
+        on_events(with_timestamps(events), to_block)
+
+    return events
+
 # -------------------------------------------------
 # MAIN LOOP
 # -------------------------------------------------
 
-def run():
+def run(book=None, on_events=None, store_path=None):
+    """
+    Follow the chain head, BACKFILL_CHUNK_SIZE blocks per poll at most
+
+    With a store_path, every polled range is appended to the event
+    store, so the next cold start replays up to here instead of an
+    ever older snapshot. The store is opened in this thread
+    (EventStore is single-writer, one connection per thread).
+    """
     print("[👂] Event listener started")
 
+    store = None
+    if store_path is not None:
+        from event_store import EventStore
+        store = EventStore(store_path)
+
     last_block = w3.eth.block_number
+    if book is not None and book.block_number:
+        # resume right after the block the book was synced at
+        last_block = book.block_number
 
     while True:
         try:
             latest = w3.eth.block_number
 
-            if latest > last_block:
-                from_block = last_block + 1
-                to_block = latest
-
-                # LendingPool
-                for event in lending_pool.events.Borrowed().get_logs(
-                    fromBlock=from_block, toBlock=to_block
-                ):
-                    on_borrow(event)
-
-                for event in lending_pool.events.Repaid().get_logs(
-                    fromBlock=from_block, toBlock=to_block
-                ):
-                    on_repay(event)
-
-                # NFT Collateral
-                for event in nft_manager.events.CollateralDeposited().get_logs(
-                    fromBlock=from_block, toBlock=to_block
-                ):
-                    on_collateral_deposit(event)
-
-                for event in nft_manager.events.CollateralWithdrawn().get_logs(
-                    fromBlock=from_block, toBlock=to_block
-                ):
-                    on_collateral_withdraw(event)
-
-                # Liquidation
-                for event in liquidation_manager.events.CollateralSeized().get_logs(
-                    fromBlock=from_block, toBlock=to_block
-                ):
-                    on_liquidation(event)
-
-                # Governance
-                if governor:
-                    for event in governor.events.ProposalCreated().get_logs(
-                        fromBlock=from_block, toBlock=to_block
-                    ):
-                        on_proposal_created(event)
-
-                    for event in governor.events.ProposalExecuted().get_logs(
-                        fromBlock=from_block, toBlock=to_block
-                    ):
-                        on_proposal_executed(event)
-
-                last_block = latest
+            # catch-up after downtime is chunked like the backfill:
+            # one unbounded get_logs would be rejected by the provider
+            while latest > last_block:
+                to_block = min(latest, last_block + BACKFILL_CHUNK_SIZE)
+                events = poll(last_block + 1, to_block, book, on_events)
+                if store is not None:
+                    store.ingest_range(last_block + 1, to_block, events)
+                last_block = to_block
 
             time.sleep(CHECK_INTERVAL)
 
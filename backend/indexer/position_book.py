@@ -0,0 +1,425 @@
+"""
+Position Book
+-------------
+In-memory view of every NFT-backed position
+Fed by full_sync / events_listener, read by the API and bots
+without any RPC call
+"""
+
+import bisect
+import threading
+from collections import deque
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+PRICE_HISTORY_LENGTH = 1_024   # price points kept per tokenId
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1_000
+
+# -------------------------------------------------
+# POSITION
+# -------------------------------------------------
+
+class Position:
+    """
+    Single NFT collateral position
+    """
+
+    __slots__ = (
+        "token_id",
+        "owner",
+        "debt",
+        "price",
+        "zone",
+        "rarity",
+        "updated_block",
+    )
+
+    def __init__(
+        self,
+        token_id: int,
+        owner: str,
+        debt: int = 0,
+        price: int = 0,
+        zone: str = None,
+        rarity: str = "COMMON",
+        updated_block: int = 0
+    ):
+        self.token_id = token_id
+        self.owner = owner
+        self.debt = debt
+        self.price = price
+        self.zone = zone
+        self.rarity = rarity
+        self.updated_block = updated_block
+
+    @property
+    def health_factor(self) -> float:
+        """
+        HF = collateral_value / debt (same formula as sync.py)
+        """
+        if self.debt <= 0:
+            return float("inf")
+        return float(self.price) / self.debt
+
+    def to_dict(self) -> dict:
+        hf = self.health_factor
+        return {
+            "tokenId": self.token_id,
+            "owner": self.owner,
+            "debt": self.debt,
+            "price": self.price,
+            "zone": self.zone,
+            "rarity": self.rarity,
+            "health_factor": hf if hf != float("inf") else None,
+            "updated_block": self.updated_block,
+        }
+
+# -------------------------------------------------
+# BOOK
+# -------------------------------------------------
+
+class PositionBook:
+    """
+    Thread-safe position book
+
+    Writers: sync / events listener (one thread)
+    Readers: API handlers, bots
+
+    `version` increases on every mutation and is used
+    by readers as a cheap cache key.
+    """
+
+    def __init__(self, history_length: int = PRICE_HISTORY_LENGTH):
+        self._lock = threading.RLock()
+        self._history_length = history_length
+
+        self.positions = {}          # tokenId -> Position
+        self._token_ids = []         # sorted tokenIds (cursor pagination)
+        self._by_owner = {}          # owner -> set(tokenId)
+        self.price_history = {}      # tokenId -> deque[(block, price)]
+
+        self.block_number = 0
+        self.version = 0
+
+        self._dirty = set()          # tokenIds changed since drain_dirty()
+
+    # ------------------
+    # Internal helpers
+    # ------------------
+
+    def _touch(self, token_id: int = None):
+        self.version += 1
+        if token_id is not None:
+            self._dirty.add(token_id)
+
+    def _index(self, position: Position):
+        bisect.insort(self._token_ids, position.token_id)
+        self._by_owner.setdefault(position.owner, set()).add(position.token_id)
+
+    def _unindex(self, position: Position):
+        i = bisect.bisect_left(self._token_ids, position.token_id)
+        if i < len(self._token_ids) and self._token_ids[i] == position.token_id:
+            del self._token_ids[i]
+
+        owned = self._by_owner.get(position.owner)
+        if owned is not None:
+            owned.discard(position.token_id)
+            if not owned:
+                del self._by_owner[position.owner]
+
+    # ------------------
+    # Writes
+    # ------------------
+
+    def load(self, positions: list, block_number: int = 0):
+        """
+        Replace the whole book with full_sync() output
+        """
+        with self._lock:
+            self.positions = {}
+            self._token_ids = []
+            self._by_owner = {}
+
+            for p in positions:
+                self.upsert(
+                    p["tokenId"],
+                    owner=p["owner"],
+                    debt=p.get("debt", 0),
+                    price=p.get("price") or None,
+                    zone=p.get("zone"),
+                    rarity=p.get("rarity", "COMMON"),
+                    block_number=block_number,
+                )
+
+            self.block_number = block_number
+            self._touch()
+
+    def upsert(
+        self,
+        token_id: int,
+        owner: str = None,
+        debt: int = None,
+        price: int = None,
+        zone: str = None,
+        rarity: str = None,
+        block_number: int = None
+    ) -> Position:
+        """
+        Create or update a position (None fields are left untouched)
+        """
+        with self._lock:
+            block = self.block_number if block_number is None else block_number
+            position = self.positions.get(token_id)
+
+            if position is None:
+                position = Position(token_id, owner, updated_block=block)
+                self.positions[token_id] = position
+                self._index(position)
+            elif owner is not None and owner != position.owner:
+                self._unindex(position)
+                position.owner = owner
+                self._index(position)
+
+            if debt is not None:
+                position.debt = max(int(debt), 0)
+            if price is not None:
+                self.record_price(token_id, price, block)
+            if zone is not None:
+                position.zone = zone
+            if rarity is not None:
+                position.rarity = rarity
+
+            position.updated_block = block
+            self._touch(token_id)
+            return position
+
+    def remove(self, token_id: int) -> Position:
+        with self._lock:
+            position = self.positions.pop(token_id, None)
+            if position is not None:
+                self._unindex(position)
+                self._touch(token_id)
+            return position
+
+    def record_price(self, token_id: int, price: int, block_number: int = None):
+        """
+        Update a position price and append it to the price history
+        """
+        with self._lock:
+            block = self.block_number if block_number is None else block_number
+
+            history = self.price_history.get(token_id)
+            if history is None:
+                history = deque(maxlen=self._history_length)
+                self.price_history[token_id] = history
+            history.append((block, int(price)))
+
+            position = self.positions.get(token_id)
+            if position is not None:
+                position.price = int(price)
+                position.updated_block = block
+
+            self._touch(token_id)
+
+    def advance(self, block_number: int):
+        """
+        Mark the book as synced up to `block_number`
+        """
+        with self._lock:
+            if block_number != self.block_number:
+                self.block_number = block_number
+                self._touch()
+
+    def drain_dirty(self) -> set:
+        """
+        TokenIds changed since the previous call
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return dirty
+
+    def apply_event(self, name: str, args: dict, block_number: int) -> set:
+        """
+        Fold one decoded protocol event into the book
+
+        Returns the set of tokenIds touched by the event.
+        PriceUpdated carries no token price and is left to the
+        listener, which re-prices positions (events_listener.reprice).
+        """
+        with self._lock:
+            token_id = args.get("tokenId")
+            user = args.get("user")
+
+            if name == "CollateralDeposited":
+                self.upsert(token_id, owner=user, block_number=block_number)
+                return {token_id}
+
+            if name in ("CollateralWithdrawn", "CollateralSeized"):
+                self.remove(token_id)
+                return {token_id}
+
+            if name == "Borrowed":
+                position = self.positions.get(token_id)
+                if position is None:
+                    position = self.upsert(token_id, owner=user, block_number=block_number)
+                self.upsert(
+                    token_id,
+                    debt=position.debt + args["amount"],
+                    block_number=block_number,
+                )
+                return {token_id}
+
+            if name == "Repaid":
+                return self._apply_repay(user, token_id, args["amount"], block_number)
+
+            return set()
+
+    def _apply_repay(self, user, token_id, amount, block_number) -> set:
+        # Repaid may not carry a tokenId: draw down the user's
+        # positions in tokenId order
+        if token_id is not None:
+            targets = [token_id] if token_id in self.positions else []
+        else:
+            targets = sorted(self._by_owner.get(user, ()))
+
+        touched = set()
+        for tid in targets:
+            if amount <= 0:
+                break
+            position = self.positions[tid]
+            paid = min(position.debt, amount)
+            if paid == 0:
+                continue
+            amount -= paid
+            self.upsert(tid, debt=position.debt - paid, block_number=block_number)
+            touched.add(tid)
+
+        return touched
+
+    # ------------------
+    # Reads
+    # ------------------
+
+    def get(self, token_id: int) -> Position:
+        return self.positions.get(token_id)
+
+    def etag(self) -> str:
+        return f'W/"{self.block_number}-{self.version}"'
+
+    def page(
+        self,
+        cursor: int = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        owner: str = None,
+        max_health_factor: float = None
+    ):
+        """
+        Cursor pagination over tokenIds
+
+        cursor : last tokenId of the previous page (exclusive)
+        Returns (positions, next_cursor)
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        with self._lock:
+            if owner is not None:
+                ids = sorted(self._by_owner.get(owner, ()))
+            else:
+                ids = self._token_ids
+
+            start = 0 if cursor is None else bisect.bisect_right(ids, cursor)
+
+            items = []
+            next_cursor = None
+            for tid in _iter_from(ids, start):
+                position = self.positions[tid]
+                if (
+                    max_health_factor is not None
+                    and position.health_factor >= max_health_factor
+                ):
+                    continue
+                if len(items) == limit:
+                    next_cursor = items[-1].token_id
+                    break
+                items.append(position)
+
+            return items, next_cursor
+
+    def unpriced(self, token_ids) -> list:
+        """
+        tokenIds among `token_ids` with a position but no price yet
+        """
+        with self._lock:
+            return [
+                token_id for token_id in token_ids
+                if token_id in self.positions and not self.positions[token_id].price
+            ]
+
+    def liquidatable(self, threshold: float = 1.0) -> list:
+        with self._lock:
+            return [
+                p for p in self.positions.values()
+                if p.health_factor < threshold
+            ]
+
+    def history(self, token_id: int, since_block: int = None) -> list:
+        with self._lock:
+            points = self.price_history.get(token_id, ())
+            if since_block is None:
+                return list(points)
+            return [(b, p) for b, p in points if b >= since_block]
+
+    def __len__(self):
+        return len(self.positions)
+
+    # ------------------
+    # Serialization
+    # ------------------
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "block_number": self.block_number,
+                "positions": [
+                    {
+                        "tokenId": p.token_id,
+                        "owner": p.owner,
+                        "debt": p.debt,
+                        "price": p.price,
+                        "zone": p.zone,
+                        "rarity": p.rarity,
+                        "updated_block": p.updated_block,
+                    }
+                    for p in self.positions.values()
+                ],
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict, history_length: int = PRICE_HISTORY_LENGTH):
+        book = cls(history_length=history_length)
+
+        for p in data["positions"]:
+            position = Position(
+                p["tokenId"],
+                p["owner"],
+                debt=p["debt"],
+                price=p["price"],
+                zone=p.get("zone"),
+                rarity=p.get("rarity", "COMMON"),
+                updated_block=p.get("updated_block", 0),
+            )
+            book.positions[position.token_id] = position
+            book._index(position)
+
+        book.block_number = data["block_number"]
+        book._touch()
+        return book
+
+
+def _iter_from(ids: list, start: int):
+    # avoids copying the sorted index on every page
+    for i in range(start, len(ids)):
+        yield ids[i]
@@ -56,9 +56,9 @@ oracle = w3.eth.contract(
 # SYNC LOGIC
 # -------------------------------------------------
 
-def sync_collateral_state():
+def sync_collateral_state(block="latest"):
     """
-    Rebuild NFT collateral state
+    Rebuild NFT collateral state (as of `block`)
     """
     print("[🔄] Syncing NFT collateral state...")
 
@@ -66,14 +66,14 @@ def sync_collateral_state():
 
     for token_id in range(NFT_START_ID, NFT_MAX_ID):
         try:
-            if not nft_manager.functions.isCollateral(token_id).call():
+            if not nft_manager.functions.isCollateral(token_id).call(block_identifier=block):
                 continue
 
-            owner = nft_manager.functions.ownerOfCollateral(token_id).call()
+            owner = nft_manager.functions.ownerOfCollateral(token_id).call(block_identifier=block)
             price = oracle.functions.getNFTPrice(
                 NFT_COLLATERAL_MANAGER,
                 token_id
-            ).call()
+            ).call(block_identifier=block)
 
             collateral.append({
                 "tokenId": token_id,
@@ -88,9 +88,9 @@ def sync_collateral_state():
     return collateral
 
 
-def sync_debt_state(collateral):
+def sync_debt_state(collateral, block="latest"):
     """
-    Attach debt data to collateral
+    Attach debt data to collateral (as of `block`)
     """
     print("[🔄] Syncing debt state...")
 
@@ -100,7 +100,7 @@ def sync_debt_state(collateral):
         token_id = item["tokenId"]
 
         try:
-            debt = lending_pool.functions.getNFTDebt(token_id).call()
+            debt = lending_pool.functions.getNFTDebt(token_id).call(block_identifier=block)
 
             position = {
                 **item,
@@ -119,14 +119,38 @@ def sync_debt_state(collateral):
     return positions
 
 
-def full_sync():
+def sync_prices(book):
+    """
+    Price every position of a replayed PositionBook from the oracle
+    (one call per open position instead of a full tokenId sweep)
+    """
+    print(f"[🔄] Pricing {len(book)} positions...")
+
+    for token_id in list(book.positions):
+        try:
+            price = oracle.functions.getNFTPrice(
+                NFT_COLLATERAL_MANAGER,
+                token_id
+            ).call()
+            book.record_price(token_id, price)
+
+        except Exception as e:
+            print(f"[⚠️] Price error NFT {token_id}: {e}")
+
+    return book
+
+
+def full_sync(block="latest"):
     """
     Full protocol sync
+
+    Every read is pinned to `block`, so the result is the exact
+    state at that block and event polling can resume at block + 1.
     """
-    print("[🚀] Starting full sync")
+    print(f"[🚀] Starting full sync at block {block}")
 
-    collateral = sync_collateral_state()
-    positions = sync_debt_state(collateral)
+    collateral = sync_collateral_state(block)
+    positions = sync_debt_state(collateral, block)
 
     print("[📊] Summary")
     for p in positions:
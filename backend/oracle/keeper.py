@@ -6,6 +6,7 @@ Automates protocol maintenance:
 - health factor checks
 - liquidation triggers
 - oracle refresh
+- liveness heartbeats for the security supervisor
 """
 
 import time
@@ -19,9 +20,16 @@ from settings import (
     CHECK_INTERVAL,
     ENABLE_LIQUIDATION,
     DRY_RUN,
-    MAX_GAS_LIMIT
+    MAX_GAS_LIMIT,
+    SECURITY_STATE_PATH
 )
+from state_store import SecurityStateStore
 from sync import full_sync
+from gas_oracle import GasOracle
+from interest_simulator import InterestSimulator
+
+# interest-only HF < 1 forecast horizon (hourly steps)
+INTEREST_FORECAST_STEPS = 7 * 24
 
 # -------------------------------------------------
 # WEB3
@@ -30,11 +38,16 @@ from sync import full_sync
 w3 = Web3(Web3.HTTPProvider(RPC_URL))
 assert w3.is_connected(), "RPC connection failed"
 
+gas_oracle = GasOracle(w3)
+
+# heartbeats read by the supervisor (Keeper_guard)
+heartbeats = SecurityStateStore(SECURITY_STATE_PATH)
+
 # -------------------------------------------------
 # ABI PLACEHOLDERS
 # -------------------------------------------------
 
-LENDING_POOL_ABI = []          # updateInterest()
+LENDING_POOL_ABI = []          # updateInterest(), total_borrowed(), total_liquidity()
 LIQUIDATION_MANAGER_ABI = []  # liquidate()
 
 # -------------------------------------------------
@@ -55,17 +68,23 @@ liquidation_manager = w3.eth.contract(
 # TX HELPER
 # -------------------------------------------------
 
-def send_tx(tx):
+def send_tx(tx, urgency="normal"):
+    """
+    urgency : low | normal | high (see gas_oracle.URGENCY_TIERS)
+    """
     if DRY_RUN:
         print("[🧪 DRY-RUN] Transaction skipped")
         return None
 
+    for key in ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"):
+        tx.pop(key, None)
+
     tx.update({
         "from": BOT_ADDRESS,
         "nonce": w3.eth.get_transaction_count(BOT_ADDRESS),
-        "gas": MAX_GAS_LIMIT,
-        "gasPrice": w3.eth.gas_price,
+        **gas_oracle.fees(urgency),
     })
+    tx["gas"] = gas_oracle.gas_limit(tx, MAX_GAS_LIMIT)
 
     signed = w3.eth.account.sign_transaction(tx, BOT_PRIVATE_KEY)
     tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
@@ -76,10 +95,33 @@ def send_tx(tx):
 # KEEPER LOGIC
 # -------------------------------------------------
 
+def send_heartbeat():
+    """
+    Liveness ping: without it a quiet market reads as a dead keeper
+    """
+    try:
+        heartbeats.heartbeat(BOT_ADDRESS)
+    except Exception as e:
+        print(f"[⚠️] Heartbeat error: {e}")
+
+
 def update_interest_rates():
     print("[⏱️] Updating interest rates")
     tx = lending_pool.functions.updateInterest().build_transaction({})
-    send_tx(tx)
+    send_tx(tx, urgency="low")
+
+
+def forecast_interest_crossings(positions):
+    """
+    [(seconds from now, tokenId)] of positions that accrued
+    interest alone pushes below HF 1 within the forecast horizon
+    """
+    simulator = InterestSimulator(
+        lending_pool.functions.total_borrowed().call(),
+        lending_pool.functions.total_liquidity().call()
+    )
+    healthy = [p for p in positions if p["health_factor"] >= 1]
+    return simulator.liquidation_schedule(healthy, INTEREST_FORECAST_STEPS)
 
 
 def process_liquidations():
@@ -93,7 +135,14 @@ def process_liquidations():
             tx = liquidation_manager.functions.liquidate(
                 p["tokenId"]
             ).build_transaction({})
-            send_tx(tx)
+            send_tx(tx, urgency="high")
+
+    schedule = forecast_interest_crossings(positions)
+    if schedule:
+        eta, token_id = schedule[0]
+        print(f"[📈] {len(schedule)} positions cross HF < 1 from interest; "
+              f"next NFT {token_id} in {eta // 3600}h")
+    return schedule
 
 # -------------------------------------------------
 # MAIN LOOP
@@ -104,6 +153,7 @@ def run():
 
     while True:
         try:
+            send_heartbeat()
             update_interest_rates()
             process_liquidations()
             time.sleep(CHECK_INTERVAL)
@@ -0,0 +1,170 @@
+"""
+Gas Oracle
+----------
+EIP-1559 fee estimation for bots & keepers
+
+- samples eth_feeHistory over a sliding window of blocks
+- urgency tiers (liquidations bid aggressively, maintenance cheaply)
+- one computation per block, shared by every tx sent in that block
+"""
+
+import threading
+import time
+from collections import deque
+from statistics import median
+from typing import Dict
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+FEE_HISTORY_BLOCKS = 20          # sliding window size
+BLOCK_NUMBER_TTL = 1.0           # seconds between block number checks
+
+GWEI = 10**9
+MIN_PRIORITY_FEE = 1 * GWEI // 10      # 0.1 gwei
+MAX_PRIORITY_FEE = 50 * GWEI
+
+GAS_LIMIT_HEADROOM = 1.2
+
+# reward percentile sampled from fee history, and how many
+# full blocks of base fee increase (+12.5% each) the bid survives
+URGENCY_TIERS = {
+    "low": {"percentile": 10, "base_fee_blocks": 1},
+    "normal": {"percentile": 50, "base_fee_blocks": 3},
+    "high": {"percentile": 90, "base_fee_blocks": 6},
+}
+
+PERCENTILES = sorted({t["percentile"] for t in URGENCY_TIERS.values()})
+
+# -------------------------------------------------
+# ORACLE
+# -------------------------------------------------
+
+class GasOracle:
+    """
+    Per-block cached EIP-1559 fee oracle
+
+    Falls back to legacy gasPrice on chains without EIP-1559
+    (no baseFeePerGas). A failed fee_history call on an EIP-1559
+    chain only falls back for the current block.
+    """
+
+    def __init__(self, w3, window: int = FEE_HISTORY_BLOCKS):
+        self.w3 = w3
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=window)   # (block, base_fee, rewards)
+        self._next_base_fee = None
+        self._block = None
+        self._block_checked_at = 0.0
+        self._fees = {}                        # urgency -> tx params
+        self._legacy = False
+        self._failed_block = None              # block whose refresh failed
+
+    # ------------------
+    # Sampling
+    # ------------------
+
+    def _latest_block(self) -> int:
+        now = time.monotonic()
+        if self._block is None or now - self._block_checked_at >= BLOCK_NUMBER_TTL:
+            self._block_checked_at = now
+            return self.w3.eth.block_number
+        return self._block
+
+    def _refresh(self, latest: int):
+        """
+        Fetch only the blocks not yet in the window
+        """
+        known = self._history[-1][0] if self._history else latest - self.window
+        count = min(max(latest - known, 1), self.window)
+
+        history = self.w3.eth.fee_history(count, latest, PERCENTILES)
+
+        oldest = history["oldestBlock"]
+        base_fees = history["baseFeePerGas"]
+        rewards = history["reward"]
+
+        for i, reward in enumerate(rewards):
+            block = oldest + i
+            if self._history and block <= self._history[-1][0]:
+                continue
+            self._history.append((block, base_fees[i], reward))
+
+        # last entry is the base fee of the next (pending) block
+        self._next_base_fee = base_fees[-1]
+
+    def _supports_eip1559(self) -> bool:
+        try:
+            return self.w3.eth.get_block("latest").get("baseFeePerGas") is not None
+        except Exception:
+            # cannot tell: assume a transient error and retry later
+            return True
+
+    def _compute(self, urgency: str) -> Dict:
+        tier = URGENCY_TIERS[urgency]
+        column = PERCENTILES.index(tier["percentile"])
+
+        tips = [reward[column] for _, _, reward in self._history if reward]
+        tip = int(median(tips)) if tips else MIN_PRIORITY_FEE
+        tip = min(max(tip, MIN_PRIORITY_FEE), MAX_PRIORITY_FEE)
+
+        base_fee = self._next_base_fee
+        for _ in range(tier["base_fee_blocks"]):
+            base_fee = base_fee * 9 // 8
+
+        return {
+            "maxFeePerGas": base_fee + tip,
+            "maxPriorityFeePerGas": tip,
+        }
+
+    # ------------------
+    # Public API
+    # ------------------
+
+    def fees(self, urgency: str = "normal") -> Dict:
+        """
+        Fee fields to merge into a transaction dict
+        """
+        if urgency not in URGENCY_TIERS:
+            raise ValueError(f"Unknown urgency tier: {urgency}")
+
+        with self._lock:
+            if self._legacy:
+                return {"gasPrice": self.w3.eth.gas_price}
+
+            latest = self._latest_block()
+
+            if latest != self._block:
+                if latest == self._failed_block:
+                    return {"gasPrice": self.w3.eth.gas_price}
+                try:
+                    self._refresh(latest)
+                except Exception as e:
+                    self._failed_block = latest
+                    if self._supports_eip1559():
+                        print(f"[⚠️] fee_history failed at block {latest}, gasPrice for this block: {e}")
+                    else:
+                        print(f"[⚠️] no EIP-1559 on this chain, legacy gas pricing: {e}")
+                        self._legacy = True
+                    return {"gasPrice": self.w3.eth.gas_price}
+
+                self._block = latest
+                self._fees = {}
+
+            if urgency not in self._fees:
+                self._fees[urgency] = self._compute(urgency)
+
+            return dict(self._fees[urgency])
+
+    def gas_limit(self, tx: Dict, cap: int) -> int:
+        """
+        Estimated gas + headroom, never above `cap`
+        """
+        try:
+            estimate = self.w3.eth.estimate_gas(tx)
+        except Exception:
+            return cap
+        return min(int(estimate * GAS_LIMIT_HEADROOM), cap)
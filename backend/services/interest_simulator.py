@@ -0,0 +1,220 @@
+"""
+Interest Simulator
+------------------
+Off-chain model of InterestRateStrategy.vy and debt accrual
+
+- getBorrowRate mirrored in exact integer math (RAY rates, bps utilization)
+- pool-level projection: utilization -> rate -> borrow index, step by step
+  (interest compounds at every update, like keeper.update_interest_rates,
+  and accrues to both total_borrowed and total_liquidity)
+- book-level projection: every position's debt follows the borrow index,
+  so HF < 1 crossings from interest alone are one searchsorted
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# -------------------------------------------------
+# CONTRACT CONSTANTS (InterestRateStrategy.vy)
+# -------------------------------------------------
+
+RAY = 10**27
+BPS = 10_000
+
+DEFAULT_RATE_PARAMS = {
+    "base_rate": 2 * 10**25,          # 2%
+    "slope1": 4 * 10**25,             # +4%
+    "slope2": 75 * 10**25,            # +75%
+    "optimal_utilization": 8000,      # 80%
+}
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+DEFAULT_STEP_SECONDS = 3600           # one accrual per hour
+
+# -------------------------------------------------
+# RATE CURVE
+# -------------------------------------------------
+
+def get_borrow_rate(
+    total_borrowed: int,
+    total_liquidity: int,
+    params: Dict[str, int] = DEFAULT_RATE_PARAMS
+) -> int:
+    """
+    Borrow rate per year (RAY), same integer arithmetic as the contract
+    """
+    base = params["base_rate"]
+    slope1 = params["slope1"]
+    slope2 = params["slope2"]
+    optimal = params["optimal_utilization"]
+
+    if total_borrowed == 0 or total_liquidity == 0:
+        return base
+
+    utilization = total_borrowed * BPS // total_liquidity
+
+    if utilization <= optimal:
+        return base + utilization * slope1 // optimal
+
+    excess = utilization - optimal
+    excess_ratio = excess * BPS // (BPS - optimal)
+
+    return base + slope1 + excess_ratio * slope2 // BPS
+
+
+def utilization_bps(total_borrowed: int, total_liquidity: int) -> int:
+    if total_liquidity == 0:
+        return 0
+    return total_borrowed * BPS // total_liquidity
+
+# -------------------------------------------------
+# SIMULATOR
+# -------------------------------------------------
+
+class InterestSimulator:
+    """
+    Projects utilization, rates and the borrow index
+
+    Pool aggregates are exact Python ints (wei, RAY); the index
+    is also exposed as a float ratio for vectorized book math.
+    """
+
+    def __init__(
+        self,
+        total_borrowed: int,
+        total_liquidity: int,
+        params: Optional[Dict[str, int]] = None,
+        step_seconds: int = DEFAULT_STEP_SECONDS
+    ):
+        self.total_borrowed = int(total_borrowed)
+        self.total_liquidity = int(total_liquidity)
+        self.params = params or DEFAULT_RATE_PARAMS
+        self.step_seconds = step_seconds
+
+    def project(
+        self,
+        steps: int,
+        borrow_flows: Optional[Sequence[int]] = None,
+        liquidity_flows: Optional[Sequence[int]] = None
+    ) -> Dict:
+        """
+        Accrues `steps` periods; flows are optional per-step
+        new borrows / deposits (wei, may be negative)
+
+        Returns per-step arrays (index 0 = now):
+        time, utilization_bps, rate (RAY, exact ints),
+        index (RAY, exact ints) and index_ratio (float).
+        """
+        borrowed = self.total_borrowed
+        liquidity = self.total_liquidity
+        index = RAY
+        dt = self.step_seconds
+        denominator = SECONDS_PER_YEAR * RAY
+
+        utilization = [utilization_bps(borrowed, liquidity)]
+        rates = [get_borrow_rate(borrowed, liquidity, self.params)]
+        indexes = [index]
+        totals = [borrowed]
+
+        for step in range(steps):
+            rate = rates[-1]
+
+            # linear interest over the period, compounded per update;
+            # interest paid by borrowers is owed to the pool's lenders
+            index += index * rate * dt // denominator
+            interest = borrowed * rate * dt // denominator
+            borrowed += interest
+            liquidity += interest
+
+            if borrow_flows is not None:
+                borrowed = max(borrowed + int(borrow_flows[step]), 0)
+            if liquidity_flows is not None:
+                liquidity = max(liquidity + int(liquidity_flows[step]), 0)
+
+            indexes.append(index)
+            totals.append(borrowed)
+            utilization.append(utilization_bps(borrowed, liquidity))
+            rates.append(get_borrow_rate(borrowed, liquidity, self.params))
+
+        return {
+            "time": np.arange(steps + 1, dtype=np.int64) * dt,
+            "utilization_bps": np.array(utilization, dtype=np.int64),
+            "rate": rates,
+            "rate_apr": np.array([r / RAY for r in rates]),
+            "index": indexes,
+            "index_ratio": np.array([i / RAY for i in indexes]),
+            "total_borrowed": totals,
+        }
+
+    # -------------------------------------------------
+    # BOOK PROJECTION
+    # -------------------------------------------------
+
+    @staticmethod
+    def debt_paths(
+        debts: Sequence[float],
+        projection: Dict,
+        stride: int = 1
+    ) -> np.ndarray:
+        """
+        (positions, sampled steps) debt matrix, one column every `stride` steps
+        """
+        ratio = projection["index_ratio"][::stride]
+        return np.asarray(debts, dtype=np.float64)[:, None] * ratio[None, :]
+
+    @staticmethod
+    def time_to_liquidation(
+        prices: Sequence[float],
+        debts: Sequence[float],
+        projection: Dict,
+        hf_threshold: float = 1.0
+    ) -> np.ndarray:
+        """
+        Seconds until HF = price / debt drops below `hf_threshold`
+        from interest alone (0 if already below, inf if not within horizon)
+
+        debt(t) = debt * index_ratio(t), so the crossing is the
+        first step where index_ratio > price / (debt * threshold).
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        debts = np.asarray(debts, dtype=np.float64)
+        ratio = projection["index_ratio"]
+
+        with np.errstate(divide="ignore"):
+            breaking = np.where(debts > 0, prices / (debts * hf_threshold), np.inf)
+
+        steps = np.searchsorted(ratio, breaking, side="right")
+        eta = np.full(len(prices), np.inf)
+        within = steps < len(ratio)
+        eta[within] = projection["time"][steps[within]]
+        return eta
+
+    def liquidation_schedule(
+        self,
+        positions: Iterable[Dict],
+        steps: int,
+        hf_threshold: float = 1.0
+    ) -> List[Tuple[int, int]]:
+        """
+        [(seconds from now, tokenId)] of positions crossing HF < 1
+        within the horizon, soonest first
+        """
+        positions = [p for p in positions if p.get("debt") and p.get("price")]
+        if not positions:
+            return []
+
+        projection = self.project(steps)
+        eta = self.time_to_liquidation(
+            [p["price"] for p in positions],
+            [p["debt"] for p in positions],
+            projection,
+            hf_threshold
+        )
+
+        order = np.argsort(eta, kind="stable")
+        return [
+            (int(eta[i]), positions[i]["tokenId"])
+            for i in order
+            if np.isfinite(eta[i])
+        ]
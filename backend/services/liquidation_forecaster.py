@@ -0,0 +1,275 @@
+"""
+Liquidation Forecaster
+----------------------
+Time-to-liquidation forecasting for the position book
+
+- log HF modeled as Brownian motion with drift:
+  price volatility of the position's (zone, rarity) group,
+  debt accrual at the current borrow rate
+- probability of crossing HF < 1 within the next N blocks
+  (first-passage formula, vectorized over positions)
+- hot / warm / cold scan tiers and a block-keyed scan scheduler,
+  so RPC calls go to positions that are likely to be liquidated
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+BLOCK_TIME = 12                       # seconds
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# scan interval (blocks) per tier
+SCAN_INTERVALS = {
+    "hot": 1,
+    "warm": 10,
+    "cold": 100,
+}
+
+# horizon = cold interval: a cold position is unlikely to
+# become liquidatable before its next scan
+DEFAULT_HORIZON_BLOCKS = SCAN_INTERVALS["cold"]
+
+HOT_PROBABILITY = 0.05
+WARM_PROBABILITY = 0.001
+
+DEFAULT_SIGMA = 0.80                  # annualized, used without price history
+MIN_RETURNS = 10                      # returns needed for a group estimate
+
+_SQRT2 = math.sqrt(2.0)
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+# -------------------------------------------------
+# MATH
+# -------------------------------------------------
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return (0.5 * _erfc(-np.asarray(x, dtype=np.float64) / _SQRT2)).astype(np.float64)
+
+
+def crossing_probability(
+    hf: np.ndarray,
+    sigma: np.ndarray,
+    drift: np.ndarray,
+    horizon: float
+) -> np.ndarray:
+    """
+    P(min ln HF <= 0 within `horizon` years)
+
+    ln HF starts at x0 = ln hf, with drift `drift` and volatility
+    `sigma` (annualized):
+    P = N((-x0 - mT) / s√T) + exp(-2 m x0 / s²) N((-x0 + mT) / s√T)
+    """
+    hf = np.asarray(hf, dtype=np.float64)
+    sigma = np.maximum(np.broadcast_to(sigma, hf.shape).astype(np.float64), 1e-9)
+    drift = np.broadcast_to(drift, hf.shape).astype(np.float64)
+
+    probability = np.ones(hf.shape)
+    alive = hf > 1.0
+    if not alive.any() or horizon <= 0:
+        return np.where(alive, 0.0, probability)
+
+    x0 = np.log(hf[alive])
+    s = sigma[alive]
+    m = drift[alive]
+    scale = s * math.sqrt(horizon)
+
+    direct = _norm_cdf((-x0 - m * horizon) / scale)
+    reflected = _norm_cdf((-x0 + m * horizon) / scale)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        weight = np.exp(np.minimum(-2.0 * m * x0 / s ** 2, 700.0))
+        mirror = np.where(reflected > 0, weight * reflected, 0.0)
+
+    probability[alive] = np.clip(direct + mirror, 0.0, 1.0)
+    return probability
+
+
+def tier_of(probability: float) -> str:
+    if probability >= HOT_PROBABILITY:
+        return "hot"
+    if probability >= WARM_PROBABILITY:
+        return "warm"
+    return "cold"
+
+# -------------------------------------------------
+# VOLATILITY
+# -------------------------------------------------
+
+def group_volatility(
+    book,
+    block_time: int = BLOCK_TIME,
+    min_returns: int = MIN_RETURNS
+) -> Dict[Tuple, float]:
+    """
+    Annualized volatility from PositionBook price histories
+
+    Keys: (zone, rarity), (zone, None) and (None, None);
+    groups with fewer than `min_returns` returns are left out.
+    """
+    sums = {}          # key -> [sum r², sum dt, count]
+
+    for token_id, position in list(book.positions.items()):
+        points = [(b, p) for b, p in book.history(token_id) if p > 0]
+        if len(points) < 2:
+            continue
+
+        blocks, prices = np.array(points, dtype=np.float64).T
+        dt = np.diff(blocks) * block_time / SECONDS_PER_YEAR
+        returns = np.diff(np.log(prices))[dt > 0]
+        dt = dt[dt > 0]
+        if not dt.size:
+            continue
+
+        stats = (float(np.dot(returns, returns)), float(dt.sum()), dt.size)
+        # distinct keys only: without zone / rarity the three
+        # levels collapse and must count the position once
+        for key in dict.fromkeys((
+            (position.zone, position.rarity),
+            (position.zone, None),
+            (None, None),
+        )):
+            acc = sums.setdefault(key, [0.0, 0.0, 0])
+            acc[0] += stats[0]
+            acc[1] += stats[1]
+            acc[2] += stats[2]
+
+    return {
+        key: math.sqrt(sq / elapsed)
+        for key, (sq, elapsed, count) in sums.items()
+        if count >= min_returns and elapsed > 0
+    }
+
+# -------------------------------------------------
+# FORECASTER
+# -------------------------------------------------
+
+class LiquidationForecaster:
+    """
+    Probability of HF < 1 within `horizon_blocks` per position
+
+    borrow_rate : annual borrow rate (e.g. interest_simulator
+                  get_borrow_rate / RAY); debt grows at this rate
+    """
+
+    def __init__(
+        self,
+        horizon_blocks: int = DEFAULT_HORIZON_BLOCKS,
+        block_time: int = BLOCK_TIME,
+        borrow_rate: float = 0.0,
+        default_sigma: float = DEFAULT_SIGMA
+    ):
+        self.horizon_blocks = horizon_blocks
+        self.block_time = block_time
+        self.borrow_rate = borrow_rate
+        self.default_sigma = default_sigma
+        self.volatility = {}
+
+    @property
+    def horizon(self) -> float:
+        return self.horizon_blocks * self.block_time / SECONDS_PER_YEAR
+
+    def refresh_volatility(self, book):
+        self.volatility = group_volatility(book, self.block_time)
+
+    def sigma_for(self, zone, rarity) -> float:
+        for key in ((zone, rarity), (zone, None), (None, None)):
+            if key in self.volatility:
+                return self.volatility[key]
+        return self.default_sigma
+
+    def probabilities(self, hf, sigma) -> np.ndarray:
+        """
+        Vectorized crossing probabilities
+
+        Price is a driftless GBM (ln drift -σ²/2) and debt
+        accrues at borrow_rate, so ln HF drifts by -σ²/2 - r.
+        """
+        sigma = np.asarray(sigma, dtype=np.float64)
+        drift = -0.5 * sigma ** 2 - self.borrow_rate
+        return crossing_probability(hf, sigma, drift, self.horizon)
+
+    def forecast(
+        self,
+        book,
+        token_ids: Optional[Iterable[int]] = None
+    ) -> List[Dict]:
+        """
+        [{tokenId, health_factor, probability, tier}] for the given
+        tokenIds (default: every indebted position of the book)
+        """
+        if token_ids is None:
+            token_ids = list(book.positions)
+
+        positions = [
+            p for p in (book.get(tid) for tid in token_ids)
+            if p is not None and p.debt > 0
+        ]
+        if not positions:
+            return []
+
+        hf = np.array([p.health_factor for p in positions])
+        sigma = np.array([self.sigma_for(p.zone, p.rarity) for p in positions])
+        probability = self.probabilities(hf, sigma)
+
+        return [
+            {
+                "tokenId": p.token_id,
+                "health_factor": float(hf[i]),
+                "probability": float(probability[i]),
+                "tier": tier_of(probability[i]),
+            }
+            for i, p in enumerate(positions)
+        ]
+
+# -------------------------------------------------
+# SCAN SCHEDULER
+# -------------------------------------------------
+
+class ScanScheduler:
+    """
+    Min-heap of (next scan block, tokenId)
+
+    Rescheduling a tokenId supersedes its previous entry
+    (stale heap entries are skipped when popped).
+    """
+
+    def __init__(self, intervals: Dict[str, int] = SCAN_INTERVALS):
+        self.intervals = intervals
+        self._heap = []
+        self._next = {}              # tokenId -> scheduled block
+
+    def schedule(self, token_id: int, block: int, tier: str = "cold") -> int:
+        due = block + self.intervals[tier]
+        self._next[token_id] = due
+        heapq.heappush(self._heap, (due, token_id))
+        return due
+
+    def schedule_now(self, token_ids: Iterable[int], block: int):
+        for token_id in token_ids:
+            self._next[token_id] = block
+            heapq.heappush(self._heap, (block, token_id))
+
+    def due(self, block: int) -> List[int]:
+        """
+        Pops every tokenId whose scan is due at `block`
+        """
+        ready = []
+        while self._heap and self._heap[0][0] <= block:
+            due, token_id = heapq.heappop(self._heap)
+            if self._next.get(token_id) == due:
+                del self._next[token_id]
+                ready.append(token_id)
+        return ready
+
+    def discard(self, token_id: int):
+        self._next.pop(token_id, None)
+
+    def __len__(self):
+        return len(self._next)
@@ -4,7 +4,9 @@ LTV Calculator
 Computes Loan-To-Value ratios for terrain NFTs
 """
 
-from typing import Dict
+from typing import Dict, Sequence, Union
+
+import numpy as np
 
 # -------------------------------------------------
 # CONFIG (can be moved to DAO later)
@@ -53,4 +55,28 @@ def compute_ltv(
         "ltv": round(ltv, 4),
         "borrow_limit": int(price * ltv),
         "liquidation_threshold": int(price * LIQUIDATION_THRESHOLD),
-    }
\ No newline at end of file
+    }
+
+
+def compute_ltv_array(
+    rarities: Sequence[str],
+    volatility: Union[float, Sequence[float]] = 0.0,
+    zone_risk: Union[float, Sequence[float]] = 0.0,
+    base_ltv: float = BASE_LTV,
+    max_ltv: float = MAX_LTV,
+    rarity_bonus: Dict[str, float] = RARITY_BONUS
+) -> np.ndarray:
+    """
+    compute_ltv for a whole book at once, with overridable
+    parameters (used by ltv_sweep)
+    """
+    bonus = np.array(
+        [rarity_bonus.get(str(r).upper(), 0) for r in rarities],
+        dtype=np.float64
+    )
+
+    ltv = base_ltv + bonus
+    ltv = ltv - np.asarray(volatility, dtype=np.float64) * 0.20
+    ltv = ltv - np.asarray(zone_risk, dtype=np.float64) * 0.15
+
+    return np.round(np.minimum(np.maximum(ltv, 0.10), max_ltv), 4)
@@ -0,0 +1,467 @@
+"""
+LTV Sweep
+---------
+Parameter sweep for ltv_calculator settings
+
+- candidates: grid, seeded random search, local refinement
+  around the current frontier
+- each candidate: borrow limits from compute_ltv_array, then the
+  StressEngine over simulated price paths (PricePathEngine),
+  liquidations executed where each path crosses the threshold
+- candidates evaluated in parallel worker processes; the
+  scenario set is shipped once per worker
+- Pareto frontier: capital efficiency vs bad debt, with the
+  base LTV in bps for create_proposal.proposal_update_ltv
+"""
+
+import argparse
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ltv_calculator import (
+    BASE_LTV,
+    MAX_LTV,
+    LIQUIDATION_THRESHOLD,
+    RARITY_BONUS,
+    compute_ltv_array,
+)
+from price_paths import PricePathEngine, factor_correlation
+from stress_engine import DEFAULT_SALE_HAIRCUT, Portfolio, StressEngine, risk_summary
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+PARAMETERS = ("base_ltv", "max_ltv", "liquidation_threshold", "rarity_scale")
+
+CURRENT_PARAMS = {
+    "base_ltv": BASE_LTV,
+    "max_ltv": MAX_LTV,
+    "liquidation_threshold": LIQUIDATION_THRESHOLD,
+    "rarity_scale": 1.0,          # multiplier on RARITY_BONUS
+}
+
+DEFAULT_GRID = {
+    "base_ltv": [0.40, 0.45, 0.50, 0.55, 0.60],
+    "max_ltv": [0.60, 0.65, 0.70, 0.75],
+    "liquidation_threshold": [0.70, 0.75, 0.80, 0.85],
+    "rarity_scale": [0.5, 1.0, 1.5],
+}
+
+DEFAULT_BOUNDS = {
+    "base_ltv": (0.30, 0.70),
+    "max_ltv": (0.50, 0.85),
+    "liquidation_threshold": (0.60, 0.90),
+    "rarity_scale": (0.0, 2.0),
+}
+
+DEFAULT_ZONE = "default"          # scenario asset for zone-less positions
+
+BORROW_USAGE = 0.9                # borrowers draw 90% of their limit
+RISK_METRIC = "cvar_99"           # bad-debt measure on the frontier
+
+DEFAULT_PATHS = 2_000
+DEFAULT_STEPS = 30                # days
+DEFAULT_WORKERS = 4
+
+# -------------------------------------------------
+# CANDIDATES
+# -------------------------------------------------
+
+def is_valid(params: Dict[str, float]) -> bool:
+    """
+    base LTV <= max LTV < liquidation threshold < 1
+    """
+    return (
+        params["base_ltv"] <= params["max_ltv"]
+        < params["liquidation_threshold"] < 1
+    )
+
+
+def grid(axes: Optional[Dict[str, Sequence[float]]] = None) -> List[Dict[str, float]]:
+    """
+    Cartesian product of the axes (missing axes stay at current values)
+    """
+    axes = {**{k: [v] for k, v in CURRENT_PARAMS.items()}, **(axes or DEFAULT_GRID)}
+    candidates = [
+        dict(zip(PARAMETERS, values))
+        for values in itertools.product(*(axes[name] for name in PARAMETERS))
+    ]
+    return [c for c in candidates if is_valid(c)]
+
+
+def random_search(
+    n: int,
+    bounds: Optional[Dict[str, tuple]] = None,
+    seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """
+    `n` valid candidates drawn uniformly within bounds (seeded)
+    """
+    bounds = bounds or DEFAULT_BOUNDS
+    rng = np.random.default_rng(seed)
+    candidates = []
+
+    while len(candidates) < n:
+        draw = rng.random((n, len(PARAMETERS)))
+        for row in draw:
+            params = {
+                name: round(float(lo + u * (hi - lo)), 4)
+                for (name, (lo, hi)), u in zip(
+                    ((name, bounds[name]) for name in PARAMETERS), row
+                )
+            }
+            if is_valid(params):
+                candidates.append(params)
+                if len(candidates) == n:
+                    break
+
+    return candidates
+
+
+def refine(
+    frontier: Iterable[Dict],
+    n: int,
+    scale: float = 0.02,
+    seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """
+    `n` candidates jittered around frontier points (seeded)
+    """
+    anchors = [f["params"] for f in frontier]
+    if not anchors:
+        return []
+
+    rng = np.random.default_rng(seed)
+    candidates = []
+
+    for _ in range(n * 20):
+        anchor = anchors[rng.integers(len(anchors))]
+        params = {
+            name: round(float(anchor[name] + rng.normal(0.0, scale)), 4)
+            for name in PARAMETERS
+        }
+        params["rarity_scale"] = max(params["rarity_scale"], 0.0)
+        if is_valid(params):
+            candidates.append(params)
+            if len(candidates) == n:
+                break
+
+    return candidates
+
+# -------------------------------------------------
+# SCENARIOS
+# -------------------------------------------------
+
+def scenario_moves(
+    engine: PricePathEngine,
+    n_paths: int,
+    n_steps: int,
+    mode: str = "trough"
+) -> Dict[str, np.ndarray]:
+    """
+    {asset: relative move per path}, streamed chunk by chunk
+
+    mode = "terminal" | "trough" (as StressEngine.replay_paths)
+    mode = "path"     : the whole relative path (paths, steps + 1),
+                        for StressEngine.per_zone_paths
+    """
+    moves = []
+    for _, paths in engine.iter_paths(n_paths, n_steps):
+        relative = paths / paths[:, :1, :]
+        if mode == "terminal":
+            end = relative[:, -1, :]
+        elif mode == "trough":
+            end = relative.min(axis=1)
+        elif mode == "path":
+            end = relative
+        else:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        moves.append(end - 1.0)
+
+    moves = np.concatenate(moves)
+    return {asset: moves[..., i] for i, asset in enumerate(engine.assets)}
+
+# -------------------------------------------------
+# SWEEP
+# -------------------------------------------------
+
+class LtvSweep:
+    """
+    Evaluates LTV parameter sets against a collateral book
+
+    prices, rarities, zones : one entry per collateral NFT
+    shocks                  : {zone: relative path per scenario
+                              (scenarios, steps + 1)}, or one move per
+                              scenario (a single-step path)
+
+    Liquidations execute where a path first crosses each position's
+    threshold, so the liquidation threshold sets both which positions
+    are liquidated and the price they are sold at.
+    """
+
+    def __init__(
+        self,
+        prices: Sequence[float],
+        rarities: Sequence[str],
+        zones: Sequence[str],
+        shocks: Dict[str, np.ndarray],
+        volatility=0.0,
+        zone_risk=0.0,
+        sale_haircut: float = DEFAULT_SALE_HAIRCUT,
+        borrow_usage: float = BORROW_USAGE,
+        risk_metric: str = RISK_METRIC
+    ):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.rarities = list(rarities)
+        self.zones = list(zones)
+        self.shocks = {
+            zone: _as_paths(moves) for zone, moves in shocks.items()
+        }
+        self.volatility = volatility
+        self.zone_risk = zone_risk
+        self.sale_haircut = sale_haircut
+        self.borrow_usage = borrow_usage
+        self.risk_metric = risk_metric
+
+    @classmethod
+    def from_positions(cls, positions: Iterable, shocks, **kwargs) -> "LtvSweep":
+        """
+        Collateral book from PositionBook positions (or dicts);
+        priced positions only, current debts are ignored.
+        Positions without a zone use the DEFAULT_ZONE scenario.
+        """
+        rows = []
+        for p in positions:
+            if isinstance(p, dict):
+                row = (p.get("price"), p.get("rarity", "COMMON"), p.get("zone"))
+            else:
+                row = (p.price, p.rarity, p.zone)
+            if row[0]:
+                rows.append(row)
+
+        prices, rarities, zones = zip(*rows) if rows else ((), (), ())
+        return cls(
+            prices,
+            rarities,
+            [zone or DEFAULT_ZONE for zone in zones],
+            shocks,
+            **kwargs
+        )
+
+    def evaluate(self, params: Dict[str, float]) -> Dict:
+        """
+        Capital efficiency and bad-debt distribution for one parameter set
+        """
+        bonus = {
+            rarity: value * params["rarity_scale"]
+            for rarity, value in RARITY_BONUS.items()
+        }
+        ltv = compute_ltv_array(
+            self.rarities,
+            volatility=self.volatility,
+            zone_risk=self.zone_risk,
+            base_ltv=params["base_ltv"],
+            max_ltv=params["max_ltv"],
+            rarity_bonus=bonus
+        )
+        debts = self.prices * ltv * self.borrow_usage
+
+        # liquidation when price * threshold < debt, sold at the crossing
+        engine = StressEngine(
+            Portfolio(self.prices, debts, self.zones, self.rarities),
+            sale_haircut=self.sale_haircut,
+            liquidation_hf=1.0 / params["liquidation_threshold"]
+        )
+        summary = risk_summary(engine.per_zone_paths(self.shocks))
+
+        total_debt = float(debts.sum())
+        collateral = float(self.prices.sum())
+        return {
+            "params": dict(params),
+            "capital_efficiency": total_debt / collateral if collateral else 0.0,
+            "total_debt": total_debt,
+            "bad_debt": summary[self.risk_metric],
+            "bad_debt_ratio": summary[self.risk_metric] / total_debt if total_debt else 0.0,
+            "summary": summary,
+        }
+
+    def run(
+        self,
+        candidates: Sequence[Dict[str, float]],
+        workers: int = DEFAULT_WORKERS
+    ) -> List[Dict]:
+        """
+        Evaluates every candidate; results in candidate order
+        """
+        if workers <= 1:
+            return [self.evaluate(params) for params in candidates]
+
+        results = [None] * len(candidates)
+        max_in_flight = workers * 2
+
+        # the scenario set is sent once per process
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as executor:
+            in_flight = {}
+
+            for index, params in enumerate(candidates):
+                in_flight[executor.submit(_worker_evaluate, params)] = index
+
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[in_flight.pop(future)] = future.result()
+
+            for future, index in in_flight.items():
+                results[index] = future.result()
+
+        return results
+
+def _as_paths(moves) -> np.ndarray:
+    """
+    (scenarios, steps + 1) relative paths; one move per
+    scenario becomes a single step from 0
+    """
+    moves = np.asarray(moves, dtype=np.float64)
+    if moves.ndim == 1:
+        return np.column_stack((np.zeros_like(moves), moves))
+    return moves
+
+# -------------------------------------------------
+# FRONTIER
+# -------------------------------------------------
+
+def pareto_frontier(results: Iterable[Dict]) -> List[Dict]:
+    """
+    Non-dominated results: higher capital efficiency,
+    lower bad debt; sorted by efficiency (descending)
+    """
+    ordered = sorted(
+        results,
+        key=lambda r: (-r["capital_efficiency"], r["bad_debt"])
+    )
+
+    frontier = []
+    best_risk = float("inf")
+    for result in ordered:
+        if result["bad_debt"] < best_risk:
+            frontier.append(result)
+            best_risk = result["bad_debt"]
+
+    return frontier
+
+
+def proposal_params(result: Dict) -> Dict[str, int]:
+    """
+    Arguments for create_proposal.proposal_update_ltv (bps)
+    """
+    return {"new_ltv": int(round(result["params"]["base_ltv"] * 10_000))}
+
+# -------------------------------------------------
+# PROCESS WORKERS
+# -------------------------------------------------
+
+_WORKER_SWEEP = None
+
+
+def _init_worker(sweep: LtvSweep):
+    global _WORKER_SWEEP
+    _WORKER_SWEEP = sweep
+
+
+def _worker_evaluate(params: Dict[str, float]) -> Dict:
+    return _WORKER_SWEEP.evaluate(params)
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    from settings import EVENT_STORE_PATH
+    from event_store import EventStore
+    from replay import replay
+    from sync import sync_prices
+
+    parser = argparse.ArgumentParser(description="Sweep LTV parameters")
+    parser.add_argument("--db", default=EVENT_STORE_PATH)
+    parser.add_argument("--block", type=int, default=None)
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS)
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS)
+    parser.add_argument("--model", default="jump")
+    parser.add_argument("--random", type=int, default=0,
+                        help="random candidates instead of the grid")
+    parser.add_argument("--refine", type=int, default=0,
+                        help="extra candidates around the frontier")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    store = EventStore(args.db)
+    try:
+        book = replay(store, to_block=args.block, save_snapshots=False)
+    finally:
+        store.close()
+    sync_prices(book)
+
+    started = time.time()
+    zones = sorted({p.zone or DEFAULT_ZONE for p in book.positions.values()})
+    paths = PricePathEngine(
+        {zone: 1.0 for zone in zones},
+        model=args.model,
+        correlation=factor_correlation(len(zones), token_beta=None),
+        seed=args.seed
+    )
+    shocks = scenario_moves(paths, args.paths, args.steps, mode="path")
+    sweep = LtvSweep.from_positions(book.positions.values(), shocks)
+
+    if args.random:
+        candidates = random_search(args.random, seed=args.seed)
+    else:
+        candidates = grid()
+    candidates.append(dict(CURRENT_PARAMS))
+
+    results = sweep.run(candidates, workers=args.workers)
+    if args.refine:
+        extra = refine(pareto_frontier(results), args.refine, seed=args.seed)
+        results += sweep.run(extra, workers=args.workers)
+
+    frontier = pareto_frontier(results)
+
+    print(f"[📐] {len(results)} candidates, {len(frontier)} on the frontier "
+          f"in {time.time() - started:.1f}s")
+    for r in frontier:
+        p = r["params"]
+        print(
+            f"base={p['base_ltv']:.4f} max={p['max_ltv']:.4f} "
+            f"lt={p['liquidation_threshold']:.4f} rarity_x={p['rarity_scale']:.2f} | "
+            f"efficiency={r['capital_efficiency']:.4f} "
+            f"{RISK_METRIC}={r['bad_debt']:.2f} | "
+            f"proposal_update_ltv(new_ltv={proposal_params(r)['new_ltv']})"
+        )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {
+                    "seed": args.seed,
+                    "paths": args.paths,
+                    "steps": args.steps,
+                    "model": args.model,
+                    "block": book.block_number,
+                    "frontier": [{**r, **proposal_params(r)} for r in frontier],
+                    "results": results,
+                },
+                f,
+                indent=2,
+                default=float
+            )
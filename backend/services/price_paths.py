@@ -0,0 +1,242 @@
+"""
+Price Paths
+-----------
+Monte Carlo price-path generator for risk simulation
+
+- GBM, jump-diffusion (Merton) and regime-switching models
+- correlated assets (terrain zones + native token) via Cholesky
+- paths as NumPy matrices: (paths, steps + 1, assets)
+- seeded per chunk (SeedSequence spawn key = chunk id): reproducible
+  for a given seed and chunk size, streamed with bounded memory
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+DAYS_PER_YEAR = 365
+DEFAULT_DT = 1 / DAYS_PER_YEAR          # one step = one day
+DEFAULT_CHUNK_PATHS = 1_000
+
+MODELS = ("gbm", "jump", "regime")
+
+# annualized defaults (NFT floors are very volatile)
+DEFAULT_MU = 0.0
+DEFAULT_SIGMA = 0.80
+
+# Merton jumps: market-wide, applied to every asset
+DEFAULT_JUMP_INTENSITY = 4.0            # jumps / year
+DEFAULT_JUMP_MEAN = -0.15               # mean log jump size
+DEFAULT_JUMP_STD = 0.10
+
+# two-state market: calm / stressed
+DEFAULT_REGIMES = [
+    {"name": "calm", "mu": 0.05, "sigma_scale": 0.8},
+    {"name": "stress", "mu": -1.50, "sigma_scale": 2.0},
+]
+DEFAULT_TRANSITION = [      # per-step probabilities
+    [0.98, 0.02],
+    [0.10, 0.90],
+]
+
+# -------------------------------------------------
+# CORRELATION
+# -------------------------------------------------
+
+def factor_correlation(
+    n_zones: int,
+    zone_rho: float = 0.6,
+    token_beta: Optional[float] = 0.5
+) -> np.ndarray:
+    """
+    One-factor correlation matrix
+
+    zone_i = sqrt(zone_rho) * M + sqrt(1 - zone_rho) * e_i
+    token  = token_beta * M + sqrt(1 - token_beta^2) * e_t
+
+    Zones come first; the token (if token_beta is not None) is last.
+    """
+    loadings = [np.sqrt(zone_rho)] * n_zones
+    if token_beta is not None:
+        loadings.append(token_beta)
+
+    loadings = np.asarray(loadings)
+    corr = np.outer(loadings, loadings)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def _chunk_rng(seed: Optional[int], chunk_id: int) -> np.random.Generator:
+    return np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(chunk_id,))
+    )
+
+
+def _per_asset(value, assets: List[str], name: str) -> np.ndarray:
+    if isinstance(value, dict):
+        missing = set(assets) - set(value)
+        if missing:
+            raise ValueError(f"{name} missing for {sorted(missing)}")
+        return np.array([value[a] for a in assets], dtype=np.float64)
+    return np.full(len(assets), float(value))
+
+# -------------------------------------------------
+# ENGINE
+# -------------------------------------------------
+
+class PricePathEngine:
+    """
+    Correlated multi-asset price paths
+
+    spots       : {asset: initial price}
+    correlation : (assets x assets) matrix, default identity
+    mu, sigma   : annualized drift / volatility (scalar or per asset)
+    """
+
+    def __init__(
+        self,
+        spots: Dict[str, float],
+        model: str = "gbm",
+        correlation: Optional[np.ndarray] = None,
+        mu: Union[float, Dict[str, float]] = DEFAULT_MU,
+        sigma: Union[float, Dict[str, float]] = DEFAULT_SIGMA,
+        dt: float = DEFAULT_DT,
+        seed: Optional[int] = None,
+        jump_intensity: float = DEFAULT_JUMP_INTENSITY,
+        jump_mean: float = DEFAULT_JUMP_MEAN,
+        jump_std: float = DEFAULT_JUMP_STD,
+        jump_beta: Union[float, Dict[str, float]] = 1.0,
+        regimes: Optional[List[Dict]] = None,
+        transition: Optional[Sequence[Sequence[float]]] = None,
+        dtype=np.float64
+    ):
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model}")
+
+        self.assets = list(spots)
+        self.spots = np.array([spots[a] for a in self.assets], dtype=np.float64)
+        self.model = model
+        self.dt = dt
+        self.seed = seed
+        self.dtype = dtype
+
+        self.mu = _per_asset(mu, self.assets, "mu")
+        self.sigma = _per_asset(sigma, self.assets, "sigma")
+
+        n = len(self.assets)
+        corr = np.eye(n) if correlation is None else np.asarray(correlation, dtype=np.float64)
+        if corr.shape != (n, n):
+            raise ValueError("Correlation matrix shape does not match assets")
+        self._chol = np.linalg.cholesky(corr)
+
+        # jump-diffusion
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.jump_beta = _per_asset(jump_beta, self.assets, "jump_beta")
+
+        # regime switching
+        self.regimes = regimes or DEFAULT_REGIMES
+        transition = np.asarray(transition or DEFAULT_TRANSITION, dtype=np.float64)
+        if transition.shape != (len(self.regimes),) * 2:
+            raise ValueError("Transition matrix shape does not match regimes")
+        self._transition_cdf = np.cumsum(transition, axis=1)[:, :-1]
+
+    def asset_index(self, asset: str) -> int:
+        return self.assets.index(asset)
+
+    # -------------------------------------------------
+    # MODELS
+    # -------------------------------------------------
+
+    def _regime_states(self, rng, n_paths: int, n_steps: int) -> np.ndarray:
+        """
+        Markov chain per path, starting in regime 0
+        """
+        states = np.empty((n_paths, n_steps), dtype=np.int8)
+        state = np.zeros(n_paths, dtype=np.int8)
+        u = rng.random((n_steps, n_paths))
+
+        for step in range(n_steps):
+            thresholds = self._transition_cdf[state]
+            state = (u[step][:, None] >= thresholds).sum(axis=1).astype(np.int8)
+            states[:, step] = state
+        return states
+
+    def _log_returns(self, rng, n_paths: int, n_steps: int) -> np.ndarray:
+        dt = self.dt
+        shocks = rng.standard_normal((n_paths, n_steps, len(self.assets)))
+        shocks = shocks @ self._chol.T
+
+        if self.model == "regime":
+            # regime drift replaces mu, regime scale multiplies sigma
+            states = self._regime_states(rng, n_paths, n_steps)
+            regime_mu = np.array([r["mu"] for r in self.regimes])
+            regime_scale = np.array([r["sigma_scale"] for r in self.regimes])
+
+            mu = regime_mu[states][..., None]
+            sigma = self.sigma * regime_scale[states][..., None]
+        else:
+            mu = self.mu
+            sigma = self.sigma
+
+        log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+
+        if self.model == "jump":
+            lam = self.jump_intensity
+            counts = rng.poisson(lam * dt, size=(n_paths, n_steps))
+            sizes = (
+                counts * self.jump_mean
+                + np.sqrt(counts) * self.jump_std * rng.standard_normal((n_paths, n_steps))
+            )
+
+            # compensator keeps E[price] on the diffusion drift; an asset
+            # jumps by beta * J, so E[e^(beta J)] - 1 is taken per asset
+            beta = self.jump_beta
+            kappa = np.exp(beta * self.jump_mean + 0.5 * beta ** 2 * self.jump_std ** 2) - 1
+            log_returns += sizes[..., None] * beta - lam * kappa * dt
+
+        return log_returns
+
+    # -------------------------------------------------
+    # PATHS
+    # -------------------------------------------------
+
+    def chunk(self, chunk_id: int, n_paths: int, n_steps: int) -> np.ndarray:
+        """
+        Price matrix (n_paths, n_steps + 1, assets) for one chunk
+        """
+        rng = _chunk_rng(self.seed, chunk_id)
+        log_returns = self._log_returns(rng, n_paths, n_steps)
+
+        paths = np.empty((n_paths, n_steps + 1, len(self.assets)), dtype=self.dtype)
+        paths[:, 0] = self.spots
+        paths[:, 1:] = self.spots * np.exp(np.cumsum(log_returns, axis=1))
+        return paths
+
+    def iter_paths(
+        self,
+        n_paths: int,
+        n_steps: int,
+        chunk_paths: int = DEFAULT_CHUNK_PATHS
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Streams (first_path_index, chunk) with bounded memory
+        """
+        for chunk_id, start in enumerate(range(0, n_paths, chunk_paths)):
+            size = min(chunk_paths, n_paths - start)
+            yield start, self.chunk(chunk_id, size, n_steps)
+
+    def generate(
+        self,
+        n_paths: int,
+        n_steps: int,
+        chunk_paths: int = DEFAULT_CHUNK_PATHS
+    ) -> np.ndarray:
+        return np.concatenate(
+            [chunk for _, chunk in self.iter_paths(n_paths, n_steps, chunk_paths)]
+        )
@@ -0,0 +1,388 @@
+"""
+Stress Engine
+-------------
+Portfolio-level stress testing & VaR on top of risk_engine
+
+- whole position book as arrays (price, debt, zone, rarity)
+- vectorized price shocks: uniform, per zone, per rarity,
+  or replayed price paths (see price_paths.py)
+- per scenario: liquidations, collateral to sell, bad debt
+- path replay with liquidations at the threshold crossing
+- VaR / CVaR of protocol losses across scenarios
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from risk_engine import LIQUIDATION_HF
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+# fire-sale discount when liquidated collateral is sold
+DEFAULT_SALE_HAIRCUT = 0.10
+
+VAR_LEVELS = (0.95, 0.99)
+
+# -------------------------------------------------
+# PORTFOLIO
+# -------------------------------------------------
+
+class Portfolio:
+    """
+    Position book in columns
+
+    Groups (zones, rarities) are encoded as integer codes
+    so per-group shocks are a single gather.
+    """
+
+    def __init__(
+        self,
+        prices: Sequence[float],
+        debts: Sequence[float],
+        zones: Optional[Sequence[str]] = None,
+        rarities: Optional[Sequence[str]] = None,
+        token_ids: Optional[Sequence[int]] = None
+    ):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.debts = np.asarray(debts, dtype=np.float64)
+        self.token_ids = (
+            np.arange(len(self.prices)) if token_ids is None
+            else np.asarray(token_ids)
+        )
+
+        n = len(self.prices)
+        self.zones, self.zone_codes = _encode(
+            [None] * n if zones is None else zones
+        )
+        self.rarities, self.rarity_codes = _encode(
+            ["COMMON"] * n if rarities is None else rarities
+        )
+
+    @classmethod
+    def from_positions(cls, positions: Iterable) -> "Portfolio":
+        """
+        From PositionBook positions (or dicts with the same fields);
+        positions without a known price or without debt are skipped.
+        """
+        rows = []
+        for p in positions:
+            if isinstance(p, dict):
+                row = (p.get("tokenId"), p.get("price"), p.get("debt", 0),
+                       p.get("zone"), p.get("rarity", "COMMON"))
+            else:
+                row = (p.token_id, p.price, p.debt, p.zone, p.rarity)
+            if row[1] and row[2]:
+                rows.append(row)
+
+        if not rows:
+            return cls([], [])
+
+        token_ids, prices, debts, zones, rarities = zip(*rows)
+        return cls(prices, debts, zones, rarities, token_ids)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def health_factors(self) -> np.ndarray:
+        # same formula as risk_engine / PositionBook
+        with np.errstate(divide="ignore"):
+            return np.where(self.debts > 0, self.prices / self.debts, np.inf)
+
+
+def _encode(values: Sequence) -> tuple:
+    labels, codes = np.unique(
+        np.array(["" if v is None else str(v) for v in values], dtype=object),
+        return_inverse=True
+    )
+    return [label or None for label in labels], codes.astype(np.int64)
+
+# -------------------------------------------------
+# ENGINE
+# -------------------------------------------------
+
+class StressEngine:
+    """
+    Evaluates shock scenarios against a Portfolio
+
+    A scenario set is a (scenarios x groups) matrix of price
+    multipliers plus the group code of each position; shocked
+    prices are `prices * factors[:, codes]`.
+    """
+
+    def __init__(
+        self,
+        portfolio: Portfolio,
+        sale_haircut: float = DEFAULT_SALE_HAIRCUT,
+        liquidation_hf: float = LIQUIDATION_HF
+    ):
+        if not 0 <= sale_haircut < 1:
+            raise ValueError("sale_haircut must be in [0, 1)")
+
+        self.portfolio = portfolio
+        self.sale_haircut = sale_haircut
+        self.liquidation_hf = liquidation_hf
+
+    # -------------------------------------------------
+    # SCENARIO BUILDERS
+    # -------------------------------------------------
+
+    def uniform(self, shocks: Sequence[float], **kwargs) -> Dict:
+        """
+        Same relative price move for every position (e.g. -0.3 = -30%)
+        """
+        factors = 1.0 + np.asarray(shocks, dtype=np.float64)[:, None]
+        codes = np.zeros(len(self.portfolio), dtype=np.int64)
+        return self.evaluate(factors, codes, **kwargs)
+
+    def per_zone(self, shocks: Dict[str, Sequence[float]], **kwargs) -> Dict:
+        """
+        shocks : {zone: [move per scenario]}; unlisted zones unshocked
+        """
+        return self._per_group(self.portfolio.zones, self.portfolio.zone_codes, shocks, **kwargs)
+
+    def per_rarity(self, shocks: Dict[str, Sequence[float]], **kwargs) -> Dict:
+        """
+        shocks : {rarity: [move per scenario]}; unlisted rarities unshocked
+        """
+        return self._per_group(self.portfolio.rarities, self.portfolio.rarity_codes, shocks, **kwargs)
+
+    def replay_paths(
+        self,
+        paths: np.ndarray,
+        assets: List[str],
+        mode: str = "terminal",
+        **kwargs
+    ) -> Dict:
+        """
+        One scenario per price path (paths, steps + 1, assets),
+        assets named after zones (PricePathEngine.assets)
+
+        mode = "terminal" : move from first to last step
+        mode = "trough"   : worst point of the path (peak stress)
+        """
+        if mode == "terminal":
+            end = paths[:, -1, :]
+        elif mode == "trough":
+            end = paths.min(axis=1)
+        else:
+            raise ValueError(f"Unknown replay mode: {mode}")
+
+        moves = end / paths[:, 0, :] - 1.0
+        shocks = {asset: moves[:, i] for i, asset in enumerate(assets)}
+        return self.per_zone(shocks, **kwargs)
+
+    def per_zone_paths(
+        self,
+        paths: Dict[str, np.ndarray],
+        weights: Optional[Sequence[float]] = None
+    ) -> Dict:
+        """
+        paths : {zone: relative move path per scenario (scenarios, steps + 1)},
+                0 at the first step; unlisted zones unshocked
+
+        Unlike replay_paths (one move per path), each liquidation
+        executes at the first step where the price is below the
+        position's breaking factor: at the crossing, or past it
+        when the path gaps through. The shortfall is per position
+        (debt - sale proceeds, floored at 0), with no netting
+        against the surplus of other liquidations.
+
+        The running minimum of a path is a descending staircase;
+        each new low liquidates the positions whose breaking factor
+        lies between it and the previous low, a contiguous range
+        in breaking order, so step t only needs prefix sums.
+        """
+        p = self.portfolio
+        n_scenarios = len(next(iter(paths.values()))) if paths else 0
+
+        liquidations = np.zeros(n_scenarios, dtype=np.int64)
+        collateral_sold = np.zeros(n_scenarios)
+        debt_liquidated = np.zeros(n_scenarios)
+        bad_debt = np.zeros(n_scenarios)
+
+        with np.errstate(divide="ignore"):
+            breaking = np.where(
+                p.prices > 0,
+                p.debts * self.liquidation_hf / p.prices,
+                np.inf
+            )
+
+        for group, zone in enumerate(p.zones):
+            if zone not in paths:
+                continue
+
+            members = np.flatnonzero(p.zone_codes == group)
+            order = members[np.argsort(breaking[members], kind="stable")]
+            sorted_breaking = breaking[order]
+            price_prefix = np.concatenate(([0.0], np.cumsum(p.prices[order])))
+            debt_prefix = np.concatenate(([0.0], np.cumsum(p.debts[order])))
+
+            lows = np.minimum.accumulate(
+                1.0 + np.asarray(paths[zone], dtype=np.float64), axis=1
+            )
+            previous = np.full(n_scenarios, np.inf)
+
+            for low in lows.T:
+                # liquidated at this step: low < breaking <= previous low
+                lo = np.searchsorted(sorted_breaking, low, side="right")
+                hi = np.searchsorted(sorted_breaking, previous, side="right")
+                proceeds = low * (1.0 - self.sale_haircut)
+
+                # short when debt > price * proceeds, i.e. breaking > proceeds * hf
+                short = np.maximum(
+                    np.searchsorted(sorted_breaking, proceeds * self.liquidation_hf, side="right"),
+                    lo
+                )
+                short = np.minimum(short, hi)
+
+                liquidations += hi - lo
+                collateral_sold += low * (price_prefix[hi] - price_prefix[lo])
+                debt_liquidated += debt_prefix[hi] - debt_prefix[lo]
+                bad_debt += np.maximum(
+                    debt_prefix[hi] - debt_prefix[short]
+                    - proceeds * (price_prefix[hi] - price_prefix[short]),
+                    0.0
+                )
+                previous = low
+
+        return {
+            "liquidations": liquidations,
+            "collateral_sold": collateral_sold,
+            "debt_liquidated": debt_liquidated,
+            "bad_debt": bad_debt,
+            "weights": _normalize(weights, n_scenarios),
+        }
+
+    def _per_group(self, labels, codes, shocks, **kwargs) -> Dict:
+        n_scenarios = len(next(iter(shocks.values()))) if shocks else 0
+        factors = np.ones((n_scenarios, len(labels)))
+
+        for i, label in enumerate(labels):
+            if label in shocks:
+                factors[:, i] += np.asarray(shocks[label], dtype=np.float64)
+        return self.evaluate(factors, codes, **kwargs)
+
+    # -------------------------------------------------
+    # EVALUATION
+    # -------------------------------------------------
+
+    def evaluate(
+        self,
+        factors: np.ndarray,
+        codes: np.ndarray,
+        weights: Optional[Sequence[float]] = None
+    ) -> Dict:
+        """
+        Per scenario: liquidations, collateral sold, bad debt
+
+        weights : scenario probabilities (default equiprobable)
+
+        A position is liquidated when factor < debt * hf / price
+        (its breaking factor). Positions are sorted by breaking
+        factor inside each group, so a scenario only needs one
+        binary search per group and suffix sums of price / debt:
+        O(scenarios x groups x log n) instead of scenarios x n.
+        """
+        p = self.portfolio
+        factors = np.asarray(factors, dtype=np.float64)
+        n_scenarios = len(factors)
+
+        liquidations = np.zeros(n_scenarios, dtype=np.int64)
+        price_liquidated = np.zeros(n_scenarios)
+        debt_liquidated = np.zeros(n_scenarios)
+
+        with np.errstate(divide="ignore"):
+            breaking = np.where(
+                p.prices > 0,
+                p.debts * self.liquidation_hf / p.prices,
+                np.inf
+            )
+
+        for group in np.unique(codes):
+            members = np.flatnonzero(codes == group)
+            order = members[np.argsort(breaking[members], kind="stable")]
+            sorted_breaking = breaking[order]
+
+            # suffix sums (index k = positions k.. liquidated)
+            price_suffix = np.append(np.cumsum(p.prices[order][::-1])[::-1], 0.0)
+            debt_suffix = np.append(np.cumsum(p.debts[order][::-1])[::-1], 0.0)
+
+            group_factors = factors[:, group]
+            first = np.searchsorted(sorted_breaking, group_factors, side="right")
+
+            liquidations += len(order) - first
+            price_liquidated += group_factors * price_suffix[first]
+            debt_liquidated += debt_suffix[first]
+
+        # liquidated => shocked price < debt, so the shortfall is positive
+        collateral_sold = price_liquidated
+        bad_debt = np.maximum(
+            debt_liquidated - collateral_sold * (1.0 - self.sale_haircut),
+            0.0
+        )
+
+        return {
+            "liquidations": liquidations,
+            "collateral_sold": collateral_sold,
+            "debt_liquidated": debt_liquidated,
+            "bad_debt": bad_debt,
+            "weights": _normalize(weights, n_scenarios),
+        }
+
+# -------------------------------------------------
+# RISK MEASURES
+# -------------------------------------------------
+
+def _normalize(weights, n: int) -> np.ndarray:
+    if weights is None:
+        return np.full(n, 1.0 / n) if n else np.zeros(0)
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def var_cvar(losses: np.ndarray, level: float, weights: Optional[np.ndarray] = None):
+    """
+    Value-at-Risk and Conditional VaR (expected shortfall) at `level`
+    """
+    losses = np.asarray(losses, dtype=np.float64)
+    if not losses.size:
+        return 0.0, 0.0
+
+    weights = _normalize(weights, losses.size)
+    order = np.argsort(losses)
+    sorted_losses = losses[order]
+    cumulative = np.cumsum(weights[order])
+
+    i = min(int(np.searchsorted(cumulative, level, side="left")), losses.size - 1)
+    var = sorted_losses[i]
+
+    tail = sorted_losses >= var
+    cvar = np.average(sorted_losses[tail], weights=weights[order][tail])
+    return float(var), float(cvar)
+
+
+def risk_summary(result: Dict, levels: Sequence[float] = VAR_LEVELS) -> Dict:
+    """
+    Distribution summary of a StressEngine result
+    """
+    weights = result["weights"]
+    losses = result["bad_debt"]
+
+    summary = {
+        "scenarios": int(losses.size),
+        "expected_liquidations": float(np.dot(weights, result["liquidations"])),
+        "expected_collateral_sold": float(np.dot(weights, result["collateral_sold"])),
+        "expected_bad_debt": float(np.dot(weights, losses)),
+        "max_bad_debt": float(losses.max()) if losses.size else 0.0,
+    }
+
+    for level in levels:
+        var, cvar = var_cvar(losses, level, weights)
+        pct = f"{level * 100:g}"
+        summary[f"var_{pct}"] = var
+        summary[f"cvar_{pct}"] = cvar
+
+    return summary
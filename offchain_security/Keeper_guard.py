@@ -1,7 +1,103 @@
-keepers = set()
+import threading
+import time
+from collections import OrderedDict
 
-def register_keeper(addr):
-    keepers.add(addr)
+from config import KEEPER_HEARTBEAT_INTERVAL, KEEPER_MAX_MISSED, MIN_ACTIVE_KEEPERS
+
+
+class KeeperLiveness:
+    """
+    Keeper heartbeats in last-seen order
+
+    Live keepers sit in an OrderedDict, oldest heartbeat first; a
+    heartbeat moves its keeper to the end and expiry pops from the
+    front, so live counts, lag and missed intervals are O(1)
+    (amortized) whatever the number of keepers.
+    """
+
+    def __init__(self, interval: float = KEEPER_HEARTBEAT_INTERVAL, max_missed: int = KEEPER_MAX_MISSED):
+        self.interval = interval
+        self.expiry = interval * max_missed
+        self._live = OrderedDict()     # keeper -> last heartbeat (live only)
+        self._last_seen = {}           # keeper -> last heartbeat (all)
+        self._newest = float("-inf")
+        self._lock = threading.Lock()
+
+    def heartbeat(self, keeper, timestamp=None, now=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        now = time.time() if now is None else now
+        with self._lock:
+            # late / replayed heartbeats never move a keeper back in time
+            if timestamp <= self._last_seen.get(keeper, float("-inf")):
+                return
+            self._last_seen[keeper] = timestamp
+
+            # already expired (e.g. a replayed old block): seen, not live
+            if now - timestamp > self.expiry:
+                self._live.pop(keeper, None)
+                return
+            self._live.pop(keeper, None)
+            self._live[keeper] = timestamp
+
+            # in-order heartbeats append at the end; a skewed
+            # one (older than the newest) re-sorts to keep expiry exact
+            if timestamp >= self._newest:
+                self._newest = timestamp
+            else:
+                self._live = OrderedDict(sorted(self._live.items(), key=lambda kv: kv[1]))
+
+    def _expire(self, now):
+        while self._live:
+            keeper, seen = next(iter(self._live.items()))
+            if now - seen <= self.expiry:
+                break
+            self._live.popitem(last=False)
+
+    def live_count(self, now=None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return len(self._live)
+
+    def live(self, now=None) -> list:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return list(self._live)
+
+    def lag(self, keeper, now=None):
+        """
+        Seconds since the keeper's last heartbeat (None if never seen)
+        """
+        now = time.time() if now is None else now
+        seen = self._last_seen.get(keeper)
+        return None if seen is None else max(now - seen, 0.0)
+
+    def missed_intervals(self, keeper, now=None):
+        lag = self.lag(keeper, now)
+        return None if lag is None else int(lag // self.interval)
+
+    def export_state(self) -> dict:
+        with self._lock:
+            return {"last_seen": dict(self._last_seen)}
+
+    def restore_state(self, state: dict):
+        with self._lock:
+            self._last_seen = dict(state.get("last_seen", {}))
+            self._live = OrderedDict(sorted(self._last_seen.items(), key=lambda kv: kv[1]))
+            self._newest = max(self._last_seen.values(), default=float("-inf"))
+
+
+liveness = KeeperLiveness()
+
+def register_keeper(addr, timestamp=None):
+    liveness.heartbeat(addr, timestamp)
 
 def has_active_keepers():
-    return len(keepers) >= 3
+    return liveness.live_count() >= MIN_ACTIVE_KEEPERS
+
+def export_state():
+    return liveness.export_state()
+
+def restore_state(state):
+    liveness.restore_state(state)
@@ -1,5 +1,278 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
 import requests
-from config import ALERT_WEBHOOK
+from config import (
+    ALERT_WEBHOOK,
+    ALERT_TIMEOUT,
+    ALERT_QUEUE_SIZE,
+    ALERT_DEDUP_WINDOW,
+    ALERT_BATCH_SIZE,
+    ALERT_BATCH_INTERVAL,
+    ALERT_MAX_RETRIES,
+    ALERT_BACKOFF,
+    ALERT_SPILL_PATH,
+)
+
+MAX_BACKOFF = 60
+MAX_DEDUP_KEYS = 10_000
+
+
+def webhook_transport(url=ALERT_WEBHOOK, timeout=ALERT_TIMEOUT):
+    """
+    transport(payload) posting to a Discord-style webhook
+    """
+    def post(payload):
+        response = requests.post(url, json=payload, timeout=timeout)
+        response.raise_for_status()
+    return post
+
+
+class AlertDispatcher:
+    """
+    Non-blocking alert delivery
+
+    - submit() never waits: bounded queue, spill to disk when full
+    - per-key dedup: a key is sent at most once per `dedup_window`,
+      repeats are counted and reported with the next alert of the key,
+      or in a "(+N suppressed)" summary once the window has expired
+    - a worker thread batches alerts into one message and retries
+      with exponential backoff; undelivered batches are spilled
+      (JSON lines) and replayed after the next successful delivery
+      (at-least-once: a timed-out post may still have been delivered)
+
+    transport(payload) raises on failure; payload = {"content": text}.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        queue_size: int = ALERT_QUEUE_SIZE,
+        dedup_window: float = ALERT_DEDUP_WINDOW,
+        batch_size: int = ALERT_BATCH_SIZE,
+        batch_interval: float = ALERT_BATCH_INTERVAL,
+        max_retries: int = ALERT_MAX_RETRIES,
+        backoff: float = ALERT_BACKOFF,
+        spill_path: str = ALERT_SPILL_PATH
+    ):
+        self.transport = transport or webhook_transport()
+        self.dedup_window = dedup_window
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.spill_path = spill_path
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._seen = {}            # key -> [last sent, suppressed since, last msg]
+        self._pending = set()      # keys with suppressed repeats to report
+        self._spill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.sent = 0
+        self.suppressed = 0
+        self.spilled = 0
+
+    # ------------------
+    # Producer side
+    # ------------------
+
+    def submit(self, msg, key=None) -> bool:
+        """
+        Queue an alert; False if suppressed as a duplicate
+        """
+        key = msg if key is None else key
+        now = time.time()
+
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.dedup_window:
+                seen[1] += 1
+                seen[2] = msg
+                self._pending.add(key)
+                self.suppressed += 1
+                return False
+
+            repeats = seen[1] if seen is not None else 0
+            self._seen[key] = [now, 0, msg]
+            self._pending.discard(key)
+            if len(self._seen) > MAX_DEDUP_KEYS:
+                self._prune(now)
+
+        alert = {"msg": msg, "key": key, "time": now, "repeats": repeats}
+        try:
+            self.queue.put_nowait(alert)
+        except queue.Full:
+            self._spill([alert])
+        return True
+
+    def _prune(self, now):
+        # keys with unreported repeats stay until flush_suppressed()
+        expired = [
+            k for k, (last, _, _) in self._seen.items()
+            if now - last >= self.dedup_window and k not in self._pending
+        ]
+        for k in expired:
+            del self._seen[k]
+
+    def flush_suppressed(self, force: bool = False) -> int:
+        """
+        Queue a "(+N suppressed)" summary for every key whose window
+        expired with repeats and no new alert to carry them (all keys
+        with repeats if `force`); returns how many were queued
+        """
+        now = time.time()
+        alerts = []
+
+        with self._lock:
+            for key in list(self._pending):
+                seen = self._seen[key]
+                if not force and now - seen[0] < self.dedup_window:
+                    continue
+                alerts.append({"msg": seen[2], "key": key, "time": now, "repeats": seen[1]})
+                # the summary counts as the key's alert for a new window
+                self._seen[key] = [now, 0, seen[2]]
+                self._pending.discard(key)
+
+        for alert in alerts:
+            try:
+                self.queue.put_nowait(alert)
+            except queue.Full:
+                self._spill([alert])
+        return len(alerts)
+
+    # ------------------
+    # Delivery
+    # ------------------
+
+    @staticmethod
+    def format(alerts) -> dict:
+        lines = []
+        for alert in alerts:
+            line = alert["msg"]
+            if alert.get("repeats"):
+                line += f" (+{alert['repeats']} suppressed)"
+            lines.append(line)
+        return {"content": "\n".join(lines)}
+
+    def _deliver(self, alerts) -> bool:
+        payload = self.format(alerts)
+        delay = self.backoff
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.transport(payload)
+                self.sent += len(alerts)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries or self._stop.is_set():
+                    print(f"[ALERT] delivery failed: {e}")
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_BACKOFF)
+
+        self._spill(alerts)
+        return False
+
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.batch_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.time() + self.batch_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.flush_suppressed()
+            batch = self._next_batch()
+            if batch and self._deliver(batch):
+                self.replay_spill()
+
+        # drain what is left without waiting for batches to fill
+        self.flush_suppressed(force=True)
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        for i in range(0, len(remaining), self.batch_size):
+            self._deliver(remaining[i:i + self.batch_size])
+
+    # ------------------
+    # Disk spill
+    # ------------------
+
+    def _spill(self, alerts):
+        with self._spill_lock:
+            with open(self.spill_path, "a") as f:
+                for alert in alerts:
+                    f.write(json.dumps(alert) + "\n")
+            self.spilled += len(alerts)
+
+    def replay_spill(self) -> int:
+        """
+        Re-send spilled alerts; returns how many were delivered
+        """
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return 0
+            pending = self.spill_path + ".replay"
+            os.replace(self.spill_path, pending)
+
+        with open(pending) as f:
+            alerts = [json.loads(line) for line in f if line.strip()]
+        os.remove(pending)
+
+        delivered = 0
+        for i in range(0, len(alerts), self.batch_size):
+            batch = alerts[i:i + self.batch_size]
+            if self._deliver(batch):
+                delivered += len(batch)
+        return delivered
+
+    # ------------------
+    # Lifecycle
+    # ------------------
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="alerting", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> AlertDispatcher:
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher().start()
+            atexit.register(_dispatcher.stop)
+        return _dispatcher
+
 
-def send_alert(msg):
-    requests.post(ALERT_WEBHOOK, json={"content": msg})
+def send_alert(msg, key=None):
+    return get_dispatcher().submit(msg, key=key)
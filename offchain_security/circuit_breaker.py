@@ -1,9 +1,25 @@
+import threading
+
 paused = False
+reason = None
+_lock = threading.Lock()
 
-def trigger(reason):
-    global paused
-    paused = True
-    print(f"[CIRCUIT BREAKER] PAUSED: {reason}")
+def trigger(why):
+    global paused, reason
+    with _lock:
+        paused = True
+        reason = why
+    print(f"[CIRCUIT BREAKER] PAUSED: {why}")
 
 def is_paused():
     return paused
+
+def export_state():
+    with _lock:
+        return {"paused": paused, "reason": reason}
+
+def restore_state(state):
+    global paused, reason
+    with _lock:
+        paused = state.get("paused", False)
+        reason = state.get("reason")
@@ -3,5 +3,27 @@ NFT_PRICE_MAX_DEVIATION = 0.25     # 25%
 MAX_UTILIZATION = 0.90
 CRISIS_UTILIZATION = 0.95
 MAX_MINT_PER_DAY = 50_000 * 10**18
+MAX_MINT_PER_HOUR = 10_000 * 10**18
+RATE_LIMIT_BUCKET_SECONDS = 60     # sliding-window resolution
 TREASURY_DELAY = 86400
 ALERT_WEBHOOK = "https://discord/webhook"
+ORACLE_WINDOW = 120                # prices kept per source
+ORACLE_MIN_SAMPLES = 10            # before outlier checks kick in
+ORACLE_MAD_THRESHOLD = 6.0         # robust z-score limit
+ORACLE_MAX_VELOCITY = 0.10         # 10% per minute per source
+SECURITY_STATE_PATH = "security_state.db"
+SUPERVISOR_QUEUE_SIZE = 10_000     # events buffered before backpressure
+SUPERVISOR_FLUSH_EVENTS = 1_000    # persist guard state every N events
+SUPERVISOR_FLUSH_SECONDS = 5       # ... or every N seconds
+KEEPER_GRACE_PERIOD = 300          # seconds before keeper checks start
+ALERT_TIMEOUT = 5                  # seconds per webhook call
+ALERT_QUEUE_SIZE = 1_000
+ALERT_DEDUP_WINDOW = 300           # same key alerted at most once per window
+ALERT_BATCH_SIZE = 20              # alerts per webhook message
+ALERT_BATCH_INTERVAL = 2           # seconds to wait for a batch to fill
+ALERT_MAX_RETRIES = 5
+ALERT_BACKOFF = 1.0                # seconds, doubled per retry
+ALERT_SPILL_PATH = "alerts_spill.jsonl"
+KEEPER_HEARTBEAT_INTERVAL = 300    # seconds between expected keeper heartbeats
+KEEPER_MAX_MISSED = 3              # missed intervals before a keeper is dead
+MIN_ACTIVE_KEEPERS = 3
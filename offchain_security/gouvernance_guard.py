@@ -1,17 +1,21 @@
-import time
-from config import MAX_MINT_PER_DAY
+from config import MAX_MINT_PER_DAY, MAX_MINT_PER_HOUR
+from rate_limiter import SlidingWindowLimiter
 
-minted_today = 0
-last_reset = time.time()
+# sliding caps: no fixed reset to mint across
+mint_limiter = SlidingWindowLimiter({
+    "hour": (3600, MAX_MINT_PER_HOUR),
+    "day": (86400, MAX_MINT_PER_DAY),
+})
 
-def can_mint(amount):
-    global minted_today, last_reset
-    if time.time() - last_reset > 86400:
-        minted_today = 0
-        last_reset = time.time()
+# now: mint time (block timestamp), wall clock if None
+def can_mint(amount, now=None):
+    return mint_limiter.check(amount, now)
 
-    return minted_today + amount <= MAX_MINT_PER_DAY
+def register_mint(amount, now=None):
+    mint_limiter.record(amount, now)
 
-def register_mint(amount):
-    global minted_today
-    minted_today += amount
+def export_state():
+    return mint_limiter.export_state()
+
+def restore_state(state):
+    mint_limiter.restore_state(state)
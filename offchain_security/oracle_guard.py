@@ -1,6 +1,21 @@
-from web3 import Web3
+import bisect
+import math
+import threading
+import time
+from collections import deque
 from statistics import median
-from config import NFT_PRICE_MAX_DEVIATION
+
+from config import (
+    NFT_PRICE_MAX_DEVIATION,
+    ORACLE_WINDOW,
+    ORACLE_MIN_SAMPLES,
+    ORACLE_MAD_THRESHOLD,
+    ORACLE_MAX_VELOCITY,
+)
+
+MAD_SCALE = 1.4826               # MAD -> sigma for normal data
+MIN_RELATIVE_SPREAD = 0.005      # floor on the robust spread (flat windows)
+
 
 def check_nft_price(prices: list[float]) -> bool:
     med = median(prices)
@@ -8,3 +23,180 @@ def check_nft_price(prices: list[float]) -> bool:
         if abs(p - med) / med > NFT_PRICE_MAX_DEVIATION:
             return False
     return True
+
+
+class PriceWindow:
+    """
+    Last `size` prices of one source, in arrival order and sorted
+
+    median: O(1), MAD: O(log n) (k-th smallest of the two sorted
+    distance runs on each side of the median).
+    push: bisect lookups, but insort/del shift the list, so O(n).
+    Kept over two heaps with lazy deletion: the MAD selection needs
+    random access into the sorted run, which heaps do not give, and
+    at ORACLE_WINDOW (~100 prices) the shift is one small memmove.
+    """
+
+    def __init__(self, size: int = ORACLE_WINDOW):
+        self.size = size
+        self._fifo = deque()
+        self._sorted = []
+
+    def push(self, price: float):
+        if len(self._fifo) == self.size:
+            old = self._fifo.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+        self._fifo.append(price)
+        bisect.insort(self._sorted, price)
+
+    def median(self) -> float:
+        xs, n = self._sorted, len(self._sorted)
+        if n % 2:
+            return xs[n // 2]
+        return (xs[n // 2 - 1] + xs[n // 2]) / 2
+
+    def mad(self) -> float:
+        xs, n = self._sorted, len(self._sorted)
+        m = self.median()
+        split = bisect.bisect_left(xs, m)
+
+        # distances below / above the median, both ascending
+        left = lambda j: m - xs[split - 1 - j]
+        right = lambda j: xs[split + j] - m
+
+        def kth(k):
+            n_left, n_right = split, n - split
+            lo, hi = max(0, k + 1 - n_right), min(k + 1, n_left)
+            while lo < hi:
+                a = (lo + hi) // 2
+                if left(a) < right(k - a):
+                    lo = a + 1
+                else:
+                    hi = a
+            b = k + 1 - lo
+            return max(
+                left(lo - 1) if lo > 0 else -math.inf,
+                right(b - 1) if b > 0 else -math.inf,
+            )
+
+        if n % 2:
+            return kth(n // 2)
+        return (kth(n // 2 - 1) + kth(n // 2)) / 2
+
+    def values(self) -> list:
+        return list(self._fifo)
+
+    def __len__(self):
+        return len(self._fifo)
+
+
+class OracleGuard:
+    """
+    Streaming price checks, one call per oracle update
+
+    - outlier    : robust z-score |p - median| / (1.4826 * MAD)
+                   against the source's own window
+    - velocity   : relative move per minute since the source's last price
+    - divergence : deviation from the median of the latest price
+                   of every source for the same asset
+
+    Returns the anomalies of each update (empty list = clean).
+    """
+
+    def __init__(
+        self,
+        window: int = ORACLE_WINDOW,
+        min_samples: int = ORACLE_MIN_SAMPLES,
+        mad_threshold: float = ORACLE_MAD_THRESHOLD,
+        max_velocity: float = ORACLE_MAX_VELOCITY,
+        max_deviation: float = NFT_PRICE_MAX_DEVIATION
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.mad_threshold = mad_threshold
+        self.max_velocity = max_velocity
+        self.max_deviation = max_deviation
+
+        self._lock = threading.Lock()
+        self.windows = {}        # (asset, source) -> PriceWindow
+        self.last = {}           # (asset, source) -> (timestamp, price)
+        self.latest = {}         # asset -> {source: price}
+
+    def update(self, source: str, price: float, timestamp: float = None, asset: str = "nft") -> list:
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            key = (asset, source)
+            anomalies = []
+
+            window = self.windows.get(key)
+            if window is None:
+                window = self.windows[key] = PriceWindow(self.window)
+
+            if len(window) >= self.min_samples:
+                med = window.median()
+                spread = max(MAD_SCALE * window.mad(), abs(med) * MIN_RELATIVE_SPREAD)
+                score = abs(price - med) / spread
+                if score > self.mad_threshold:
+                    anomalies.append(_anomaly("outlier", asset, source, price, score))
+
+            previous = self.last.get(key)
+            if previous is not None and previous[1] > 0:
+                minutes = max(timestamp - previous[0], 60.0) / 60
+                velocity = abs(price / previous[1] - 1) / minutes
+                if velocity > self.max_velocity:
+                    anomalies.append(_anomaly("velocity", asset, source, price, velocity))
+
+            latest = self.latest.setdefault(asset, {})
+            latest[source] = price
+            if len(latest) >= 2:
+                reference = median(latest.values())
+                deviation = abs(price - reference) / reference if reference else 0.0
+                if deviation > self.max_deviation:
+                    anomalies.append(_anomaly("divergence", asset, source, price, deviation))
+
+            window.push(price)
+            self.last[key] = (timestamp, price)
+            return anomalies
+
+    def is_healthy(self, asset: str = "nft") -> bool:
+        """
+        Latest prices of every source agree (same rule as check_nft_price)
+        """
+        with self._lock:
+            prices = list(self.latest.get(asset, {}).values())
+        return not prices or check_nft_price(prices)
+
+    def export_state(self) -> dict:
+        with self._lock:
+            return {
+                "sources": [
+                    [asset, source, window.values(), *self.last.get((asset, source), (None, None))]
+                    for (asset, source), window in self.windows.items()
+                ],
+                "latest": self.latest,
+            }
+
+    def restore_state(self, state: dict):
+        with self._lock:
+            self.windows, self.last = {}, {}
+            for asset, source, values, timestamp, price in state.get("sources", ()):
+                window = self.windows[(asset, source)] = PriceWindow(self.window)
+                for value in values:
+                    window.push(value)
+                if timestamp is not None:
+                    self.last[(asset, source)] = (timestamp, price)
+            self.latest = {
+                asset: dict(prices) for asset, prices in state.get("latest", {}).items()
+            }
+
+
+def _anomaly(kind, asset, source, price, score):
+    return {
+        "kind": kind,
+        "asset": asset,
+        "source": source,
+        "price": price,
+        "score": round(score, 4),
+    }
@@ -0,0 +1,146 @@
+import threading
+import time
+
+from config import RATE_LIMIT_BUCKET_SECONDS
+
+
+class SlidingWindowLimiter:
+    """
+    Volume caps over sliding windows (mints, borrows, liquidations...)
+
+    windows : {name: (seconds, limit)}, e.g.
+              {"hour": (3600, cap_1h), "day": (86400, cap_24h)}
+
+    Amounts are summed into per-bucket slots of a ring buffer sized
+    for the longest window. Each window keeps a running total and
+    the oldest bucket it still covers; as time advances, expired
+    buckets are subtracted once, so checks are O(1) (amortized)
+    and exact at bucket resolution.
+    """
+
+    def __init__(self, windows: dict, bucket_seconds: int = RATE_LIMIT_BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.windows = {
+            name: (-(-seconds // bucket_seconds), limit)
+            for name, (seconds, limit) in windows.items()
+        }
+
+        size = max(buckets for buckets, _ in self.windows.values())
+        self._amounts = [0] * size
+        self._buckets = [-1] * size
+        self._totals = {name: 0 for name in self.windows}
+        self._tails = {name: None for name in self.windows}
+        self._current = None
+        self._lock = threading.Lock()
+
+    def _bucket(self, now) -> int:
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        # clock going backwards: stay in the current bucket
+        if self._current is not None and bucket < self._current:
+            return self._current
+        return bucket
+
+    def _advance(self, bucket: int):
+        size = len(self._amounts)
+
+        for name, (length, _) in self.windows.items():
+            tail = bucket - length + 1
+            old = self._tails[name]
+
+            if old is None:
+                pass
+            elif tail - old >= length:
+                self._totals[name] = 0
+            else:
+                for b in range(old, tail):
+                    slot = b % size
+                    if self._buckets[slot] == b:
+                        self._totals[name] -= self._amounts[slot]
+            self._tails[name] = tail
+
+        self._current = bucket
+
+    def check(self, amount, now=None) -> bool:
+        """
+        Would `amount` fit in every window
+        """
+        with self._lock:
+            self._advance(self._bucket(now))
+            return all(
+                self._totals[name] + amount <= limit
+                for name, (_, limit) in self.windows.items()
+            )
+
+    def record(self, amount, now=None):
+        with self._lock:
+            bucket = self._bucket(now)
+            self._advance(bucket)
+            self._add(bucket, amount)
+
+    def try_acquire(self, amount, now=None) -> bool:
+        """
+        Atomic check + record
+        """
+        with self._lock:
+            bucket = self._bucket(now)
+            self._advance(bucket)
+            if any(
+                self._totals[name] + amount > limit
+                for name, (_, limit) in self.windows.items()
+            ):
+                return False
+            self._add(bucket, amount)
+            return True
+
+    def _add(self, bucket: int, amount):
+        slot = bucket % len(self._amounts)
+        if self._buckets[slot] != bucket:
+            self._buckets[slot] = bucket
+            self._amounts[slot] = 0
+        self._amounts[slot] += amount
+        for name in self._totals:
+            self._totals[name] += amount
+
+    def used(self, now=None) -> dict:
+        with self._lock:
+            self._advance(self._bucket(now))
+            return dict(self._totals)
+
+    def remaining(self, now=None) -> dict:
+        with self._lock:
+            self._advance(self._bucket(now))
+            return {
+                name: limit - self._totals[name]
+                for name, (_, limit) in self.windows.items()
+            }
+
+    def export_state(self) -> dict:
+        with self._lock:
+            if self._current is None:
+                return {"buckets": []}
+            oldest = self._current - len(self._amounts) + 1
+            return {
+                "bucket_seconds": self.bucket_seconds,
+                "buckets": sorted(
+                    [b, a] for b, a in zip(self._buckets, self._amounts)
+                    if b >= oldest and a
+                ),
+            }
+
+    def restore_state(self, state: dict):
+        bucket_seconds = state.get("bucket_seconds", self.bucket_seconds)
+        with self._lock:
+            size = len(self._amounts)
+            self._amounts = [0] * size
+            self._buckets = [-1] * size
+            self._totals = {name: 0 for name in self.windows}
+            self._tails = {name: None for name in self.windows}
+            self._current = None
+
+            # oldest first, so every bucket is added at the head
+            for bucket, amount in sorted(state.get("buckets", ())):
+                # re-bucket if the resolution changed
+                bucket = bucket * bucket_seconds // self.bucket_seconds
+                if self._current is None or bucket > self._current:
+                    self._advance(bucket)
+                self._add(self._current, amount)
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import threading
+import time
+
+from config import SECURITY_STATE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guard_state (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS keeper_heartbeat (
+    keeper      TEXT PRIMARY KEY,
+    timestamp   REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SecurityStateStore:
+    """
+    Durable guard state (SQLite, one JSON document per key)
+
+    save() writes all keys in one transaction, so a restart
+    restores a consistent state from the last flush.
+
+    Keeper heartbeats have their own table: bots write them from
+    other processes, the supervisor polls them (heartbeats()).
+    """
+
+    def __init__(self, path: str = SECURITY_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def load(self) -> dict:
+        with self._lock:
+            rows = self.db.execute("SELECT key, value FROM guard_state").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT value FROM guard_state WHERE key = ?", (key,)
+            ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def save(self, state: dict):
+        rows = [
+            (key, json.dumps(value, separators=(",", ":")))
+            for key, value in state.items()
+        ]
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO guard_state VALUES (?, ?)", rows
+            )
+
+    def heartbeat(self, keeper: str, timestamp: float = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO keeper_heartbeat VALUES (?, ?)",
+                (keeper, timestamp)
+            )
+
+    def heartbeats(self, since: float = None) -> list:
+        """
+        [(keeper, timestamp)] of heartbeats after `since`, oldest first
+        """
+        with self._lock:
+            return self.db.execute(
+                "SELECT keeper, timestamp FROM keeper_heartbeat "
+                "WHERE timestamp > ? ORDER BY timestamp",
+                (float("-inf") if since is None else since,)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.db.close()
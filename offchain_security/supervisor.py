@@ -1,8 +1,30 @@
-from oracle_guard import check_nft_price
-from governance_guard import can_mint
-from keeper_guard import has_active_keepers
+import queue
+import threading
+import time
+
+from config import (
+    SUPERVISOR_QUEUE_SIZE,
+    SUPERVISOR_FLUSH_EVENTS,
+    SUPERVISOR_FLUSH_SECONDS,
+    KEEPER_GRACE_PERIOD,
+    MIN_ACTIVE_KEEPERS,
+)
+from oracle_guard import OracleGuard, check_nft_price
+from gouvernance_guard import can_mint, register_mint
+from Keeper_guard import has_active_keepers, register_keeper
 from circuit_breaker import trigger
 from alerting import send_alert
+import circuit_breaker
+import gouvernance_guard
+import Keeper_guard
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+KEEPER_EVENTS = {
+    "KeeperHeartbeat": "keeper",
+    "CollateralSeized": "liquidator",
+    "LiquidationTriggered": "liquidator",
+}
 
 def supervise(state):
     if not check_nft_price(state["nft_prices"]):
@@ -16,3 +38,230 @@ def supervise(state):
     if not can_mint(state["mint_amount"]):
         trigger("Excessive mint")
         send_alert("Mint cap exceeded")
+
+
+class Supervisor:
+    """
+    Event-driven supervision of the decoded event stream
+
+    Events are web3-style dicts ({"event", "args", "blockNumber",
+    optional "address" / "timestamp"}); on-chain events carry their
+    block timestamp (events_listener.poll):
+    - Transfer from the zero address (or Mint) : mint cap
+      (NativeToken Transfer: sender / receiver / value)
+    - PriceUpdated {source, asset, value}      : streaming oracle guard
+      (price feed observations; TerrainPriceOracle's PriceUpdated
+      {"param", "value"} is a DAO parameter change, not a price,
+      and is left to governance)
+    - KeeperHeartbeat / liquidations           : keeper liveness
+      (local pings: submit a KeeperHeartbeat {"keeper": addr};
+      bots in other processes write store.heartbeat(), polled here)
+
+    Guard state is restored from `store` on construction and
+    flushed every `flush_events` events / `flush_seconds` seconds.
+    submit() / on_events() only enqueue; a worker thread evaluates.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        oracle: OracleGuard = None,
+        alert=send_alert,
+        queue_size: int = SUPERVISOR_QUEUE_SIZE,
+        flush_events: int = SUPERVISOR_FLUSH_EVENTS,
+        flush_seconds: float = SUPERVISOR_FLUSH_SECONDS,
+        keeper_grace: float = KEEPER_GRACE_PERIOD
+    ):
+        self.store = store
+        self.oracle = oracle or OracleGuard()
+        self.alert = alert
+        self.flush_events = flush_events
+        self.flush_seconds = flush_seconds
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.cursor = None               # last block fully supervised
+        self.processed = 0
+        self._unflushed = 0
+        self._last_flush = time.time()
+        self._keepers_from = time.time() + keeper_grace
+        self._heartbeats_since = None    # last store heartbeat polled
+
+        if store is not None:
+            self.restore(store.load())
+
+    # ------------------
+    # State
+    # ------------------
+
+    def export_state(self) -> dict:
+        return {
+            "circuit_breaker": circuit_breaker.export_state(),
+            "governance": gouvernance_guard.export_state(),
+            "keepers": Keeper_guard.export_state(),
+            "oracle": self.oracle.export_state(),
+            "cursor": self.cursor,
+        }
+
+    def restore(self, state: dict):
+        if "circuit_breaker" in state:
+            circuit_breaker.restore_state(state["circuit_breaker"])
+        if "governance" in state:
+            gouvernance_guard.restore_state(state["governance"])
+        if "keepers" in state:
+            Keeper_guard.restore_state(state["keepers"])
+        if "oracle" in state:
+            self.oracle.restore_state(state["oracle"])
+        self.cursor = state.get("cursor")
+
+    def flush(self):
+        if self.store is not None:
+            self.store.save(self.export_state())
+        self._unflushed = 0
+        self._last_flush = time.time()
+
+    # ------------------
+    # Evaluation
+    # ------------------
+
+    def _incident(self, reason, message):
+        trigger(reason)
+        # one alert per reason per dedup window, however often it fires
+        self.alert(message, key=reason)
+
+    def handle(self, event) -> list:
+        """
+        Evaluate the guards touched by one event; returns incident reasons
+
+        On-chain events at or below `cursor` were supervised before
+        a restart (the listener resumes from the book's older
+        snapshot) and are skipped, so mints are not counted twice.
+        """
+        block = event.get("blockNumber")
+        if self.cursor is not None and block is not None and block <= self.cursor:
+            return []
+
+        name = event["event"]
+        args = event["args"]
+        incidents = []
+
+        if name == "Mint" or (name == "Transfer" and args.get("sender") == ZERO_ADDRESS):
+            amount = args["value"] if "value" in args else args["amount"]
+            # bucketed at the block time: a catch-up replays hours of mints at once
+            now = event.get("timestamp")
+            if not can_mint(amount, now):
+                incidents.append("Excessive mint")
+                self._incident("Excessive mint", f"Mint cap exceeded ({amount})")
+            register_mint(amount, now)
+
+        elif name == "PriceUpdated" and "param" not in args:
+            anomalies = self.oracle.update(
+                args.get("source", event.get("address", "oracle")),
+                float(args["value"]),
+                event.get("timestamp"),
+                asset=str(args.get("asset", "nft")),
+            )
+            if anomalies:
+                incidents.append("NFT oracle deviation")
+                kinds = ", ".join(a["kind"] for a in anomalies)
+                self._incident(
+                    "NFT oracle deviation",
+                    f"NFT price manipulation detected ({kinds}: {anomalies[0]['price']})"
+                )
+
+        elif name in KEEPER_EVENTS:
+            register_keeper(args[KEEPER_EVENTS[name]], event.get("timestamp"))
+
+        self.processed += 1
+        self._unflushed += 1
+        return incidents
+
+    def poll_heartbeats(self) -> int:
+        """
+        Register the keeper heartbeats written to the store since the last poll
+        """
+        if self.store is None:
+            return 0
+
+        beats = self.store.heartbeats(self._heartbeats_since)
+        for keeper, timestamp in beats:
+            register_keeper(keeper, timestamp)
+            self._heartbeats_since = timestamp
+        return len(beats)
+
+    def tick(self) -> list:
+        """
+        Time-based checks, run between events
+        """
+        incidents = []
+        if time.time() >= self._keepers_from and not has_active_keepers():
+            incidents.append("Keeper failure")
+            live = Keeper_guard.liveness.live_count()
+            self._incident(
+                "Keeper failure",
+                f"Insufficient keepers ({live}/{MIN_ACTIVE_KEEPERS} live)"
+            )
+            # re-check at the next flush interval, not on every event
+            self._keepers_from = time.time() + self.flush_seconds
+
+        if (
+            self._unflushed >= self.flush_events
+            or time.time() - self._last_flush >= self.flush_seconds
+        ):
+            # bots' heartbeats are picked up at the flush cadence
+            self.poll_heartbeats()
+            self.flush()
+        return incidents
+
+    # ------------------
+    # Stream
+    # ------------------
+
+    def submit(self, event):
+        """
+        Enqueue one event (blocks when the queue is full)
+        """
+        self.queue.put(event)
+
+    def on_events(self, events, to_block):
+        """
+        events_listener.poll on_events callback
+        """
+        for event in events:
+            self.queue.put(event)
+        self.queue.put({"event": "_cursor", "args": {}, "blockNumber": to_block})
+
+    def _run(self):
+        while not self._stop.is_set() or not self.queue.empty():
+            try:
+                event = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                self.tick()
+                continue
+
+            try:
+                if event["event"] == "_cursor":
+                    self.cursor = max(self.cursor or 0, event["blockNumber"])
+                else:
+                    self.handle(event)
+                self.tick()
+            except Exception as e:
+                print(f"[SUPERVISOR] error on {event.get('event')}: {e}")
+            finally:
+                self.queue.task_done()
+
+        self.flush()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="supervisor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# backend modules import each other flat (`from position_book import ...`)
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "..", "backend")
+
+for package in ("config", "indexer", "services", "api", "oracle", "bots"):
+    path = os.path.abspath(os.path.join(BACKEND, package))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# settings.validate() runs at import; offline tests (replay, api)
+# only need the required variables to be set
+for name in (
+    "RPC_URL",
+    "BOT_PRIVATE_KEY",
+    "BOT_ADDRESS",
+    "LENDING_POOL",
+    "LIQUIDATION_MANAGER",
+    "NFT_COLLATERAL_MANAGER",
+    "PRICE_ORACLE",
+):
+    os.environ.setdefault(name, "unused")
@@ -0,0 +1,103 @@
+import pytest
+
+from main import GZIP_MIN_SIZE, create_app
+from position_book import PositionBook
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_book(count=5):
+    book = PositionBook()
+    book.load(
+        [
+            # HF = price / debt: 0.5, 1.0, 1.5, ...
+            {"tokenId": i, "owner": f"0x{i % 2}", "debt": 100, "price": 50 * i}
+            for i in range(1, count + 1)
+        ],
+        block_number=10
+    )
+    return book
+
+
+async def test_etag_and_not_modified(aiohttp_client):
+    client = await aiohttp_client(create_app(make_book()))
+
+    response = await client.get("/positions")
+    assert response.status == 200
+    etag = response.headers["ETag"]
+    assert response.headers["X-Block-Number"] == "10"
+
+    response = await client.get("/positions", headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert await response.read() == b""
+
+
+async def test_cache_follows_the_book_version(aiohttp_client):
+    book = make_book()
+    client = await aiohttp_client(create_app(book))
+
+    response = await client.get("/positions/1")
+    etag = response.headers["ETag"]
+    assert (await response.json())["price"] == 50
+
+    book.record_price(1, 500, 11)
+
+    response = await client.get("/positions/1", headers={"If-None-Match": etag})
+    assert response.status == 200
+    assert response.headers["ETag"] != etag
+    assert (await response.json())["price"] == 500
+
+
+async def test_cursor_pagination_boundaries(aiohttp_client):
+    client = await aiohttp_client(create_app(make_book(5)))
+
+    async def page(query):
+        response = await client.get(f"/positions?{query}")
+        payload = await response.json()
+        return [p["tokenId"] for p in payload["items"]], payload["next_cursor"]
+
+    assert await page("limit=2") == ([1, 2], 2)
+    assert await page("limit=2&cursor=2") == ([3, 4], 4)
+    assert await page("limit=2&cursor=4") == ([5], None)
+    # a page that ends exactly on the last position has no next cursor
+    assert await page("limit=5") == ([1, 2, 3, 4, 5], None)
+    assert await page("cursor=5") == ([], None)
+    # cursor before the first tokenId, owner filter
+    assert await page("limit=2&cursor=0") == ([1, 2], 2)
+    assert await page("owner=0x1&cursor=1") == ([3, 5], None)
+
+    response = await client.get("/positions?cursor=abc")
+    assert response.status == 400
+
+
+async def test_liquidatable_filters_on_health_factor(aiohttp_client):
+    client = await aiohttp_client(create_app(make_book(5)))
+
+    response = await client.get("/liquidatable")
+    assert [p["tokenId"] for p in (await response.json())["items"]] == [1]
+
+    response = await client.get("/liquidatable?threshold=2.0")
+    payload = await response.json()
+    assert [p["tokenId"] for p in payload["items"]] == [1, 2, 3]
+
+    # pagination skips filtered positions
+    response = await client.get("/liquidatable?threshold=2.0&limit=2")
+    payload = await response.json()
+    assert [p["tokenId"] for p in payload["items"]] == [1, 2]
+    assert payload["next_cursor"] == 2
+
+
+async def test_gzip_only_when_accepted_and_large(aiohttp_client):
+    client = await aiohttp_client(create_app(make_book(50)))
+
+    response = await client.get("/positions", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len((await response.json())["items"]) == 50
+
+    response = await client.get("/positions", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert len(await response.read()) >= GZIP_MIN_SIZE
+
+    # small bodies are sent as is
+    response = await client.get("/positions/1", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
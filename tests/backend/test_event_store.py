@@ -0,0 +1,63 @@
+from event_store import EventStore
+
+
+def log(block, index, name, **args):
+    # web3 decoded logs carry the tx hash as bytes
+    return {
+        "blockNumber": block,
+        "logIndex": index,
+        "transactionHash": bytes([block % 256, index % 256]) * 16,
+        "event": name,
+        "args": args,
+    }
+
+
+def test_round_trip_in_chain_order(tmp_path):
+    store = EventStore(str(tmp_path / "events.db"))
+    events = [
+        log(12, 0, "Repaid", user="0xA", amount=5),
+        log(10, 1, "Borrowed", user="0xA", tokenId=1, amount=100),
+        log(10, 0, "CollateralDeposited", user="0xA", tokenId=1),
+    ]
+
+    assert store.ingest_range(10, 19, events) == 3
+
+    stored = list(store.events())
+    assert [(e["blockNumber"], e["logIndex"]) for e in stored] == [(10, 0), (10, 1), (12, 0)]
+    assert stored[1]["args"] == {"user": "0xA", "tokenId": 1, "amount": 100}
+    assert stored[1]["transactionHash"] == "0x" + events[1]["transactionHash"].hex()
+
+    assert [e["event"] for e in store.events_for_token(1)] == ["CollateralDeposited", "Borrowed"]
+    assert len(store.events_for_user("0xa")) == 3
+    store.close()
+
+
+def test_reingesting_a_range_adds_nothing(tmp_path):
+    store = EventStore(str(tmp_path / "events.db"))
+    events = [log(10, 0, "CollateralDeposited", user="0xa", tokenId=1)]
+
+    assert store.ingest_range(10, 19, events) == 1
+    assert store.ingest_range(10, 19, events) == 0
+    assert store.count() == 1
+    assert store.ingested_ranges() == [(10, 19)]
+    store.close()
+
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / "events.db")
+
+    # ranges land out of order (parallel workers), then the process dies
+    store = EventStore(path)
+    store.ingest_range(0, 9, [log(5, 0, "CollateralDeposited", user="0xa", tokenId=1)])
+    store.ingest_range(20, 29, [log(25, 0, "Borrowed", user="0xa", tokenId=1, amount=7)])
+    store.close()
+
+    store = EventStore(path)
+    assert store.last_contiguous_block(0) == 9
+    assert store.missing_ranges(0, 44, 10) == [(10, 19), (30, 39), (40, 44)]
+
+    store.ingest_range(10, 19, [])
+    assert store.last_contiguous_block(0) == 29
+    assert store.missing_ranges(0, 29, 10) == []
+    assert store.count() == 2
+    store.close()
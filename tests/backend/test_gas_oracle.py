@@ -0,0 +1,66 @@
+import pytest
+
+from gas_oracle import GasOracle, GWEI
+
+
+class FakeEth:
+    def __init__(self, base_fee=30 * GWEI):
+        self.block_number = 100
+        self.gas_price = 40 * GWEI
+        self.base_fee = base_fee
+        self.failures = 0
+        self.history_calls = 0
+
+    def fee_history(self, count, latest, percentiles):
+        self.history_calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("rpc timeout")
+        return {
+            "oldestBlock": latest - count + 1,
+            "baseFeePerGas": [self.base_fee] * (count + 1),
+            "reward": [[GWEI] * len(percentiles)] * count,
+        }
+
+    def get_block(self, block):
+        return {"number": self.block_number, "baseFeePerGas": self.base_fee}
+
+
+class FakeWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+def test_transient_failure_falls_back_for_one_block_only():
+    eth = FakeEth()
+    eth.failures = 1
+    oracle = GasOracle(FakeWeb3(eth))
+
+    assert oracle.fees() == {"gasPrice": eth.gas_price}
+    assert oracle.fees() == {"gasPrice": eth.gas_price}
+    assert eth.history_calls == 1           # no retry within the failed block
+
+    eth.block_number += 1
+    oracle._block_checked_at = 0.0
+    fees = oracle.fees()
+    assert "maxFeePerGas" in fees
+    assert not oracle._legacy
+
+
+def test_chain_without_base_fee_latches_legacy():
+    eth = FakeEth(base_fee=None)
+    eth.failures = 10
+    oracle = GasOracle(FakeWeb3(eth))
+
+    assert oracle.fees() == {"gasPrice": eth.gas_price}
+    assert oracle._legacy
+
+    eth.block_number += 1
+    oracle._block_checked_at = 0.0
+    assert oracle.fees() == {"gasPrice": eth.gas_price}
+    assert eth.history_calls == 1
+
+
+def test_unknown_urgency():
+    with pytest.raises(ValueError):
+        GasOracle(FakeWeb3(FakeEth())).fees("urgent")
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from interest_simulator import RAY, InterestSimulator, get_borrow_rate
+
+WEI = 10**18
+
+
+@pytest.mark.parametrize("borrowed, liquidity, rate", [
+    (0, 100 * WEI, 2 * 10**25),                    # empty pool: base rate
+    (100 * WEI, 0, 2 * 10**25),
+    (1, 100 * WEI, 2 * 10**25),                    # utilization rounds to 0 bps
+    (40 * WEI, 100 * WEI, 4 * 10**25),             # half way to the kink
+    (80 * WEI, 100 * WEI, 6 * 10**25),             # kink: base + slope1
+    (90 * WEI, 100 * WEI, 435 * 10**24),           # + half of slope2
+    (100 * WEI, 100 * WEI, 81 * 10**25),           # 100%: base + slope1 + slope2
+])
+def test_rate_curve(borrowed, liquidity, rate):
+    assert get_borrow_rate(borrowed, liquidity) == rate
+
+
+def test_accrual_matches_hand_computed_ray_values():
+    # 6% APR at the kink, hourly steps: 0.06 / 8760 per step
+    projection = InterestSimulator(80 * WEI, 100 * WEI).project(2)
+
+    assert projection["rate"] == [6 * 10**25] * 3
+    assert projection["index"] == [
+        RAY,
+        1_000_006_849_315_068_493_150_684_931,
+        1_000_013_698_677_050_103_208_857_195,
+    ]
+    assert projection["total_borrowed"][1] == 80 * WEI + 547_945_205_479_452
+    assert list(projection["utilization_bps"]) == [8000, 8000, 8000]
+    assert list(projection["time"]) == [0, 3600, 7200]
+
+
+def test_interest_accrues_to_liquidity_too():
+    # interest is owed to lenders: utilization creeps up, never jumps
+    projection = InterestSimulator(99 * WEI, 100 * WEI).project(24 * 365)
+
+    borrowed = projection["total_borrowed"]
+    assert borrowed[-1] > borrowed[0]
+    assert projection["utilization_bps"][-1] < 10_000
+
+
+def test_time_to_liquidation_from_interest_alone():
+    projection = InterestSimulator(80 * WEI, 100 * WEI).project(24 * 365)
+    one_step = projection["index_ratio"][1]
+
+    eta = InterestSimulator.time_to_liquidation(
+        [90.0, 100.0, 100.0 * (1 + one_step) / 2, 1.0],
+        [100.0, 0.0, 100.0, 0.5],
+        projection
+    )
+
+    # under water now, no debt, crosses after one accrual, never
+    assert eta[0] == 0
+    assert eta[1] == np.inf
+    assert eta[2] == 3600
+    assert eta[3] == np.inf
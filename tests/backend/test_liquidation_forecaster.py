@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pytest
+
+from liquidation_forecaster import (
+    BLOCK_TIME,
+    SECONDS_PER_YEAR,
+    LiquidationForecaster,
+    ScanScheduler,
+    crossing_probability,
+    group_volatility,
+)
+from position_book import PositionBook
+
+
+def record_path(book, token_id, returns, zone=None, rarity=None):
+    book.upsert(token_id, owner="0xa", debt=100, zone=zone, rarity=rarity, block_number=0)
+    price = 1_000.0
+    book.record_price(token_id, int(price), 0)
+    for block, r in enumerate(returns, start=1):
+        price *= math.exp(r)
+        book.record_price(token_id, int(price), block)
+
+
+def log_returns(book, token_id):
+    return np.diff(np.log([p for _, p in book.history(token_id)]))
+
+
+def test_group_volatility_counts_each_position_once():
+    rng = np.random.default_rng(1)
+    book = PositionBook()
+    record_path(book, 1, rng.normal(0.0, 0.01, size=200))
+    record_path(book, 2, rng.normal(0.0, 0.04, size=200), zone="PARIS", rarity=3)
+
+    volatility = group_volatility(book, min_returns=10)
+
+    # without a zone, (zone, None) and (None, None) are the same group:
+    # position 1 must weigh as much as position 2 in the pooled estimate
+    dt = BLOCK_TIME / SECONDS_PER_YEAR
+    sq = [np.sum(log_returns(book, t) ** 2) for t in (1, 2)]
+    assert volatility[(None, None)] == pytest.approx(math.sqrt(sum(sq) / (400 * dt)))
+    assert volatility[(None, "COMMON")] == pytest.approx(math.sqrt(sq[0] / (200 * dt)))
+
+
+def test_group_volatility_uses_zone_and_rarity():
+    rng = np.random.default_rng(2)
+    book = PositionBook()
+    record_path(book, 1, rng.normal(0.0, 0.01, size=100), zone="PARIS", rarity=3)
+    record_path(book, 2, rng.normal(0.0, 0.03, size=100), zone="LYON", rarity=1)
+
+    volatility = group_volatility(book, min_returns=10)
+
+    assert volatility[("LYON", 1)] > volatility[("PARIS", 3)]
+    assert ("PARIS", None) in volatility and (None, None) in volatility
+
+    forecaster = LiquidationForecaster()
+    forecaster.volatility = volatility
+    assert forecaster.sigma_for("LYON", 1) == volatility[("LYON", 1)]
+    assert forecaster.sigma_for("NICE", 1) == volatility[(None, None)]
+
+
+def test_crossing_probability_bounds():
+    hf = np.array([0.9, 1.01, 1.5, 5.0])
+    p = crossing_probability(hf, 0.8, -0.32, 100 * BLOCK_TIME / SECONDS_PER_YEAR)
+
+    assert p[0] == 1.0
+    assert np.all(np.diff(p) <= 0)
+    assert p[-1] < 1e-6
+
+
+def test_scan_scheduler_supersedes_entries():
+    scheduler = ScanScheduler()
+    scheduler.schedule(7, 0, "cold")
+    scheduler.schedule(7, 0, "hot")
+
+    assert scheduler.due(1) == [7]
+    assert scheduler.due(100) == []
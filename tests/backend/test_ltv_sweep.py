@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from ltv_sweep import CURRENT_PARAMS, LtvSweep, scenario_moves
+from price_paths import PricePathEngine
+from stress_engine import Portfolio, StressEngine
+
+
+def test_liquidation_sold_at_the_crossing():
+    # breaking factor 0.8: the path crosses it at 0.79, then bottoms at 0.3
+    engine = StressEngine(Portfolio([100.0], [80.0]), sale_haircut=0.0, liquidation_hf=1.0)
+    path = np.array([[0.0, -0.1, -0.21, -0.7]])
+
+    result = engine.per_zone_paths({None: path})
+
+    assert result["liquidations"][0] == 1
+    assert result["collateral_sold"][0] == pytest.approx(79.0)
+    assert result["bad_debt"][0] == pytest.approx(1.0)
+
+
+def test_shortfall_is_per_position():
+    # threshold 0.5: the first is sold at the crossing with a surplus
+    # of 5, the second only after a gap, 5 short
+    engine = StressEngine(
+        Portfolio([100.0, 100.0], [45.0, 25.0]),
+        sale_haircut=0.0,
+        liquidation_hf=1.0 / 0.5
+    )
+
+    result = engine.per_zone_paths({None: np.array([[0.0, -0.5, -0.8]])})
+
+    assert result["liquidations"][0] == 2
+    # the surplus of the first position does not cover the second
+    assert result["bad_debt"][0] == pytest.approx(5.0)
+
+
+def test_per_zone_paths_matches_brute_force():
+    rng = np.random.default_rng(4)
+    prices = rng.uniform(50, 150, 300)
+    debts = prices * rng.uniform(0.2, 0.7, 300)
+    zones = rng.choice(["a", "b"], 300)
+    haircut, hf = 0.1, 1.0 / 0.8
+    engine = StressEngine(Portfolio(prices, debts, zones), sale_haircut=haircut, liquidation_hf=hf)
+
+    paths = {
+        zone: np.cumsum(np.column_stack((np.zeros(50), rng.normal(-0.02, 0.08, (50, 20)))), axis=1)
+        for zone in ("a", "b")
+    }
+    result = engine.per_zone_paths(paths)
+
+    expected = np.zeros(50)
+    for i in range(300):
+        factors = 1.0 + paths[zones[i]]
+        breaking = debts[i] * hf / prices[i]
+        for s in range(50):
+            below = np.flatnonzero(factors[s] < breaking)
+            if below.size:
+                sold = prices[i] * factors[s, below[0]] * (1 - haircut)
+                expected[s] += max(debts[i] - sold, 0.0)
+
+    np.testing.assert_allclose(result["bad_debt"], expected, atol=1e-9)
+
+
+def test_liquidation_threshold_changes_bad_debt():
+    paths = PricePathEngine({"zone": 1.0}, model="jump", sigma=1.2, seed=7)
+    shocks = scenario_moves(paths, 2_000, 30, mode="path")
+    sweep = LtvSweep(
+        np.full(200, 100.0),
+        ["COMMON"] * 200,
+        ["zone"] * 200,
+        shocks,
+        sale_haircut=0.2
+    )
+
+    low = sweep.evaluate({**CURRENT_PARAMS, "liquidation_threshold": 0.70})
+    high = sweep.evaluate({**CURRENT_PARAMS, "liquidation_threshold": 0.85})
+
+    # a later liquidation sells lower
+    assert high["summary"]["expected_bad_debt"] > low["summary"]["expected_bad_debt"]
+    assert high["bad_debt"] > low["bad_debt"]
+
+
+def test_single_moves_are_one_step_paths():
+    sweep = LtvSweep([100.0], ["COMMON"], ["zone"], {"zone": np.array([-0.9, 0.1])})
+
+    result = sweep.evaluate(dict(CURRENT_PARAMS))
+
+    assert result["summary"]["scenarios"] == 2
+    assert result["summary"]["max_bad_debt"] > 0
@@ -0,0 +1,22 @@
+from position_book import PositionBook
+
+
+def test_new_positions_are_unpriced_until_read():
+    book = PositionBook()
+    touched = book.apply_event("CollateralDeposited", {"tokenId": 1, "user": "0xa"}, 10)
+    touched |= book.apply_event("Borrowed", {"tokenId": 1, "user": "0xa", "amount": 100}, 10)
+
+    # price 0 reads as HF 0: the listener must price it before advance()
+    assert book.unpriced(touched) == [1]
+
+    book.record_price(1, 500, 10)
+    assert book.unpriced(touched) == []
+    assert book.liquidatable() == []
+
+
+def test_unpriced_ignores_removed_positions():
+    book = PositionBook()
+    touched = book.apply_event("CollateralDeposited", {"tokenId": 1, "user": "0xa"}, 10)
+    touched |= book.apply_event("CollateralWithdrawn", {"tokenId": 1, "user": "0xa"}, 11)
+
+    assert book.unpriced(touched) == []
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from price_paths import PricePathEngine
+
+
+@pytest.mark.parametrize("beta", [0.5, 1.0, 2.0])
+def test_jump_compensator_keeps_expected_price(beta):
+    engine = PricePathEngine(
+        {"zone": 100.0},
+        model="jump",
+        mu=0.0,
+        sigma=0.01,
+        dt=1.0,
+        seed=3,
+        jump_beta=beta,
+    )
+
+    paths = engine.generate(200_000, 1, chunk_paths=50_000)
+
+    assert paths[:, -1, 0].mean() == pytest.approx(100.0, rel=0.01)
+
+
+def test_jump_beta_per_asset():
+    engine = PricePathEngine(
+        {"zone": 100.0, "token": 1.0},
+        model="jump",
+        sigma=0.01,
+        dt=1.0,
+        seed=5,
+        jump_beta={"zone": 1.0, "token": 2.5},
+    )
+
+    means = engine.generate(200_000, 1, chunk_paths=50_000)[:, -1].mean(axis=0)
+
+    np.testing.assert_allclose(means, [100.0, 1.0], rtol=0.015)
@@ -0,0 +1,36 @@
+from position_book import PositionBook
+from stream import UpdateHub
+
+OWNER = "0x00000000000000000000000000000000000000a1"
+
+
+def make_hub():
+    book = PositionBook()
+    book.load(
+        [{"tokenId": 1, "owner": OWNER, "debt": 100, "price": 300}],
+        block_number=10,
+    )
+    hub = UpdateHub(book)
+    hub.prime()
+    return book, hub
+
+
+def test_closed_delta_keeps_owner():
+    book, hub = make_hub()
+
+    book.apply_event("CollateralSeized", {"tokenId": 1, "user": OWNER}, 11)
+    deltas = hub._position_deltas()
+
+    assert deltas == [{"tokenId": 1, "owner": OWNER, "from": "SAFE", "to": "CLOSED"}]
+
+
+def test_price_change_moves_bucket():
+    book, hub = make_hub()
+
+    book.record_price(1, 90, 11)
+    deltas = hub._position_deltas()
+
+    assert len(deltas) == 1
+    assert deltas[0]["owner"] == OWNER
+    assert deltas[0]["from"] == "SAFE"
+    assert deltas[0]["to"] != "SAFE"
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# offchain_security modules import each other flat (`from config import ...`)
+OFFCHAIN_SECURITY = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "offchain_security")
+)
+
+if OFFCHAIN_SECURITY not in sys.path:
+    sys.path.insert(0, OFFCHAIN_SECURITY)
+
+
+@pytest.fixture(autouse=True)
+def fresh_guards(monkeypatch):
+    """
+    Guard modules keep process-wide state: reset it per test
+    """
+    import circuit_breaker
+    import gouvernance_guard
+    import Keeper_guard
+    from config import MAX_MINT_PER_DAY, MAX_MINT_PER_HOUR
+    from rate_limiter import SlidingWindowLimiter
+
+    circuit_breaker.restore_state({})
+    monkeypatch.setattr(gouvernance_guard, "mint_limiter", SlidingWindowLimiter({
+        "hour": (3600, MAX_MINT_PER_HOUR),
+        "day": (86400, MAX_MINT_PER_DAY),
+    }))
+    monkeypatch.setattr(Keeper_guard, "liveness", Keeper_guard.KeeperLiveness())
+    yield
+    circuit_breaker.restore_state({})
@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from alerting import AlertDispatcher, webhook_transport
+
+
+class Webhook:
+    """
+    Local stand-in for the Discord webhook: records the JSON bodies,
+    answers `status` after `delay` seconds
+    """
+
+    def __init__(self):
+        self.received = []
+        self.status = 204
+        self.delay = 0.0
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                time.sleep(webhook.delay)
+                if webhook.status < 300:
+                    webhook.received.append(body)
+                try:
+                    self.send_response(webhook.status)
+                    self.end_headers()
+                except OSError:
+                    pass        # client gave up (timeout)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def lines(self):
+        return [line for body in self.received for line in body["content"].split("\n")]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def webhook():
+    server = Webhook()
+    yield server
+    server.close()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def dispatcher(transport, tmp_path, **kwargs):
+    options = dict(batch_interval=0.05, max_retries=1, backoff=0.01, dedup_window=60)
+    options.update(kwargs)
+    return AlertDispatcher(transport, spill_path=str(tmp_path / "spill.jsonl"), **options)
+
+
+def test_webhook_transport_posts_json(webhook):
+    post = webhook_transport(webhook.url, timeout=1)
+
+    post({"content": "hello"})
+
+    assert webhook.received == [{"content": "hello"}]
+
+
+def test_webhook_transport_raises_on_outage(webhook):
+    webhook.status = 503
+
+    with pytest.raises(requests.HTTPError):
+        webhook_transport(webhook.url, timeout=1)({"content": "hello"})
+
+
+def test_slow_webhook_does_not_block_submit(webhook, tmp_path):
+    webhook.delay = 0.5
+    alerts = dispatcher(webhook_transport(webhook.url, timeout=0.1), tmp_path, max_retries=0).start()
+
+    started = time.time()
+    for i in range(50):
+        alerts.submit(f"alert {i}")
+    assert time.time() - started < 0.1
+
+    # the post times out: the batch is spilled, not lost
+    assert wait_for(lambda: alerts.spilled == 50)
+    alerts.stop()
+    assert (tmp_path / "spill.jsonl").exists()
+
+
+def test_outage_spills_then_replays(webhook, tmp_path):
+    webhook.status = 503
+    alerts = dispatcher(webhook_transport(webhook.url, timeout=1), tmp_path).start()
+
+    alerts.submit("pool paused", key="a")
+    alerts.submit("keeper failure", key="b")
+    assert wait_for(lambda: alerts.spilled == 2)
+    assert webhook.received == []
+
+    # recovery: the next delivery replays the spill
+    webhook.status = 204
+    alerts.submit("oracle deviation", key="c")
+    assert wait_for(lambda: alerts.sent == 3)
+    alerts.stop()
+
+    assert sorted(webhook.lines()) == ["keeper failure", "oracle deviation", "pool paused"]
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+def test_suppressed_count_flushed_after_window(tmp_path):
+    sent = []
+    alerts = dispatcher(sent.append, tmp_path, dedup_window=0.2).start()
+
+    assert alerts.submit("Mint cap exceeded (1)", key="mint")
+    assert not alerts.submit("Mint cap exceeded (2)", key="mint")
+    assert not alerts.submit("Mint cap exceeded (3)", key="mint")
+
+    # no further alert for the key: the count must still be reported
+    assert wait_for(lambda: any("suppressed" in p["content"] for p in sent))
+    alerts.stop()
+
+    lines = [line for p in sent for line in p["content"].split("\n")]
+    assert lines == ["Mint cap exceeded (1)", "Mint cap exceeded (3) (+2 suppressed)"]
+
+
+def test_pending_counts_flushed_on_stop(tmp_path):
+    sent = []
+    alerts = dispatcher(sent.append, tmp_path).start()
+
+    alerts.submit("Keeper failure", key="keeper")
+    alerts.submit("Keeper failure", key="keeper")
+    assert wait_for(lambda: alerts.sent == 1)
+    alerts.stop()
+
+    assert sent[-1] == {"content": "Keeper failure (+1 suppressed)"}
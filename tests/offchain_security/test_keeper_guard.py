@@ -0,0 +1,62 @@
+import time
+
+import Keeper_guard
+from config import MIN_ACTIVE_KEEPERS
+from Keeper_guard import KeeperLiveness
+from state_store import SecurityStateStore
+from supervisor import Supervisor
+
+
+def seized(liquidator, block, timestamp):
+    return {
+        "event": "CollateralSeized",
+        "args": {"liquidator": liquidator, "tokenId": 1},
+        "blockNumber": block,
+        "timestamp": timestamp,
+    }
+
+
+def test_expiry_follows_heartbeat_timestamps():
+    liveness = KeeperLiveness(interval=10, max_missed=3)
+
+    liveness.heartbeat("a", 1_000, now=1_000)
+    liveness.heartbeat("b", 1_020, now=1_020)
+
+    assert liveness.live(now=1_025) == ["a", "b"]
+    assert liveness.live(now=1_040) == ["b"]
+    assert liveness.missed_intervals("a", now=1_040) == 4
+
+
+def test_replayed_block_does_not_revive_a_keeper():
+    liveness = KeeperLiveness(interval=10, max_missed=3)
+
+    # liquidation replayed from an old block: timestamp of the block
+    liveness.heartbeat("a", 1_000, now=5_000)
+
+    assert liveness.live_count(now=5_000) == 0
+    assert liveness.lag("a", now=5_000) == 4_000
+
+
+def test_supervisor_uses_event_timestamps():
+    supervisor = Supervisor(alert=lambda msg, key=None: None)
+    now = time.time()
+
+    supervisor.handle(seized("0xold", 10, now - 86_400))
+    supervisor.handle(seized("0xnew", 11, now - 5))
+
+    assert Keeper_guard.liveness.live() == ["0xnew"]
+
+
+def test_store_heartbeats_reach_the_supervisor(tmp_path):
+    store = SecurityStateStore(str(tmp_path / "security.db"))
+    supervisor = Supervisor(store=store, alert=lambda msg, key=None: None, keeper_grace=0)
+
+    # bots in other processes
+    for i in range(MIN_ACTIVE_KEEPERS):
+        SecurityStateStore(str(tmp_path / "security.db")).heartbeat(f"0xbot{i}")
+
+    assert supervisor.poll_heartbeats() == MIN_ACTIVE_KEEPERS
+    assert supervisor.poll_heartbeats() == 0
+    assert Keeper_guard.has_active_keepers()
+    assert supervisor.tick() == []
+    store.close()
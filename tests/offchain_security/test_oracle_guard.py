@@ -0,0 +1,85 @@
+import random
+from statistics import median
+
+import pytest
+
+from oracle_guard import OracleGuard, PriceWindow
+
+
+def mad(values):
+    m = median(values)
+    return median(abs(v - m) for v in values)
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 8, 31])
+def test_rolling_median_and_mad_match_statistics(size):
+    rng = random.Random(size)
+    window = PriceWindow(size)
+    prices = []
+
+    # enough pushes to evict the window several times, with ties
+    for _ in range(size * 5 + 3):
+        price = rng.choice([rng.uniform(90, 110), 100.0, rng.randint(95, 105)])
+        window.push(price)
+        prices = (prices + [price])[-size:]
+
+        assert window.values() == prices
+        assert window.median() == pytest.approx(median(prices))
+        assert window.mad() == pytest.approx(mad(prices))
+
+
+def test_outlier_against_the_source_window():
+    guard = OracleGuard(min_samples=10, mad_threshold=6.0, max_velocity=10.0)
+
+    for i in range(20):
+        assert guard.update("chainlink", 100.0 + (i % 5), timestamp=i * 60) == []
+
+    anomalies = guard.update("chainlink", 180.0, timestamp=20 * 60)
+    assert [a["kind"] for a in anomalies] == ["outlier"]
+    assert anomalies[0]["score"] > 6.0
+
+    # within the window's spread: clean
+    assert guard.update("chainlink", 103.0, timestamp=21 * 60) == []
+
+
+def test_no_outlier_check_before_min_samples():
+    guard = OracleGuard(min_samples=10, max_velocity=10.0)
+
+    for i in range(9):
+        guard.update("chainlink", 100.0, timestamp=i * 60)
+    assert guard.update("chainlink", 500.0, timestamp=9 * 60) == []
+
+
+def test_divergence_across_sources():
+    guard = OracleGuard(max_deviation=0.25)
+
+    assert guard.update("chainlink", 100.0, timestamp=0) == []
+    assert guard.update("uniswap", 110.0, timestamp=0) == []
+    assert guard.is_healthy()
+
+    anomalies = guard.update("dao", 200.0, timestamp=0)
+    assert [a["kind"] for a in anomalies] == ["divergence"]
+    assert not guard.is_healthy()
+
+    # prices are tracked per asset
+    assert guard.update("dao", 200.0, timestamp=0, asset="eth") == []
+
+
+def test_export_restore_round_trip():
+    guard = OracleGuard(window=8, min_samples=5, max_velocity=10.0)
+    for i in range(12):
+        guard.update("chainlink", 100.0 + i, timestamp=i * 60)
+        guard.update("uniswap", 101.0 + i, timestamp=i * 60)
+
+    restored = OracleGuard(window=8, min_samples=5, max_velocity=10.0)
+    restored.restore_state(guard.export_state())
+
+    assert restored.export_state() == guard.export_state()
+    window = restored.windows[("nft", "chainlink")]
+    assert window.values() == [104.0 + i for i in range(8)]
+    assert window.median() == guard.windows[("nft", "chainlink")].median()
+
+    # same verdicts after a restart
+    for price in (112.0, 160.0):
+        assert restored.update("chainlink", price, timestamp=720) == \
+            guard.update("chainlink", price, timestamp=720)
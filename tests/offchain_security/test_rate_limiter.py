@@ -0,0 +1,78 @@
+from rate_limiter import SlidingWindowLimiter
+
+HOUR = 3600
+
+
+def test_window_boundary_cannot_be_doubled():
+    limiter = SlidingWindowLimiter({"hour": (HOUR, 100)}, bucket_seconds=60)
+    t = 10 * HOUR + 59
+
+    assert limiter.try_acquire(100, now=t)
+    # next bucket, a fixed window would have reset here
+    assert not limiter.check(1, now=t + 1)
+    assert not limiter.check(1, now=t + HOUR - 60)
+    # the capped bucket has left the window
+    assert limiter.check(100, now=t + HOUR)
+
+
+def test_every_window_must_fit():
+    limiter = SlidingWindowLimiter(
+        {"hour": (HOUR, 100), "day": (24 * HOUR, 250)}, bucket_seconds=60
+    )
+
+    assert limiter.try_acquire(100, now=0)
+    assert not limiter.try_acquire(1, now=60)            # hour full
+    assert limiter.try_acquire(100, now=HOUR)
+    assert limiter.try_acquire(50, now=2 * HOUR)
+    assert limiter.remaining(now=2 * HOUR) == {"hour": 50, "day": 0}
+    assert not limiter.try_acquire(1, now=3 * HOUR)      # day full, hour empty
+
+    # the first mint leaves the day window
+    assert limiter.used(now=24 * HOUR) == {"hour": 0, "day": 150}
+    assert limiter.try_acquire(100, now=24 * HOUR)
+
+
+def test_try_acquire_records_only_what_fits():
+    limiter = SlidingWindowLimiter({"hour": (HOUR, 100)}, bucket_seconds=60)
+
+    assert limiter.try_acquire(60, now=0)
+    assert not limiter.try_acquire(50, now=0)
+    assert limiter.used(now=0) == {"hour": 60}
+    assert limiter.try_acquire(40, now=0)
+    assert limiter.remaining(now=0) == {"hour": 0}
+
+
+def test_clock_going_backwards_stays_in_the_current_bucket():
+    limiter = SlidingWindowLimiter({"hour": (HOUR, 100)}, bucket_seconds=60)
+
+    limiter.record(100, now=2 * HOUR)
+    assert not limiter.check(1, now=0)
+    assert limiter.check(1, now=3 * HOUR)
+
+
+def test_restore_across_a_bucket_size_change():
+    windows = {"hour": (HOUR, 100), "day": (24 * HOUR, 1_000)}
+    mints = [(30, HOUR), (40, HOUR + 250), (50, 2 * HOUR)]
+
+    limiter = SlidingWindowLimiter(windows, bucket_seconds=60)
+    native = SlidingWindowLimiter(windows, bucket_seconds=300)
+    for amount, t in mints:
+        limiter.record(amount, now=t)
+        native.record(amount, now=t)
+
+    restored = SlidingWindowLimiter(windows, bucket_seconds=300)
+    restored.restore_state(limiter.export_state())
+
+    # as if the mints had been recorded at the new resolution
+    assert restored.export_state() == native.export_state()
+    for now in (2 * HOUR, 2 * HOUR + 300, 25 * HOUR):
+        assert restored.used(now=now) == native.used(now=now)
+    assert restored.used(now=25 * HOUR) == {"hour": 0, "day": 50}
+    assert restored.used(now=26 * HOUR) == {"hour": 0, "day": 0}
+
+
+def test_restore_empty_state():
+    limiter = SlidingWindowLimiter({"hour": (HOUR, 100)})
+    limiter.restore_state(SlidingWindowLimiter({"hour": (HOUR, 100)}).export_state())
+
+    assert limiter.used(now=0) == {"hour": 0}
@@ -0,0 +1,115 @@
+import circuit_breaker
+from config import MAX_MINT_PER_HOUR
+from supervisor import ZERO_ADDRESS, Supervisor
+
+
+class Alerts:
+    def __init__(self):
+        self.sent = []
+
+    def __call__(self, msg, key=None):
+        self.sent.append((key, msg))
+
+
+def transfer(sender, value, block=1, timestamp=None):
+    # NativeToken.vy: Transfer(sender indexed, receiver indexed, value)
+    event = {
+        "event": "Transfer",
+        "args": {"sender": sender, "receiver": "0xb0b", "value": value},
+        "blockNumber": block,
+    }
+    if timestamp is not None:
+        event["timestamp"] = timestamp
+    return event
+
+
+def test_token_mint_counts_against_the_cap():
+    alerts = Alerts()
+    supervisor = Supervisor(alert=alerts)
+
+    assert supervisor.handle(transfer(ZERO_ADDRESS, MAX_MINT_PER_HOUR)) == []
+    assert supervisor.handle(transfer(ZERO_ADDRESS, 1)) == ["Excessive mint"]
+
+    assert circuit_breaker.is_paused()
+    assert alerts.sent[0][0] == "Excessive mint"
+
+
+def test_mints_are_bucketed_at_their_block_time():
+    supervisor = Supervisor(alert=Alerts())
+    amount = MAX_MINT_PER_HOUR * 2 // 3
+
+    # listener catch-up: mints 5 hours apart, delivered back to back
+    for i in range(3):
+        event = transfer(ZERO_ADDRESS, amount, block=100 + i, timestamp=1_700_000_000 + i * 5 * 3600)
+        assert supervisor.handle(event) == []
+
+    assert not circuit_breaker.is_paused()
+
+
+def test_plain_transfers_are_not_mints():
+    supervisor = Supervisor(alert=Alerts())
+
+    assert supervisor.handle(transfer("0xa11ce", MAX_MINT_PER_HOUR * 2)) == []
+    assert not circuit_breaker.is_paused()
+
+
+def test_on_events_feeds_the_worker():
+    supervisor = Supervisor(alert=Alerts(), flush_seconds=0.05).start()
+
+    supervisor.on_events([transfer(ZERO_ADDRESS, MAX_MINT_PER_HOUR + 1, 7)], 9)
+    supervisor.stop()
+
+    assert supervisor.processed == 1
+    assert supervisor.cursor == 9
+    assert circuit_breaker.export_state()["reason"] == "Excessive mint"
+
+
+def price(value, timestamp, **args):
+    return {
+        "event": "PriceUpdated",
+        "args": {**args, "value": value},
+        "blockNumber": 1,
+        "address": "0x0rac1e",
+        "timestamp": timestamp,
+    }
+
+
+def test_dao_parameter_updates_do_not_trip_the_oracle_guard():
+    supervisor = Supervisor(alert=Alerts())
+
+    # TerrainPriceOracle.setZonePrice twice in a row
+    assert supervisor.handle(price(100 * 10**18, 1_000, param="ZONE")) == []
+    assert supervisor.handle(price(300 * 10**18, 1_012, param="ZONE")) == []
+
+    assert not circuit_breaker.is_paused()
+    assert not supervisor.oracle.windows
+
+
+def test_price_feed_jump_trips_the_oracle_guard():
+    supervisor = Supervisor(alert=Alerts())
+
+    assert supervisor.handle(price(100.0, 1_000, source="feed", asset="42")) == []
+    assert supervisor.handle(price(300.0, 1_012, source="feed", asset="42")) == ["NFT oracle deviation"]
+    assert circuit_breaker.is_paused()
+
+
+def test_events_before_the_restored_cursor_are_skipped():
+    supervisor = Supervisor(alert=Alerts())
+    supervisor.restore({"cursor": 100})
+
+    # replayed after a restart: already counted before it
+    assert supervisor.handle(transfer(ZERO_ADDRESS, MAX_MINT_PER_HOUR, block=100)) == []
+    assert supervisor.handle(transfer(ZERO_ADDRESS, MAX_MINT_PER_HOUR, block=101)) == []
+    assert supervisor.handle(transfer(ZERO_ADDRESS, 1, block=102)) == ["Excessive mint"]
+    assert supervisor.processed == 2
+
+
+def test_cursor_never_moves_back():
+    supervisor = Supervisor(alert=Alerts(), flush_seconds=0.05)
+    supervisor.restore({"cursor": 100})
+    supervisor.start()
+
+    supervisor.on_events([], 90)
+    supervisor.stop()
+
+    assert supervisor.cursor == 100
@@ -1,11 +1,9 @@
 # tests/e2e_and_test_runner.py
 
-import math
-from concurrent.futures import ThreadPoolExecutor
-
 from tests.simulations.engine.simulation_engine import SimulationEngine
 from tests.simulations.engine.event_scheduler import EventScheduler
 from tests.simulations.engine.time_machine import TimeMachine
+from tests.simulations.engine.population import PopulationEngine, default_workers
 from tests.simulations.metrics import MetricsCollector
 from tests.supervisor import Supervisor
 
@@ -26,8 +24,13 @@ CI_MODE = os.getenv("CI", "false") == "true"
 
 TOTAL_USERS = 10_000_000 if CI_MODE else 1_000_000_000
 
-BATCH_SIZE = 10_000
-MAX_WORKERS = 16
+# Users per vectorized chunk (bounds memory, ~50 MB per chunk)
+CHUNK_SIZE = 1_000_000
+MASS_SIMULATION_TICKS = 1
+SIMULATION_SEED = int(os.getenv("SIMULATION_SEED", 42))
+
+# CPU-bound: one process per core (threads would serialize on the GIL)
+MAX_WORKERS = int(os.getenv("SIMULATION_WORKERS", default_workers()))
 
 
 def main():
@@ -56,26 +59,17 @@ def main():
     # -----------------------------
     # MASS USER SIMULATION
     # -----------------------------
-
-    def simulate_batch(batch_id):
-        for i in range(BATCH_SIZE):
-            engine.simulate_user_action(
-                user_id=f"user_{batch_id}_{i}",
-                actions=[
-                    "deposit_nft",
-                    "borrow",
-                    "repay",
-                    "health_check",
-                    "liquidation_check"
-                ],
-                bounded=True
-            )
-
-    total_batches = math.ceil(TOTAL_USERS / BATCH_SIZE)
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        for batch_id in range(total_batches):
-            executor.submit(simulate_batch, batch_id)
+    # Vectorized population: one batched draw per tick for
+    # a whole chunk instead of one simulate_user_action per user,
+    # chunks spread over a process pool
+
+    population = PopulationEngine(
+        total_users=TOTAL_USERS,
+        ticks=MASS_SIMULATION_TICKS,
+        chunk_size=CHUNK_SIZE,
+        seed=SIMULATION_SEED
+    )
+    population.run(metrics=metrics, workers=MAX_WORKERS)
 
     metrics.snapshot("mass_user_simulation_done")
 
@@ -0,0 +1,219 @@
+"""
+Branch Runner
+-------------
+
+Exécution parallèle de scénarios alternatifs
+à partir d'un même snapshot TimeMachine.
+
+Exemple : snapshot juste avant un crash de marché,
+puis N variantes (profondeur du crash, capacité des
+liquidateurs, délai oracle) exécutées dans un pool
+de processus, et une table de comparaison des rapports.
+
+La fonction de branche reçoit une TimeMachine forkée
+et les paramètres de la variante, et retourne un rapport
+(dict, ex : SimulationReportGenerator.generate()).
+Avec workers > 1, la machine, ses callbacks planifiés
+et la fonction de branche doivent être picklables
+(fonctions de module, méthodes d'agents ; pas de lambdas).
+"""
+
+import itertools
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from tests.simulations.engine.time_machine import TimeMachine, TimeSnapshot
+
+
+BranchFn = Callable[[TimeMachine, Dict[str, Any]], Dict[str, Any]]
+
+SCALAR_TYPES = (int, float, str, bool, type(None))
+
+
+# ============================================================
+# Variants
+# ============================================================
+
+def variant_grid(**axes: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Produit cartésien des axes de paramètres.
+
+    variant_grid(crash_depth=[0.3, 0.5], liquidator_capacity=[5, 10])
+    -> 4 variantes
+    """
+    names = list(axes)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(axes[name] for name in names))
+    ]
+
+
+# ============================================================
+# Branch runner
+# ============================================================
+
+class BranchRunner:
+    """
+    Exécute une fonction de branche sur des forks
+    d'un snapshot, une variante par fork.
+    """
+
+    def __init__(
+        self,
+        machine: TimeMachine,
+        snapshot: TimeSnapshot,
+        branch: BranchFn,
+        seed: Optional[int] = None
+    ):
+        self.machine = machine
+        self.snapshot = snapshot
+        self.branch = branch
+        self.seed = seed
+
+    def run_branch(self, index: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Une branche : fork du snapshot, application de la variante.
+
+        Chaque fork a son propre contexte (protocole, agents) copié
+        en profondeur : les branches exécutées dans un même processus
+        ne se voient pas, en série comme dans un worker du pool.
+        """
+        # RNG propre à la branche : même résultat en série ou en parallèle
+        if self.seed is not None:
+            random.seed(f"{self.seed}-{index}")
+
+        started = time.time()
+        fork = self.machine.fork_from_snapshot(self.snapshot, share_objects=False)
+        report = self.branch(fork, dict(params))
+
+        return {
+            "branch": index,
+            "params": dict(params),
+            "report": report,
+            "end_time": fork.now(),
+            "runtime": time.time() - started,
+        }
+
+    def run(
+        self,
+        variants: Sequence[Dict[str, Any]],
+        workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Exécute toutes les variantes ; résultats dans l'ordre des variantes.
+        """
+        if workers <= 1:
+            return [
+                self.run_branch(index, params)
+                for index, params in enumerate(variants)
+            ]
+        return self._run_parallel(variants, workers)
+
+    def _run_parallel(self, variants, workers: int) -> List[Dict[str, Any]]:
+        results = [None] * len(variants)
+        max_in_flight = workers * 2
+
+        # Le snapshot de base est envoyé une fois par processus
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as executor:
+            in_flight = set()
+
+            for index, params in enumerate(variants):
+                in_flight.add(executor.submit(_worker_run_branch, index, params))
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        results[result["branch"]] = result
+
+            for future in in_flight:
+                result = future.result()
+                results[result["branch"]] = result
+
+        return results
+
+
+# ============================================================
+# Comparison table
+# ============================================================
+
+def _flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, SCALAR_TYPES):
+            flat[name] = value
+    return flat
+
+
+def comparison_table(
+    results: List[Dict[str, Any]],
+    columns: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Une ligne par branche : paramètres + métriques scalaires
+    du rapport (clés pointées, ex : "risk_metrics.price_drawdown").
+    """
+    rows = []
+    for result in results:
+        row = {"branch": result["branch"], **result["params"]}
+        metrics = _flatten(result["report"] or {})
+        if columns is not None:
+            metrics = {name: metrics.get(name) for name in columns}
+        row.update(metrics)
+        rows.append(row)
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """
+    Rendu texte aligné de la table de comparaison.
+    """
+    if not rows:
+        return ""
+
+    headers = list(dict.fromkeys(key for row in rows for key in row))
+    cells = [
+        [_format_cell(row.get(header)) for header in headers]
+        for row in rows
+    ]
+    widths = [
+        max(len(header), *(len(line[i]) for line in cells))
+        for i, header in enumerate(headers)
+    ]
+
+    lines = [headers, ["-" * width for width in widths], *cells]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+        for line in lines
+    )
+
+
+def _format_cell(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return "" if value is None else str(value)
+
+
+# ============================================================
+# Process workers
+# ============================================================
+
+_WORKER_RUNNER = None
+
+
+def _init_worker(runner: BranchRunner):
+    global _WORKER_RUNNER
+    _WORKER_RUNNER = runner
+
+
+def _worker_run_branch(index: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _WORKER_RUNNER.run_branch(index, params)
@@ -0,0 +1,189 @@
+"""
+Copy-on-Write State
+-------------------
+
+État de simulation en couches, à partage structurel.
+
+Chaque snapshot gèle la couche courante (O(1)) et
+l'état vivant continue dans une nouvelle couche vide
+au-dessus. Restaurer ou forker un snapshot revient à
+repartir d'une couche vide posée sur lui : coût
+proportionnel aux modifications abandonnées, et des
+milliers de forks partagent les couches inchangées.
+
+Les valeurs sont traitées comme immuables : pour modifier
+une valeur en place (dict, liste...), passer par `mutable(key)`
+qui la copie (en profondeur) dans la couche courante.
+"""
+
+import copy
+from collections.abc import MutableMapping
+from typing import Any, Dict, Optional
+
+
+# Au-delà, la chaîne de couches est aplatie (lookups bornés)
+MAX_LAYER_DEPTH = 32
+
+_MISSING = object()
+
+
+class CowState(MutableMapping):
+    """
+    Dictionnaire copy-on-write.
+
+    Une couche gelée (snapshot) est immuable ; seule la
+    couche vivante accepte les écritures.
+    """
+
+    __slots__ = ("_parent", "_values", "_deleted", "_depth", "_frozen")
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None):
+        self._parent: Optional["CowState"] = None
+        self._values: Dict[str, Any] = dict(initial or {})
+        self._deleted = set()
+        self._depth = 0
+        self._frozen = False
+
+    @classmethod
+    def _layer(cls, parent: Optional["CowState"], values, deleted, frozen):
+        layer = cls.__new__(cls)
+        layer._parent = parent
+        layer._values = values
+        layer._deleted = deleted
+        layer._depth = parent._depth + 1 if parent is not None else 0
+        layer._frozen = frozen
+        return layer
+
+    # ------------------
+    # Mapping
+    # ------------------
+
+    def _lookup(self, key):
+        layer = self
+        while layer is not None:
+            values = layer._values
+            if key in values:
+                return values[key]
+            if key in layer._deleted:
+                return _MISSING
+            layer = layer._parent
+        return _MISSING
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._lookup(key) is not _MISSING
+
+    def __setitem__(self, key, value):
+        self._check_writable()
+        self._values[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        self._check_writable()
+        if key not in self:
+            raise KeyError(key)
+
+        self._values.pop(key, None)
+        if self._parent is not None and key in self._parent:
+            self._deleted.add(key)
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"CowState({self.to_dict()!r})"
+
+    def _check_writable(self):
+        if self._frozen:
+            raise TypeError("Snapshot layers are read-only")
+
+    def mutable(self, key):
+        """
+        Valeur modifiable en place, copiée dans la couche
+        courante au premier accès (copy-on-write).
+
+        Copie profonde : les objets imbriqués sont partagés
+        avec les snapshots, une copie superficielle les laisserait
+        modifiables à travers la valeur retournée.
+        """
+        self._check_writable()
+        if key in self._values:
+            return self._values[key]
+
+        value = copy.deepcopy(self[key])
+        self._values[key] = value
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Vue aplatie de l'état (O(taille totale)).
+        """
+        chain = []
+        layer = self
+        while layer is not None:
+            chain.append(layer)
+            layer = layer._parent
+
+        flat = {}
+        for layer in reversed(chain):
+            for key in layer._deleted:
+                flat.pop(key, None)
+            flat.update(layer._values)
+        return flat
+
+    # ------------------
+    # Snapshots
+    # ------------------
+
+    @property
+    def dirty_keys(self) -> int:
+        """
+        Nombre de clés modifiées depuis le dernier snapshot.
+        """
+        return len(self._values) + len(self._deleted)
+
+    def snapshot(self) -> "CowState":
+        """
+        Gèle l'état courant et le retourne (O(1)).
+        """
+        if self._frozen:
+            return self
+
+        if not self.dirty_keys and self._parent is not None:
+            return self._parent
+
+        frozen = self._layer(self._parent, self._values, self._deleted, True)
+        if frozen._depth >= MAX_LAYER_DEPTH:
+            frozen = self._layer(None, frozen.to_dict(), set(), True)
+
+        self._attach(frozen)
+        return frozen
+
+    def restore(self, snapshot: "CowState"):
+        """
+        Revient à un snapshot : seules les écritures
+        depuis ce snapshot sont abandonnées.
+        """
+        self._check_writable()
+        self._attach(snapshot.snapshot())
+
+    def fork(self) -> "CowState":
+        """
+        Nouvel état vivant partageant cet état (gelé).
+        """
+        base = self.snapshot()
+        return self._layer(base, {}, set(), False)
+
+    def _attach(self, parent: "CowState"):
+        self._parent = parent
+        self._values = {}
+        self._deleted = set()
+        self._depth = parent._depth + 1
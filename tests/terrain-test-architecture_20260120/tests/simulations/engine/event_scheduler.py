@@ -16,8 +16,13 @@ Seulement du temps + des événements.
 """
 
 import heapq
+import itertools
 import time
-from typing import Callable, Any
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
+
+
+SCHEDULER_MODES = ("heap", "calendar")
 
 
 # ============================================================
@@ -27,22 +32,160 @@ from typing import Callable, Any
 class ScheduledEvent:
     """
     Représente un événement planifié dans le temps.
+
+    `seq` départage les événements de même timestamp :
+    ordre d'exécution = ordre de planification (FIFO).
     """
 
+    __slots__ = ("timestamp", "seq", "callback", "description", "payload")
+
     def __init__(
         self,
         timestamp: int,
         callback: Callable,
         description: str = "",
-        payload: Any = None
+        payload: Any = None,
+        seq: int = 0
     ):
         self.timestamp = timestamp
+        self.seq = seq
         self.callback = callback
         self.description = description
         self.payload = payload
 
     def __lt__(self, other):
-        return self.timestamp < other.timestamp
+        return (self.timestamp, self.seq) < (other.timestamp, other.seq)
+
+
+# ============================================================
+# Queues
+# ============================================================
+
+class HeapQueue:
+    """
+    File de priorité binaire (timestamps quelconques).
+    """
+
+    def __init__(self):
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, event: ScheduledEvent):
+        heapq.heappush(self._heap, (event.timestamp, event.seq, event))
+
+    def clone(self) -> "HeapQueue":
+        queue = HeapQueue()
+        queue._heap = list(self._heap)
+        return queue
+
+    def push_many(self, events: Iterable[ScheduledEvent]):
+        entries = [(e.timestamp, e.seq, e) for e in events]
+        if len(entries) > len(self._heap):
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+
+    def peek_time(self) -> Optional[int]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self) -> ScheduledEvent:
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self, until: int):
+        """
+        Dépile les événements dus jusqu'à `until` inclus,
+        y compris ceux planifiés pendant l'itération.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= until:
+            yield heapq.heappop(heap)[2]
+
+
+class CalendarQueue:
+    """
+    Calendar queue : un bucket FIFO par tick entier,
+    plus un tas des ticks non vides.
+
+    Push et pop en O(1) pour un tick déjà présent ;
+    seul le premier événement d'un tick touche le tas.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._ticks = []
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _bucket(self, tick: int) -> deque:
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = deque()
+            heapq.heappush(self._ticks, tick)
+        return bucket
+
+    def push(self, event: ScheduledEvent):
+        self._bucket(event.timestamp).append(event)
+        self._size += 1
+
+    def clone(self) -> "CalendarQueue":
+        queue = CalendarQueue()
+        queue._buckets = {tick: deque(bucket) for tick, bucket in self._buckets.items()}
+        queue._ticks = list(self._ticks)
+        queue._size = self._size
+        return queue
+
+    def push_many(self, events: Iterable[ScheduledEvent]):
+        bucket = None
+        tick = None
+        for event in events:
+            if event.timestamp != tick:
+                tick = event.timestamp
+                bucket = self._bucket(tick)
+            bucket.append(event)
+            self._size += 1
+
+    def peek_time(self) -> Optional[int]:
+        return self._ticks[0] if self._ticks else None
+
+    def pop(self) -> ScheduledEvent:
+        tick = self._ticks[0]
+        bucket = self._buckets[tick]
+        event = bucket.popleft()
+        self._size -= 1
+
+        if not bucket:
+            heapq.heappop(self._ticks)
+            del self._buckets[tick]
+        return event
+
+    def drain(self, until: int):
+        """
+        Dépile les événements dus jusqu'à `until` inclus,
+        y compris ceux planifiés pendant l'itération.
+
+        La file est cohérente à chaque yield (bucket vide retiré
+        avant de rendre son dernier événement) : un callback qui
+        lève laisse la file utilisable.
+        """
+        ticks = self._ticks
+        buckets = self._buckets
+
+        while ticks and ticks[0] <= until:
+            tick = ticks[0]
+            bucket = buckets[tick]
+            event = bucket.popleft()
+            self._size -= 1
+
+            if not bucket:
+                heapq.heappop(ticks)
+                del buckets[tick]
+            yield event
 
 
 # ============================================================
@@ -54,11 +197,51 @@ class EventScheduler:
     Scheduler déterministe basé sur une priority queue.
 
     Le temps est simulé (pas wall-clock).
+
+    mode="heap"     : timestamps quelconques
+    mode="calendar" : timestamps entiers (ticks), haut débit
+    Dans les deux modes, les événements d'un même timestamp
+    s'exécutent dans leur ordre de planification.
     """
 
-    def __init__(self, start_time: int = 0):
+    def __init__(self, start_time: int = 0, mode: str = "heap"):
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"Unknown scheduler mode: {mode}")
+
         self.current_time = start_time
-        self._queue = []
+        self.mode = mode
+        self._queue = CalendarQueue() if mode == "calendar" else HeapQueue()
+        self._seq = 0
+
+    def _event(self, timestamp, callback, description, payload) -> ScheduledEvent:
+        if self.mode == "calendar" and not isinstance(timestamp, int):
+            raise TypeError("Calendar mode requires integer timestamps")
+
+        return ScheduledEvent(
+            timestamp=timestamp,
+            callback=callback,
+            description=description,
+            payload=payload,
+            seq=self._next_seq(1)
+        )
+
+    def _next_seq(self, count: int) -> int:
+        seq = self._seq
+        self._seq += count
+        return seq
+
+    def clone(self) -> "EventScheduler":
+        """
+        Copie des files d'attente seulement : les événements
+        (immuables une fois planifiés) et leurs callbacks
+        sont partagés avec l'original.
+        """
+        clone = EventScheduler.__new__(EventScheduler)
+        clone.current_time = self.current_time
+        clone.mode = self.mode
+        clone._queue = self._queue.clone()
+        clone._seq = self._seq
+        return clone
 
     # ------------------
     # Event management
@@ -74,17 +257,10 @@ class EventScheduler:
         """
         Planifie un événement après `delay` secondes.
         """
-        event_time = self.current_time + delay
-
-        event = ScheduledEvent(
-            timestamp=event_time,
-            callback=callback,
-            description=description,
-            payload=payload
+        self._queue.push(
+            self._event(self.current_time + delay, callback, description, payload)
         )
 
-        heapq.heappush(self._queue, event)
-
     def schedule_at(
         self,
         timestamp: int,
@@ -95,14 +271,36 @@ class EventScheduler:
         """
         Planifie un événement à un timestamp précis.
         """
-        event = ScheduledEvent(
-            timestamp=timestamp,
-            callback=callback,
-            description=description,
-            payload=payload
+        self._queue.push(
+            self._event(timestamp, callback, description, payload)
         )
 
-        heapq.heappush(self._queue, event)
+    def schedule_many(
+        self,
+        delay: int,
+        callbacks: Iterable[Callable],
+        description: str = "",
+        payloads: Optional[Iterable[Any]] = None
+    ):
+        """
+        Planifie un lot d'événements au même instant
+        (ex : un callback par agent et par tick).
+        """
+        timestamp = self.current_time + delay
+        if self.mode == "calendar" and not isinstance(timestamp, int):
+            raise TypeError("Calendar mode requires integer timestamps")
+        if payloads is None:
+            payloads = itertools.repeat(None)
+
+        events = [
+            ScheduledEvent(timestamp, callback, description, payload)
+            for callback, payload in zip(callbacks, payloads)
+        ]
+        first = self._next_seq(len(events))
+        for offset, event in enumerate(events):
+            event.seq = first + offset
+
+        self._queue.push_many(events)
 
     # ------------------
     # Time control
@@ -130,7 +328,7 @@ class EventScheduler:
         Exécute tous les événements restants.
         """
         while self._queue:
-            event = heapq.heappop(self._queue)
+            event = self._queue.pop()
             self.current_time = event.timestamp
             self._execute_event(event)
 
@@ -139,8 +337,7 @@ class EventScheduler:
     # ------------------
 
     def _execute_due_events(self):
-        while self._queue and self._queue[0].timestamp <= self.current_time:
-            event = heapq.heappop(self._queue)
+        for event in self._queue.drain(self.current_time):
             self._execute_event(event)
 
     def _execute_event(self, event: ScheduledEvent):
@@ -162,6 +359,4 @@ class EventScheduler:
         return len(self._queue)
 
     def next_event_time(self):
-        if not self._queue:
-            return None
-        return self._queue[0].timestamp
\ No newline at end of file
+        return self._queue.peek_time()
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""
+Liquidation Cascade
+-------------------
+
+Modèle de cascade de liquidations avec impact de prix.
+
+Le collatéral saisi est vendu sur le marketplace et l'AMM
+(courbe de profondeur) ; la baisse du floor qui en résulte
+fait passer de nouveaux health factors sous 1. Dans chaque
+bloc, la cascade est itérée jusqu'au point fixe, dans la
+limite `max_liquidations_per_block` (LiquidationManager.vy).
+
+Toutes les positions partagent le floor NFT : une position
+est liquidable quand floor < prix de rupture
+(dette / (unités * liquidation_threshold)). En triant les
+positions par prix de rupture décroissant, l'ensemble liquidé
+(pire HF d'abord) est toujours un préfixe : l'état d'un
+scénario se réduit à la longueur de ce préfixe, et des
+milliers de scénarios (crash x capacité) avancent ensemble
+en opérations vectorisées.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+LIQUIDATION_THRESHOLD = 0.75    # NFTCollateralManager.liquidation_threshold_bps
+MAX_CASCADE_ROUNDS = 64         # itérations max par bloc
+
+
+# ============================================================
+# Depth curve
+# ============================================================
+
+class DepthCurve:
+    """
+    Impact de prix des ventes de NFTs saisis.
+
+    - marketplace : carnet d'offres, impact exp(-q / depth)
+    - AMM         : produit constant, réserve NFT R,
+                    prix * (R / (R + q))^2
+    Le floor suit la moyenne pondérée des deux venues.
+
+    q = inventaire vendu non encore absorbé (en unités NFT),
+    qui décroît de `absorption` par bloc (arbitrage, nouveaux acheteurs).
+    """
+
+    def __init__(
+        self,
+        marketplace_depth: float = 500.0,
+        amm_reserve: float = 200.0,
+        amm_share: float = 0.3,
+        absorption: float = 0.2
+    ):
+        if not 0 <= amm_share <= 1:
+            raise ValueError("amm_share must be in [0, 1]")
+
+        self.marketplace_depth = marketplace_depth
+        self.amm_reserve = amm_reserve
+        self.amm_share = amm_share
+        self.absorption = absorption
+
+    def impact(self, sold) -> np.ndarray:
+        """
+        Multiplicateur du floor (0, 1] pour un inventaire vendu `sold`.
+        """
+        sold = np.asarray(sold, dtype=np.float64)
+        marketplace = np.exp(-sold / self.marketplace_depth)
+        amm = (self.amm_reserve / (self.amm_reserve + sold)) ** 2
+        return (1 - self.amm_share) * marketplace + self.amm_share * amm
+
+    def revenue(self, sold_before, sold_after) -> np.ndarray:
+        """
+        Produit (en floor fondamental) de la vente des unités entre
+        les inventaires `sold_before` et `sold_after` : intégrale de
+        impact(q) dq, chaque unité est vendue au floor déjà déprimé
+        par les précédentes.
+        """
+        q0 = np.asarray(sold_before, dtype=np.float64)
+        q1 = np.asarray(sold_after, dtype=np.float64)
+        depth, reserve = self.marketplace_depth, self.amm_reserve
+
+        marketplace = depth * (np.exp(-q0 / depth) - np.exp(-q1 / depth))
+        amm = reserve ** 2 * (1 / (reserve + q0) - 1 / (reserve + q1))
+        return (1 - self.amm_share) * marketplace + self.amm_share * amm
+
+
+# ============================================================
+# Cascade simulator
+# ============================================================
+
+class CascadeSimulator:
+    """
+    Cascade sur un book de positions (une position = un NFT
+    de poids `units` et une dette), pour S scénarios à la fois.
+    """
+
+    def __init__(
+        self,
+        units: Sequence[float],
+        debts: Sequence[float],
+        floor_price: float,
+        curve: Optional[DepthCurve] = None,
+        liquidation_threshold: float = LIQUIDATION_THRESHOLD
+    ):
+        units = np.asarray(units, dtype=np.float64)
+        debts = np.asarray(debts, dtype=np.float64)
+
+        with np.errstate(divide="ignore"):
+            breaking = np.where(
+                debts > 0,
+                debts / (units * liquidation_threshold),
+                0.0
+            )
+
+        # pire position d'abord
+        order = np.argsort(-breaking, kind="stable")
+        self.breaking = breaking[order]
+        self._neg_breaking = -self.breaking          # croissant, pour searchsorted
+        self.debts = debts[order]
+        self.units_prefix = np.concatenate(([0.0], np.cumsum(units[order])))
+        self.debt_prefix = np.concatenate(([0.0], np.cumsum(self.debts)))
+        self.size = len(order)
+
+        self.floor_price = float(floor_price)
+        self.curve = curve or DepthCurve()
+
+    def _eligible(self, floor: np.ndarray) -> np.ndarray:
+        """
+        Nombre de positions liquidables au floor donné (préfixe).
+        """
+        return np.searchsorted(self._neg_breaking, -floor, side="left")
+
+    def run(
+        self,
+        crash_depths: Sequence[float],
+        capacities: Sequence[int],
+        blocks: int = 50
+    ) -> Dict[str, np.ndarray]:
+        """
+        crash_depths, capacities : un couple par scénario (même longueur)
+        blocks                   : horizon en blocs après le crash
+
+        Retourne, par scénario : liquidations, blocs jusqu'à stabilisation,
+        floor final / minimum, produit des ventes et bad debt.
+
+        Chaque NFT saisi est vendu le long de la courbe de profondeur
+        (DepthCurve.revenue entre l'inventaire avant et après sa vente) ;
+        la bad debt est la somme des déficits par position, sans
+        compensation par le surplus des autres.
+        """
+        crash = np.asarray(crash_depths, dtype=np.float64)
+        caps = np.asarray(capacities, dtype=np.int64)
+        n = len(crash)
+
+        fundamental = self.floor_price * (1 - crash)
+        floor = fundamental.copy()
+        min_floor = floor.copy()
+
+        liquidated = np.zeros(n, dtype=np.int64)
+        inventory = np.zeros(n)
+        proceeds = np.zeros(n)
+        bad_debt = np.zeros(n)
+        settled_at = np.full(n, -1, dtype=np.int64)
+        floor_series = np.empty((blocks, n))
+
+        absorption = 1 - self.curve.absorption
+
+        for block in range(blocks):
+            inventory *= absorption
+            floor = fundamental * self.curve.impact(inventory)
+            limit = np.minimum(liquidated + caps, self.size)
+            start = liquidated.copy()
+
+            # Point fixe intra-bloc : ventes -> floor -> nouveaux HF < 1
+            for _ in range(MAX_CASCADE_ROUNDS):
+                target = np.minimum(np.maximum(self._eligible(floor), liquidated), limit)
+                new_units = self.units_prefix[target] - self.units_prefix[liquidated]
+                if not new_units.any():
+                    break
+
+                sales, shortfalls = self._sell(fundamental, inventory, liquidated, target)
+                proceeds += sales
+                bad_debt += shortfalls
+                inventory += new_units
+                liquidated = target
+                floor = fundamental * self.curve.impact(inventory)
+
+            np.minimum(min_floor, floor, out=min_floor)
+            floor_series[block] = floor
+
+            quiet = (liquidated == start) & (settled_at < 0)
+            settled_at[quiet] = block
+
+        debt_liquidated = self.debt_prefix[liquidated]
+        return {
+            "crash_depth": crash,
+            "capacity": caps,
+            "liquidations": liquidated,
+            "settled_block": settled_at,
+            "final_floor": floor,
+            "min_floor": min_floor,
+            "proceeds": proceeds,
+            "debt_liquidated": debt_liquidated,
+            "bad_debt": bad_debt,
+            "floor_series": floor_series,
+        }
+
+    def _sell(self, fundamental, inventory, liquidated, target):
+        """
+        Ventes du round : positions [liquidated, target) de chaque
+        scénario, dans l'ordre, à partir de l'inventaire courant.
+
+        Retourne (produit, bad debt) par scénario. Les tranches de
+        tous les scénarios sont aplaties en un seul tableau.
+        """
+        n = len(liquidated)
+        counts = target - liquidated
+        scenario = np.repeat(np.arange(n), counts)
+        first = np.repeat(liquidated, counts)
+        position = first + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        # inventaire au début de la vente de chaque position
+        base = inventory[scenario] - self.units_prefix[first]
+        sold_before = base + self.units_prefix[position]
+        sold_after = base + self.units_prefix[position + 1]
+
+        sales = fundamental[scenario] * self.curve.revenue(sold_before, sold_after)
+        shortfalls = np.maximum(self.debts[position] - sales, 0.0)
+        return (
+            np.bincount(scenario, weights=sales, minlength=n),
+            np.bincount(scenario, weights=shortfalls, minlength=n),
+        )
+
+    def sweep(
+        self,
+        crash_depths: Sequence[float],
+        capacities: Sequence[int],
+        blocks: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Grille crash x capacité, une ligne par couple.
+        """
+        crash, caps = np.meshgrid(
+            np.asarray(crash_depths, dtype=np.float64),
+            np.asarray(capacities, dtype=np.int64),
+            indexing="ij"
+        )
+        result = self.run(crash.ravel(), caps.ravel(), blocks)
+
+        columns = [k for k in result if k != "floor_series"]
+        return [
+            {k: result[k][i].item() for k in columns}
+            for i in range(crash.size)
+        ]
@@ -0,0 +1,106 @@
+"""
+Metrics Registry
+----------------
+
+Registre de métriques d'une simulation à agents :
+compteurs, gauges, métadonnées et séries temporelles
+(stockées en colonnes, downsamplées par bucket de temps).
+
+Le snapshot est consommé par SimulationReportGenerator.
+"""
+
+import copy
+from collections import defaultdict
+from typing import Any, Dict
+
+import numpy as np
+
+from tests.simulations.reports.time_series import TimeSeriesStore
+
+
+class MetricsRegistry:
+    """
+    Registre mono-thread (une instance par simulation).
+    """
+
+    def __init__(self, bucket_width: int = 1):
+        self.counters = defaultdict(int)
+        self.gauges: Dict[str, Any] = {}
+        self.metadata: Dict[str, Any] = {}
+        self.time_series = TimeSeriesStore(bucket_width=bucket_width)
+
+    # ------------------
+    # Updates
+    # ------------------
+
+    def inc(self, key: str, value: int = 1):
+        self.counters[key] += value
+
+    def set_gauge(self, key: str, value: Any):
+        self.gauges[key] = value
+
+    def set_metadata(self, key: str, value: Any):
+        self.metadata[key] = value
+
+    def record(self, name: str, timestamp: int, value: float):
+        self.time_series.record(name, timestamp, value)
+
+    def record_many(self, name: str, timestamp: int, values: np.ndarray):
+        """
+        Un point par entité au même instant (ex : HF de chaque borrower),
+        agrégé directement dans le bucket courant.
+        """
+        self.time_series.record_many(name, timestamp, values)
+
+    # ------------------
+    # Export
+    # ------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "metadata": dict(self.metadata),
+            "time_series": dict(self.time_series.series),
+        }
+
+    # ------------------
+    # Time machine
+    # ------------------
+
+    def freeze(self) -> "FrozenMetrics":
+        """
+        Snapshot pour TimeMachine : compteurs, gauges et métadonnées
+        copiés, séries figées par leurs bornes de colonnes (sans copie).
+        """
+        return FrozenMetrics(
+            copy.deepcopy((dict(self.counters), self.gauges, self.metadata)),
+            self.time_series.bucket_width,
+            self.time_series.bounds(),
+        )
+
+
+class FrozenMetrics:
+    """
+    Registre figé (MetricsRegistry.freeze), immuable.
+    """
+
+    def __init__(self, values: tuple, bucket_width: int, series_bounds: Dict[str, tuple]):
+        self._values = values
+        self._bucket_width = bucket_width
+        self._series_bounds = series_bounds
+
+    def thaw(self) -> MetricsRegistry:
+        """
+        Nouveau registre vivant (les séries sont copiées jusqu'à leur borne).
+        """
+        counters, gauges, metadata = copy.deepcopy(self._values)
+
+        registry = MetricsRegistry(bucket_width=self._bucket_width)
+        registry.counters.update(counters)
+        registry.gauges = gauges
+        registry.metadata = metadata
+        registry.time_series = TimeSeriesStore.from_bounds(
+            self._bucket_width, self._series_bounds
+        )
+        return registry
@@ -0,0 +1,327 @@
+"""
+Vectorized Lending Pool
+-----------------------
+
+Pool de lending simulé, réutilisable par tous les scénarios.
+
+Reproduit sur des positions stockées en tableaux NumPy :
+- LendingPool.vy          : frais d'emprunt dynamiques, cooldown,
+                            plafond d'emprunt global
+- NFTCollateralManager.vy : LTV, health factor
+                            (prix * liquidation_threshold / dette)
+- LiquidationManager.vy   : HF < 1 requis, max_liquidations_per_block
+
+Détection des positions liquidables : une comparaison vectorisée.
+Liquidations : appliquées en lot, dans la limite par bloc.
+
+Expose l'API des anciens MockPool des scénarios
+(healthFactor, getUnderwaterBorrowers, liquidate...) et
+joue aussi le rôle d'oracle (setPrice).
+"""
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+BPS = 10_000
+
+# LendingPool.vy
+BORROW_FEE_BPS = 30
+BORROW_COOLDOWN = 300
+MAX_TOTAL_BORROW = 10**26
+
+# NFTCollateralManager.vy
+LTV_BPS = 6000
+LIQUIDATION_THRESHOLD_BPS = 7500
+
+
+class VectorizedLendingPool:
+    """
+    Une position par borrower (un NFT de collatéral, poids
+    `collateral_units` relatif au prix de marché NFT).
+    """
+
+    def __init__(
+        self,
+        borrowers: Sequence[str],
+        liquidity: float,
+        nft_price: float,
+        collateral_units: Optional[np.ndarray] = None,
+        ltv_bps: int = LTV_BPS,
+        liquidation_threshold_bps: int = LIQUIDATION_THRESHOLD_BPS,
+        max_debt_per_nft: float = np.inf,
+        max_liquidations_per_block: int = 10,
+        borrow_fee_bps: int = BORROW_FEE_BPS,
+        borrow_cooldown: int = BORROW_COOLDOWN,
+        max_total_borrow: float = MAX_TOTAL_BORROW,
+        clock: Optional[Callable[[], int]] = None
+    ):
+        size = len(borrowers)
+
+        self.borrowers = list(borrowers)
+        self.index: Dict[str, int] = {
+            user: i for i, user in enumerate(self.borrowers)
+        }
+
+        self.total_liquidity = float(liquidity)
+        self.total_borrowed = 0.0
+        self.treasury_fees = 0.0
+        self.bad_debt = 0.0
+
+        self.nft_price = float(nft_price)
+        self.collateral_units = (
+            np.ones(size) if collateral_units is None
+            else np.asarray(collateral_units, dtype=np.float64)
+        )
+        self.debt = np.zeros(size)
+        self.active = np.ones(size, dtype=bool)
+        self.last_borrow_ts = np.full(size, -borrow_cooldown, dtype=np.int64)
+
+        self.ltv_bps = ltv_bps
+        self.liquidation_threshold_bps = liquidation_threshold_bps
+        self.max_debt_per_nft = max_debt_per_nft
+        self.borrow_fee_bps = borrow_fee_bps
+        self.borrow_cooldown = borrow_cooldown
+        self.max_total_borrow = max_total_borrow
+
+        self.max_liquidations_per_block = max_liquidations_per_block
+        self.liquidations_this_block = 0
+        self.last_block = None
+
+        # Temps simulé (bloc courant), ex : SimulationEngine.clock
+        self.clock = clock or _genesis
+
+    def indices(self, users: Sequence[str]) -> np.ndarray:
+        return np.fromiter(
+            (self.index[user] for user in users),
+            dtype=np.int64,
+            count=len(users)
+        )
+
+    # ------------------
+    # Oracle
+    # ------------------
+
+    def setPrice(self, price: float):
+        self.nft_price = float(price)
+
+    def apply_price_shock(self, factor: float):
+        """
+        Choc de marché global (ex : 0.5 = -50%).
+        """
+        self.nft_price *= factor
+
+    # ------------------
+    # Risk (NFTCollateralManager)
+    # ------------------
+
+    def collateral_values(self) -> np.ndarray:
+        return self.collateral_units * self.nft_price * self.active
+
+    def health_factors(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        HF = prix * liquidation_threshold / dette (inf sans dette).
+        """
+        debt = self.debt if idx is None else self.debt[idx]
+        value = self.collateral_values()
+        if idx is not None:
+            value = value[idx]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hf = value * (self.liquidation_threshold_bps / BPS) / debt
+        return np.where(debt > 0, hf, np.inf)
+
+    def max_borrows(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        value = self.collateral_values()
+        debt = self.debt
+        if idx is not None:
+            value, debt = value[idx], debt[idx]
+
+        capacity = np.minimum(value * (self.ltv_bps / BPS), self.max_debt_per_nft)
+        return np.maximum(capacity - debt, 0.0)
+
+    def underwater(self) -> np.ndarray:
+        """
+        Indices des positions liquidables (une comparaison vectorisée).
+        """
+        return np.flatnonzero(self.health_factors() < 1.0)
+
+    # ------------------
+    # Borrowing (LendingPool)
+    # ------------------
+
+    def _fee_bps(self, borrowed_before: np.ndarray) -> np.ndarray:
+        """
+        LendingPool._dynamic_borrow_fee, par emprunt.
+        """
+        if self.total_liquidity == 0:
+            return np.full(borrowed_before.shape, self.borrow_fee_bps)
+
+        util = borrowed_before * BPS / self.total_liquidity
+        return np.select(
+            [util > 9000, util > 7500],
+            [80, 50],
+            default=self.borrow_fee_bps
+        )
+
+    def borrow_many(self, idx: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        """
+        Emprunts en lot, dans l'ordre de `idx`
+        (une position au plus une fois par lot, cf. cooldown).
+
+        Rejette (montant 0) les emprunts en cooldown, au-delà
+        de la LTV, ou au-delà du plafond global.
+        Retourne les montants effectivement empruntés.
+        """
+        idx = np.asarray(idx, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=np.float64).copy()
+        now = self.clock()
+
+        allowed = (
+            self.active[idx]
+            & (now >= self.last_borrow_ts[idx] + self.borrow_cooldown)
+            & (amounts > 0)
+            & (amounts <= self.max_borrows(idx) * (1 + 1e-12))
+        )
+        # Masques cooldown / LTV d'abord : un emprunt rejeté
+        # ne consomme pas de place sous le plafond global
+        amounts *= allowed
+        self._apply_global_cap(amounts)
+        borrowed_before = self.total_borrowed + np.cumsum(amounts) - amounts
+
+        fees = amounts * self._fee_bps(borrowed_before) / BPS
+
+        np.add.at(self.debt, idx, amounts)
+        self.last_borrow_ts[idx[amounts > 0]] = now
+        self.total_borrowed += float(amounts.sum())
+        self.treasury_fees += float(fees.sum())
+        return amounts
+
+    def _apply_global_cap(self, amounts: np.ndarray):
+        """
+        Plafond global, emprunts traités dans l'ordre (en place) :
+        un emprunt passe si les emprunts acceptés avant lui plus
+        le sien tiennent sous max_total_borrow.
+
+        Un cumsum par rejet, à partir du rejet ; les montants
+        qui ne tiennent plus seuls sont écartés d'un coup.
+        """
+        room = self.max_total_borrow - self.total_borrowed
+        start = 0
+
+        while start < amounts.size:
+            rest = amounts[start:]
+            rest[rest > room] = 0.0
+
+            prefix = np.cumsum(rest)
+            over = np.flatnonzero(prefix > room)
+            if not over.size:
+                return
+
+            k = int(over[0])
+            room -= prefix[k] - rest[k]      # acceptés avant le rejet
+            rest[k] = 0.0
+            start += k + 1
+
+    def repay_many(self, idx: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        idx = np.asarray(idx, dtype=np.int64)
+        amounts = np.minimum(np.asarray(amounts, dtype=np.float64), self.debt[idx])
+
+        np.subtract.at(self.debt, idx, amounts)
+        self.total_borrowed -= float(amounts.sum())
+        return amounts
+
+    # ------------------
+    # Liquidation (LiquidationManager)
+    # ------------------
+
+    def _liquidation_budget(self) -> int:
+        block = self.clock()
+        if block != self.last_block:
+            self.liquidations_this_block = 0
+            self.last_block = block
+        return self.max_liquidations_per_block - self.liquidations_this_block
+
+    def liquidate_many(
+        self,
+        idx: Optional[np.ndarray] = None,
+        worst_first: bool = False,
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Liquide en lot les positions HF < 1 (toutes, ou parmi `idx`),
+        dans la limite max_liquidations_per_block (et `limit`,
+        capacité propre du liquidateur).
+
+        Le liquidateur saisit le NFT et rembourse la dette à hauteur
+        de sa valeur ; le reste est passé en bad debt (perte du pool).
+        """
+        if idx is None:
+            candidates = self.underwater()
+        else:
+            idx = np.asarray(idx, dtype=np.int64)
+            candidates = idx[self.health_factors(idx) < 1.0]
+
+        if worst_first and candidates.size:
+            order = np.argsort(self.health_factors(candidates), kind="stable")
+            candidates = candidates[order]
+
+        budget = self._liquidation_budget()
+        if limit is not None:
+            budget = min(budget, limit)
+        liquidated = candidates[:max(budget, 0)]
+        if not liquidated.size:
+            return liquidated
+
+        debt = self.debt[liquidated]
+        collateral = self.collateral_values()[liquidated]
+
+        shortfall = float(np.maximum(debt - collateral, 0.0).sum())
+        self.bad_debt += shortfall
+        self.total_liquidity -= shortfall
+        self.total_borrowed -= float(debt.sum())
+
+        self.debt[liquidated] = 0.0
+        self.active[liquidated] = False
+        self.liquidations_this_block += liquidated.size
+        return liquidated
+
+    # ------------------
+    # Scenario API (ex-MockPool)
+    # ------------------
+
+    def totalLiquidity(self) -> float:
+        """
+        Liquidité disponible : dépôts - encours.
+        """
+        return self.total_liquidity - self.total_borrowed
+
+    def isSolvent(self) -> bool:
+        return self.totalLiquidity() > 0 and self.bad_debt == 0
+
+    def getMaxBorrow(self, user: str) -> float:
+        return float(self.max_borrows(np.array([self.index[user]]))[0])
+
+    def borrow(self, user: str, amount: float):
+        borrowed = self.borrow_many(np.array([self.index[user]]), np.array([amount]))
+        if not borrowed[0]:
+            raise ValueError(f"Borrow rejected for {user}")
+
+    def repay(self, user: str, amount: float):
+        self.repay_many(np.array([self.index[user]]), np.array([amount]))
+
+    def healthFactor(self, user: str) -> float:
+        return float(self.health_factors(np.array([self.index[user]]))[0])
+
+    def getUnderwaterBorrowers(self):
+        return [self.borrowers[i] for i in self.underwater()]
+
+    def liquidate(self, user: str):
+        liquidated = self.liquidate_many(np.array([self.index[user]]))
+        if not liquidated.size:
+            raise ValueError(f"Liquidation rejected for {user}")
+
+
+def _genesis() -> int:
+    return 0
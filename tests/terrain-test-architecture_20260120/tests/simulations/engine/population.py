@@ -0,0 +1,386 @@
+"""
+Population Engine
+-----------------
+
+Moteur de population vectorisé pour les simulations
+utilisateurs massives (jusqu'à 1 milliard d'utilisateurs).
+
+L'état de chaque utilisateur (collatéral, dette, health factor,
+propension d'action) est stocké dans des tableaux NumPy.
+À chaque tick, les actions de toute la population sont tirées
+en un seul tirage, et les compteurs sont mis à jour par
+réductions de tableaux.
+
+La population est traitée par chunks pour borner la mémoire,
+en série ou dans un pool de processus (un chunk = une tâche).
+
+Les contrôles pre/post du superviseur (simulate_user_action,
+bounded=True) sont remplacés par des bornes vectorisées vérifiées
+à chaque tick : soldes non négatifs, emprunts dans la limite de LTV,
+dette soldée après liquidation. Les hooks par utilisateur du
+superviseur ne sont pas appelés.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# ============================================================
+# Actions
+# ============================================================
+
+ACTIONS = (
+    "deposit_nft",
+    "borrow",
+    "repay",
+    "health_check",
+    "liquidation_check",
+)
+
+# Mêmes clés que SimulationEngine.simulate_user_action
+ACTION_COUNTERS = (
+    "nft_deposits",
+    "borrows",
+    "repays",
+    "health_checks",
+    "liquidation_checks",
+)
+
+DEPOSIT_NFT, BORROW, REPAY, HEALTH_CHECK, LIQUIDATION_CHECK = range(len(ACTIONS))
+
+# Profils de propension (une ligne par segment d'utilisateurs)
+DEFAULT_SEGMENTS = np.array([
+    # deposit, borrow, repay, health, liquidation
+    [0.20, 0.20, 0.20, 0.20, 0.20],   # uniforme (équivalent random.choice)
+    [0.10, 0.45, 0.05, 0.30, 0.10],   # emprunteurs agressifs
+    [0.30, 0.10, 0.40, 0.15, 0.05],   # utilisateurs prudents
+])
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Tolérance float32 sur la borne de LTV
+BOUND_TOLERANCE = 1e-4
+
+
+# ============================================================
+# Population chunk
+# ============================================================
+
+class UserPopulation:
+    """
+    État d'un chunk d'utilisateurs, en colonnes.
+
+    Les utilisateurs sont rangés par segment de propension
+    (plages contiguës) : le tirage des actions se fait alors
+    par comparaisons scalaires, sans gather par utilisateur.
+    Toutes les mises à jour sont des opérations sur tableaux
+    complets (pas d'indexation booléenne).
+    """
+
+    def __init__(
+        self,
+        size: int,
+        rng: np.random.Generator,
+        segments: np.ndarray = DEFAULT_SEGMENTS,
+        segment_weights: Optional[np.ndarray] = None,
+        nft_value: float = 1_000.0,
+        ltv: float = 0.60,
+        liquidation_threshold: float = 0.75,
+    ):
+        self.size = size
+        self.rng = rng
+
+        self.nft_value = nft_value
+        self.ltv = np.float32(ltv)
+        self.liquidation_threshold = np.float32(liquidation_threshold)
+
+        # Propensions : CDF par segment + plages contiguës
+        segments = np.asarray(segments, dtype=np.float64)
+        segments = segments / segments.sum(axis=1, keepdims=True)
+        self.cdf = np.cumsum(segments, axis=1)[:, :-1].astype(np.float32)
+
+        if segment_weights is None:
+            segment_weights = np.full(len(segments), 1.0 / len(segments))
+        counts = rng.multinomial(size, segment_weights)
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        self.segment_ranges = list(zip(bounds[:-1], bounds[1:]))
+
+        # Collatéral en "unités NFT" (dispersion log-normale) :
+        # valeur = unités * indice de marché, un choc de prix est O(1)
+        self.nft_units = rng.lognormal(0.0, 0.25, size=size).astype(np.float32)
+        self.market_index = 1.0
+
+        self.collateral = np.zeros(size, dtype=np.float32)
+        self.debt = np.zeros(size, dtype=np.float32)
+        self.health_factor = np.full(size, np.inf, dtype=np.float32)
+
+        self._actions = np.empty(size, dtype=np.uint8)
+
+    # ------------------
+    # Sampling
+    # ------------------
+
+    def sample_actions(self) -> np.ndarray:
+        """
+        Une action par utilisateur, en un seul tirage.
+        """
+        u = self.rng.random(self.size, dtype=np.float32)
+        actions = self._actions
+        actions[:] = 0
+
+        for (start, end), thresholds in zip(self.segment_ranges, self.cdf):
+            chunk = u[start:end]
+            out = actions[start:end]
+            for threshold in thresholds:
+                out += chunk >= threshold
+
+        return actions
+
+    # ------------------
+    # Tick
+    # ------------------
+
+    def step(self, market_return: float = 1.0, bounded: bool = True) -> np.ndarray:
+        """
+        Applique un tick d'actions à toute la population.
+
+        market_return : variation de l'indice de prix NFT sur le tick
+        bounded       : vérifie les bornes après le tick (check_bounds)
+        Retourne les compteurs [nb par action..., liquidations, violations].
+        """
+        actions = self.sample_actions()
+
+        self.market_index *= market_return
+        price = np.float32(self.nft_value * self.market_index)
+
+        # deposit_nft : +1 NFT
+        self.collateral += (actions == DEPOSIT_NFT) * self.nft_units
+
+        # borrow : la moitié de la capacité restante
+        capacity = self.collateral * (price * self.ltv) - self.debt
+        np.maximum(capacity, 0.0, out=capacity)
+        borrowed = (actions == BORROW) * (capacity * 0.5)
+        self.debt += borrowed
+
+        # repay : la moitié de la dette
+        self.debt -= (actions == REPAY) * (self.debt * 0.5)
+
+        # health_check / liquidation_check : recalcul du HF
+        check = actions >= HEALTH_CHECK
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hf = self.collateral * (price * self.liquidation_threshold) / self.debt
+        self.health_factor = np.where(check, hf, self.health_factor)
+
+        # liquidation_check : saisie totale si HF < 1
+        liquidatable = (actions == LIQUIDATION_CHECK) & (self.health_factor < 1.0)
+        liquidations = int(np.count_nonzero(liquidatable))
+        if liquidations:
+            keep = ~liquidatable
+            self.collateral *= keep
+            self.debt *= keep
+            self.health_factor[liquidatable] = np.inf
+
+        violations = self.check_bounds(borrowed, price, liquidatable) if bounded else 0
+
+        counts = np.bincount(actions, minlength=len(ACTIONS))
+        return np.append(counts, (liquidations, violations))
+
+    def check_bounds(
+        self,
+        borrowed: np.ndarray,
+        price: np.float32,
+        liquidated: np.ndarray
+    ) -> int:
+        """
+        Équivalent vectorisé des pre/post checks du superviseur.
+
+        Nombre d'utilisateurs hors bornes après le tick :
+        - collatéral ou dette négatifs
+        - emprunt du tick menant au-delà de collatéral * prix * LTV
+        - dette restante après une liquidation
+        """
+        limit = self.collateral * (price * self.ltv) * np.float32(1 + BOUND_TOLERANCE)
+        invalid = (self.collateral < 0) | (self.debt < 0)
+        invalid |= (borrowed > 0) & (self.debt > limit)
+        invalid |= liquidated & (self.debt != 0)
+        return int(np.count_nonzero(invalid))
+
+
+# ============================================================
+# Population engine
+# ============================================================
+
+MARKET_STREAM = 2**32 - 1   # spawn_key réservé au chemin de marché
+
+# Compteurs par action + liquidations + violations de bornes
+TOTALS_SIZE = len(ACTIONS) + 2
+
+
+def chunk_rng(seed: Optional[int], chunk_id: int) -> np.random.Generator:
+    """
+    RNG indépendant et reproductible par chunk.
+    """
+    return np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(chunk_id,))
+    )
+
+
+def market_path(
+    seed: Optional[int],
+    ticks: int,
+    volatility: float
+) -> np.ndarray:
+    """
+    Rendements de l'indice NFT par tick, communs à tous les chunks.
+    """
+    rng = chunk_rng(seed, MARKET_STREAM)
+    return np.exp(rng.normal(0.0, volatility, size=ticks))
+
+
+class PopulationEngine:
+    """
+    Simule `total_users` utilisateurs sur `ticks` ticks,
+    chunk par chunk (mémoire bornée par `chunk_size`).
+    """
+
+    def __init__(
+        self,
+        total_users: int,
+        ticks: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        seed: Optional[int] = None,
+        market_volatility: float = 0.05,
+        bounded: bool = True,
+        **population_kwargs
+    ):
+        self.total_users = total_users
+        self.ticks = ticks
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.bounded = bounded
+        self.population_kwargs = population_kwargs
+
+        self.market_returns = market_path(seed, ticks, market_volatility)
+
+    def chunks(self):
+        for chunk_id, start in enumerate(
+            range(0, self.total_users, self.chunk_size)
+        ):
+            yield chunk_id, min(self.chunk_size, self.total_users - start)
+
+    def run_chunk(self, chunk_id: int, size: int) -> np.ndarray:
+        population = UserPopulation(
+            size,
+            chunk_rng(self.seed, chunk_id),
+            **self.population_kwargs
+        )
+
+        totals = np.zeros(TOTALS_SIZE, dtype=np.int64)
+        for market_return in self.market_returns:
+            totals += population.step(float(market_return), self.bounded)
+        return totals
+
+    def run(self, metrics=None, workers: int = 1) -> Dict[str, int]:
+        """
+        Exécute toute la population et retourne les compteurs.
+
+        metrics : MetricsCollector optionnel (compteurs incrémentés)
+        workers : > 1 pour exécuter les chunks dans un pool de processus
+
+        Le résultat ne dépend que de la seed : chaque chunk a son
+        propre RNG, quel que soit le processus qui l'exécute.
+
+        Avec bounded=True, lève AssertionError si un utilisateur
+        sort des bornes (compteur "bound_violations").
+        """
+        started = time.time()
+
+        if workers > 1:
+            totals = self._run_parallel(workers)
+        else:
+            totals = np.zeros(TOTALS_SIZE, dtype=np.int64)
+            for chunk_id, size in self.chunks():
+                totals += self.run_chunk(chunk_id, size)
+
+        counters = to_counters(totals)
+        elapsed = time.time() - started
+        counters["user_actions_per_second"] = int(
+            self.total_users * self.ticks / max(elapsed, 1e-9)
+        )
+
+        # Le collecteur n'est touché qu'ici, dans le processus parent
+        if metrics is not None:
+            for key, value in counters.items():
+                if key != "user_actions_per_second":
+                    metrics.inc(key, value)
+
+        if self.bounded and counters["bound_violations"]:
+            raise AssertionError(
+                f"{counters['bound_violations']} user actions out of bounds"
+            )
+
+        return counters
+
+    def _run_parallel(self, workers: int) -> np.ndarray:
+        """
+        Dispatch en flux : au plus 2 chunks en vol par worker,
+        chaque résultat (shard de compteurs) est réduit à l'arrivée.
+        """
+        totals = np.zeros(TOTALS_SIZE, dtype=np.int64)
+        chunks = self.chunks()
+        max_in_flight = workers * 2
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as executor:
+            in_flight = set()
+
+            for chunk_id, size in chunks:
+                in_flight.add(executor.submit(_worker_run_chunk, chunk_id, size))
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        totals += future.result()
+
+            for future in in_flight:
+                totals += future.result()
+
+        return totals
+
+
+# ============================================================
+# Process workers
+# ============================================================
+
+_WORKER_ENGINE = None
+
+
+def _init_worker(engine: PopulationEngine):
+    # Configuration envoyée une fois par processus, pas par tâche
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine
+
+
+def _worker_run_chunk(chunk_id: int, size: int) -> np.ndarray:
+    return _WORKER_ENGINE.run_chunk(chunk_id, size)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def to_counters(totals: np.ndarray) -> Dict[str, int]:
+    counters = {
+        key: int(totals[i])
+        for i, key in enumerate(ACTION_COUNTERS)
+    }
+    counters["liquidations"] = int(totals[len(ACTIONS)])
+    counters["bound_violations"] = int(totals[len(ACTIONS) + 1])
+    return counters
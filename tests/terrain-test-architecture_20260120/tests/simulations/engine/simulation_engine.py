@@ -1,18 +1,168 @@
 # tests/simulations/engine/simulation_engine.py
 
 import random
+from typing import Any, Callable, Dict, List, Optional
+
+from tests.simulations.engine.event_scheduler import EventScheduler
+from tests.simulations.engine.metrics import MetricsRegistry
+
+
+class SimulationContext:
+    """
+    Contexte partagé par tous les agents :
+    mocks du protocole, état libre, registre de métriques.
+    """
+
+    def __init__(
+        self,
+        protocol: Optional[Dict[str, Any]] = None,
+        state: Optional[Dict[str, Any]] = None,
+        metrics_registry: Optional[MetricsRegistry] = None
+    ):
+        self.protocol = protocol if protocol is not None else {}
+        self.state = state if state is not None else {}
+        self.metrics_registry = metrics_registry or MetricsRegistry()
+
+    # Nom attendu par TimeMachine
+    @property
+    def metrics(self):
+        return self.metrics_registry
+
+    @metrics.setter
+    def metrics(self, value):
+        self.metrics_registry = value
 
 
 class SimulationEngine:
     """
     Moteur de simulation économique et utilisateur
     Compatible stress tests massifs
+
+    Noyau à agents, piloté par ticks :
+    - register_agent : on_register(engine), puis on_tick(engine) à chaque tick
+    - schedule_event : callback(context, payload) après `delay` ticks
+    - run(duration)  : événements dus puis dispatch des agents, tick par tick
+
+    Le dispatch est groupé par type d'agent : un type qui définit
+    `on_tick_batch(engine, agents)` (classmethod / staticmethod)
+    reçoit tous ses agents en un appel.
     """
 
-    def __init__(self, scheduler, supervisor, metrics):
-        self.scheduler = scheduler
+    def __init__(
+        self,
+        protocol: Optional[Dict[str, Any]] = None,
+        scheduler: Optional[EventScheduler] = None,
+        supervisor=None,
+        metrics=None,
+        tick_size: int = 1
+    ):
+        self.scheduler = scheduler or EventScheduler(mode="calendar")
         self.supervisor = supervisor
         self.metrics = metrics
+        self.tick_size = tick_size
+
+        self.clock = SimClock(self)
+        self._phase = 0           # temps écoulé dans le tick en cours
+
+        # Copie : l'horloge n'est pas injectée dans le dict de l'appelant
+        if isinstance(protocol, dict):
+            protocol = dict(protocol)
+            protocol.setdefault("time", self.clock)
+        self.context = SimulationContext(protocol)
+
+        self.agents: List[Any] = []
+        self._groups: Dict[type, List[Any]] = {}
+        self._dispatch: Optional[List[Callable]] = None
+
+    # ---------------------------------
+    # AGENTS
+    # ---------------------------------
+
+    def register_agent(self, agent):
+        """
+        Enregistre un agent ; `on_register` est appelé immédiatement.
+        """
+        self.agents.append(agent)
+        self._groups.setdefault(type(agent), []).append(agent)
+        self._dispatch = None
+
+        on_register = getattr(agent, "on_register", None)
+        if on_register is not None:
+            on_register(self)
+
+        return agent
+
+    def _build_dispatch(self) -> List[Callable]:
+        """
+        Handlers de tick résolus une fois (pas de getattr par tick).
+        """
+        dispatch = []
+        for agent_type, agents in self._groups.items():
+            batch = getattr(agent_type, "on_tick_batch", None)
+            if batch is not None:
+                dispatch.append(_BatchTick(batch, agents))
+            elif hasattr(agent_type, "on_tick"):
+                dispatch.extend(agent.on_tick for agent in agents)
+        return dispatch
+
+    # ---------------------------------
+    # TIME & EVENTS
+    # ---------------------------------
+
+    def current_time(self) -> int:
+        return self.scheduler.current_time
+
+    def schedule_event(
+        self,
+        delay: int,
+        callback: Callable,
+        description: str = "",
+        payload: Any = None
+    ):
+        """
+        Planifie callback(context, payload) après `delay` ticks.
+        """
+        self.scheduler.schedule(
+            delay,
+            self._fire,
+            description=description,
+            payload=(callback, payload)
+        )
+
+    def _fire(self, entry):
+        callback, payload = entry
+        callback(self.context, payload)
+        self.context.metrics_registry.inc("events_executed")
+
+    # ---------------------------------
+    # RUN LOOP
+    # ---------------------------------
+
+    def run(self, duration: int):
+        """
+        Avance de `duration` unités de temps.
+        À chaque tick : événements dus, puis tick des agents.
+
+        Les agents tournent sur les multiples de tick_size : un reste
+        (duration % tick_size) avance le temps et exécute les
+        événements dus, le tick est complété au run suivant.
+        """
+        advance = self.scheduler.advance_time
+        tick_size = self.tick_size
+
+        while duration > 0:
+            step = min(tick_size - self._phase, duration)
+            advance(step)
+            duration -= step
+
+            self._phase = (self._phase + step) % tick_size
+            if self._phase:
+                continue
+
+            if self._dispatch is None:
+                self._dispatch = self._build_dispatch()
+            for handler in self._dispatch:
+                handler(self)
 
     # ---------------------------------
     # USER ACTION SIMULATION
@@ -49,7 +199,36 @@ class SimulationEngine:
         """
         Exécute tous les événements planifiés
         """
-        while self.scheduler.has_events():
-            event = self.scheduler.next_event()
-            event.execute()
-            self.metrics.inc("events_executed")
+        self.scheduler.run_all()
+
+
+class SimClock:
+    """
+    Horloge simulée du moteur (protocol["time"]).
+
+    Objet appelable picklable, contrairement à une méthode liée
+    ou une lambda : le protocole reste envoyable à un worker.
+    """
+
+    __slots__ = ("engine",)
+
+    def __init__(self, engine: SimulationEngine):
+        self.engine = engine
+
+    def __call__(self) -> int:
+        return self.engine.scheduler.current_time
+
+
+class _BatchTick:
+    """
+    Tick groupé d'un type d'agent : un appel pour tous ses agents.
+    """
+
+    __slots__ = ("handler", "agents")
+
+    def __init__(self, handler: Callable, agents: List[Any]):
+        self.handler = handler
+        self.agents = agents
+
+    def __call__(self, engine: SimulationEngine):
+        self.handler(engine, self.agents)
@@ -0,0 +1,51 @@
+from tests.simulations.engine.branch_runner import BranchRunner
+from tests.simulations.engine.event_scheduler import EventScheduler
+from tests.simulations.engine.simulation_engine import SimulationContext
+from tests.simulations.engine.time_machine import TimeMachine
+
+
+class Withdraw:
+    """
+    Agent planifié : retire de la liquidité du pool du contexte.
+    """
+
+    def __init__(self, context, amount):
+        self.context = context
+        self.amount = amount
+
+    def __call__(self):
+        self.context.protocol["pool"]["liquidity"] -= self.amount
+
+
+def crash_branch(machine, params):
+    machine.scheduler.schedule(1, Withdraw(machine.context, params["amount"]), "crash")
+    machine.advance(2)
+    return {"liquidity": machine.context.protocol["pool"]["liquidity"]}
+
+
+def make_runner():
+    context = SimulationContext(protocol={"pool": {"liquidity": 100}})
+    scheduler = EventScheduler()
+    scheduler.schedule_at(1, Withdraw(context, 10), "withdraw")
+    machine = TimeMachine(scheduler, context)
+    return BranchRunner(machine, machine.snapshot(), crash_branch, seed=1)
+
+
+def test_identical_variants_identical_reports_serial_and_parallel():
+    variants = [{"amount": 10}] * 4
+
+    serial = make_runner().run(variants, workers=1)
+    parallel = make_runner().run(variants, workers=2)
+
+    serial_reports = [result["report"] for result in serial]
+    parallel_reports = [result["report"] for result in parallel]
+    assert serial_reports == [{"liquidity": 80}] * 4
+    assert parallel_reports == serial_reports
+
+
+def test_branches_leave_base_machine_untouched():
+    runner = make_runner()
+    runner.run([{"amount": 30}, {"amount": 50}])
+
+    assert runner.machine.context.protocol["pool"]["liquidity"] == 100
+    assert runner.machine.now() == 0
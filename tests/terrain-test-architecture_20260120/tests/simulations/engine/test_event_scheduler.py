@@ -0,0 +1,44 @@
+import pytest
+
+from tests.simulations.engine.event_scheduler import EventScheduler
+
+
+def failing():
+    raise ValueError("boom")
+
+
+@pytest.mark.parametrize("mode", ["heap", "calendar"])
+def test_failing_event_leaves_queue_usable(mode):
+    scheduler = EventScheduler(mode=mode)
+    executed = []
+
+    scheduler.schedule_at(1, failing, "failing")
+    scheduler.schedule_at(2, lambda: executed.append(2), "normal")
+
+    with pytest.raises(RuntimeError):
+        scheduler.run_until(1)
+
+    assert scheduler.pending_events() == 1
+    assert scheduler.next_event_time() == 2
+
+    scheduler.run_all()
+    assert executed == [2]
+    assert scheduler.pending_events() == 0
+    assert scheduler.next_event_time() is None
+
+
+@pytest.mark.parametrize("mode", ["heap", "calendar"])
+def test_same_tick_events_are_fifo_including_rescheduled(mode):
+    scheduler = EventScheduler(mode=mode)
+    order = []
+
+    def first():
+        order.append("a")
+        scheduler.schedule(0, lambda: order.append("c"))
+
+    scheduler.schedule_at(1, first)
+    scheduler.schedule_at(1, lambda: order.append("b"))
+    scheduler.run_until(1)
+
+    assert order == ["a", "b", "c"]
+    assert scheduler.pending_events() == 0
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from tests.simulations.engine.liquidation_cascade import CascadeSimulator, DepthCurve
+
+
+def make_simulator(size=2_000, depth=20.0, seed=0):
+    rng = np.random.default_rng(seed)
+    units = rng.lognormal(0.0, 0.3, size=size)
+    debts = units * 100.0 * 0.75 * rng.uniform(0.3, 0.95, size=size)
+    curve = DepthCurve(marketplace_depth=depth, amm_reserve=depth / 2.5)
+    return CascadeSimulator(units, debts, floor_price=100.0, curve=curve)
+
+
+@pytest.mark.parametrize("depth", [5.0, 100.0, 200.0])
+def test_bad_debt_grows_with_crash_depth(depth):
+    # carnet peu profond : ventes au floor d'avant impact = bad debt sous-estimée
+    crashes = np.linspace(0.0, 0.9, 46)
+    result = make_simulator(depth=depth).run(crashes, np.full(len(crashes), 100))
+
+    assert np.all(np.diff(result["bad_debt"]) >= -1e-9)
+    assert result["bad_debt"][-1] > 0
+
+
+def test_sale_revenue_integrates_the_depth_curve():
+    curve = DepthCurve(marketplace_depth=50.0, amm_reserve=20.0)
+    q = np.linspace(0.0, 30.0, 300_001)
+    numeric = np.trapz(curve.impact(q), q)
+
+    assert curve.revenue(0.0, 30.0) == pytest.approx(numeric, rel=1e-9)
+    assert curve.revenue(0.0, 30.0) < 30.0 * curve.impact(0.0)
+
+
+def test_bad_debt_is_not_netted_across_positions():
+    # floor 50 : la première position est sous l'eau (74 > 50),
+    # la seconde liquidable mais en surplus (45 < 50)
+    simulator = CascadeSimulator(
+        units=[1.0, 1.0],
+        debts=[74.0, 45.0],
+        floor_price=100.0,
+        curve=DepthCurve(marketplace_depth=1e9, amm_reserve=1e9),
+    )
+    result = simulator.run([0.5], [10], blocks=1)
+
+    assert result["liquidations"][0] == 2
+    assert result["proceeds"][0] == pytest.approx(100.0, rel=1e-6)
+    assert result["bad_debt"][0] == pytest.approx(74.0 - 50.0, rel=1e-6)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from tests.simulations.engine.mock_pool import VectorizedLendingPool
+
+
+def make_pool(size=3, max_total_borrow=100.0):
+    return VectorizedLendingPool(
+        [f"0xB{i}" for i in range(size)],
+        liquidity=1_000.0,
+        nft_price=1_000.0,
+        max_total_borrow=max_total_borrow,
+    )
+
+
+def test_global_cap_skips_rejected_borrows():
+    pool = make_pool()
+    idx = pool.indices(pool.borrowers)
+
+    borrowed = pool.borrow_many(idx, np.array([80.0, 50.0, 10.0]))
+
+    # 50 ne tient pas sous le plafond, 10 oui (80 + 10 <= 100)
+    assert borrowed.tolist() == [80.0, 0.0, 10.0]
+    assert pool.total_borrowed == 90.0
+
+
+def test_ltv_rejection_does_not_consume_cap():
+    pool = make_pool()
+    idx = pool.indices(pool.borrowers)
+    too_much = pool.max_borrows(idx[:1])[0] * 2
+
+    borrowed = pool.borrow_many(idx, np.array([too_much, 60.0, 40.0]))
+
+    assert borrowed.tolist() == [0.0, 60.0, 40.0]
+
+
+def test_cooldown_rejection_does_not_consume_cap():
+    pool = make_pool(size=2)
+    idx = pool.indices(pool.borrowers)
+    pool.borrow_many(idx[:1], np.array([10.0]))
+
+    borrowed = pool.borrow_many(idx, np.array([80.0, 90.0]))
+
+    assert borrowed.tolist() == [0.0, 90.0]
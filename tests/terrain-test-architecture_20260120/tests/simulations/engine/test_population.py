@@ -0,0 +1,39 @@
+import pytest
+
+from tests.simulations.engine.population import PopulationEngine, UserPopulation
+
+
+def make_engine(**kwargs):
+    return PopulationEngine(
+        total_users=60_000,
+        ticks=20,
+        chunk_size=20_000,
+        seed=7,
+        market_volatility=0.2,
+        **kwargs
+    )
+
+
+def test_bounds_hold_on_volatile_market():
+    counters = make_engine().run()
+
+    assert counters["bound_violations"] == 0
+    assert counters["liquidations"] > 0
+
+
+def test_same_seed_same_counters_serial_and_parallel():
+    serial = make_engine().run(workers=1)
+    parallel = make_engine().run(workers=2)
+
+    serial.pop("user_actions_per_second")
+    parallel.pop("user_actions_per_second")
+    assert serial == parallel
+
+
+def test_bound_violation_raises(monkeypatch):
+    monkeypatch.setattr(UserPopulation, "check_bounds", lambda *args: 1)
+
+    with pytest.raises(AssertionError):
+        make_engine().run()
+
+    assert make_engine(bounded=False).run()["bound_violations"] == 0
@@ -0,0 +1,37 @@
+import pickle
+
+from tests.simulations.engine.simulation_engine import SimulationEngine
+
+
+class Counter:
+    def __init__(self):
+        self.ticks = []
+
+    def on_tick(self, engine):
+        self.ticks.append(engine.current_time())
+
+
+def test_protocol_clock_is_picklable_and_not_injected():
+    protocol = {"pool": {"liquidity": 100}}
+    engine = SimulationEngine(protocol=protocol)
+
+    assert "time" not in protocol
+    engine.run(3)
+    clock = pickle.loads(pickle.dumps(engine.context.protocol["time"]))
+    assert clock() == 3
+
+
+def test_run_keeps_remainder_of_tick():
+    engine = SimulationEngine(tick_size=2)
+    agent = engine.register_agent(Counter())
+    fired = []
+    engine.schedule_event(5, lambda context, payload: fired.append(payload), payload="late")
+
+    engine.run(5)
+    assert engine.current_time() == 5
+    assert agent.ticks == [2, 4]
+    assert fired == ["late"]
+
+    engine.run(1)
+    assert engine.current_time() == 6
+    assert agent.ticks == [2, 4, 6]
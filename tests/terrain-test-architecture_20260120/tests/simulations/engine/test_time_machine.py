@@ -0,0 +1,111 @@
+from tests.simulations.engine.cow_state import CowState
+from tests.simulations.engine.event_scheduler import EventScheduler
+from tests.simulations.engine.simulation_engine import SimulationContext
+from tests.simulations.engine.time_machine import TimeMachine
+
+
+class Withdraw:
+    """
+    Agent planifié : retire de la liquidité du pool du contexte.
+    """
+
+    def __init__(self, context, amount):
+        self.context = context
+        self.amount = amount
+
+    def __call__(self):
+        self.context.protocol["pool"]["liquidity"] -= self.amount
+
+
+def make_machine():
+    context = SimulationContext(
+        protocol={"pool": {"liquidity": 100}},
+        state={"positions": {"alice": {"debt": 1}}},
+    )
+    scheduler = EventScheduler()
+    scheduler.schedule_at(1, Withdraw(context, 10), "withdraw")
+    return TimeMachine(scheduler, context)
+
+
+def test_fork_does_not_leak_into_parent():
+    machine = make_machine()
+    snapshot = machine.snapshot()
+
+    first = machine.fork_from_snapshot(snapshot)
+    first.advance(1)
+    second = machine.fork_from_snapshot(snapshot)
+    second.advance(1)
+
+    assert first.context.protocol["pool"]["liquidity"] == 90
+    assert second.context.protocol["pool"]["liquidity"] == 90
+    assert machine.context.protocol["pool"]["liquidity"] == 100
+
+
+def test_shared_fork_is_explicit_opt_in():
+    machine = make_machine()
+    fork = machine.fork_from_snapshot(machine.snapshot(), share_objects=True)
+
+    assert fork.context.protocol is machine.context.protocol
+
+
+def test_fork_state_is_isolated():
+    machine = make_machine()
+    snapshot = machine.snapshot()
+    fork = machine.fork_from_snapshot(snapshot)
+
+    fork.context.state.mutable("positions")["alice"]["debt"] = 5
+
+    assert machine.context.state["positions"]["alice"]["debt"] == 1
+    assert snapshot.simulation_state["positions"]["alice"]["debt"] == 1
+
+
+def test_nested_mutable_edit_keeps_snapshot():
+    state = CowState({"pool": {"reserves": {"eth": 10}}})
+    snapshot = state.snapshot()
+
+    state.mutable("pool")["reserves"]["eth"] = 0
+
+    assert snapshot["pool"]["reserves"]["eth"] == 10
+    state.restore(snapshot)
+    assert state["pool"]["reserves"]["eth"] == 10
+
+
+def test_metrics_snapshot_keeps_series_bounds():
+    machine = make_machine()
+    metrics = machine.context.metrics
+    for t in range(10):
+        metrics.record("hf", t, 2.0 - t / 10)
+    metrics.inc("borrows")
+
+    snapshot = machine.snapshot()
+    expected = metrics.time_series.get("hf").to_dict()
+
+    # same bucket aggregated in place, new buckets, column growth
+    metrics.record("hf", 9, 0.1)
+    for t in range(10, 3_000):
+        metrics.record("hf", t, 1.0)
+    metrics.record("other", 0, 1.0)
+    metrics.inc("borrows")
+
+    machine.restore(snapshot)
+    restored = machine.context.metrics
+    assert restored.time_series.get("hf").to_dict() == expected
+    assert "other" not in restored.time_series
+    assert restored.counters["borrows"] == 1
+
+    # the restored registry writes into its own columns
+    restored.record("hf", 9, 0.5)
+    fork = machine.fork_from_snapshot(snapshot)
+    assert fork.context.metrics.time_series.get("hf").to_dict() == expected
+    assert fork.context.metrics is not restored
+
+
+def test_metrics_snapshot_does_not_copy_columns():
+    machine = make_machine()
+    metrics = machine.context.metrics
+    metrics.record("hf", 0, 1.0)
+
+    _, size, columns, _ = machine.snapshot().metrics._series_bounds["hf"]
+
+    assert size == 1
+    assert columns[0] is metrics.time_series.get("hf")._time
@@ -11,11 +11,21 @@ Utilisé pour :
 - fuzz temporel
 - scénarios alternatifs
 - replay déterministe
+
+L'état et les métriques (dict) sont convertis en CowState :
+snapshot en O(1), restore proportionnel aux modifications
+depuis le snapshot, forks à partage structurel. Un
+MetricsRegistry est figé par les bornes de ses séries
+(snapshot en O(séries), copie des colonnes au restore).
+Le protocole et les agents sont copiés en profondeur à chaque fork.
 """
 
 import copy
 from typing import Any, Dict
 
+from tests.simulations.engine.cow_state import CowState
+from tests.simulations.engine.metrics import FrozenMetrics, MetricsRegistry
+
 
 # ============================================================
 # Time snapshot
@@ -59,6 +69,11 @@ class TimeMachine:
         self.context = context
         self.snapshots = []
 
+        if isinstance(context.state, dict):
+            context.state = CowState(context.state)
+        if isinstance(context.metrics, dict):
+            context.metrics = CowState(context.metrics)
+
     # ------------------
     # Time travel
     # ------------------
@@ -82,9 +97,9 @@ class TimeMachine:
         """
         snap = TimeSnapshot(
             timestamp=self.scheduler.current_time,
-            scheduler_state=copy.deepcopy(self.scheduler),
-            simulation_state=copy.deepcopy(self.context.state),
-            metrics=copy.deepcopy(self.context.metrics),
+            scheduler_state=self.scheduler.clone(),
+            simulation_state=_freeze(self.context.state),
+            metrics=_freeze(self.context.metrics),
         )
 
         self.snapshots.append(snap)
@@ -94,23 +109,48 @@ class TimeMachine:
         """
         Restaure un snapshot précédent.
         """
-        self.scheduler = copy.deepcopy(snapshot.scheduler_state)
-        self.context.state = copy.deepcopy(snapshot.simulation_state)
-        self.context.metrics = copy.deepcopy(snapshot.metrics)
+        self.scheduler = snapshot.scheduler_state.clone()
+        self.context.state = _thaw(self.context.state, snapshot.simulation_state)
+        self.context.metrics = _thaw(self.context.metrics, snapshot.metrics)
 
     # ------------------
     # Branching
     # ------------------
 
-    def fork_from_snapshot(self, snapshot: TimeSnapshot):
+    def fork_from_snapshot(
+        self,
+        snapshot: TimeSnapshot,
+        share_objects: bool = False
+    ):
         """
         Crée une nouvelle TimeMachine à partir d'un snapshot.
-        """
-        forked_scheduler = copy.deepcopy(snapshot.scheduler_state)
-        forked_context = copy.deepcopy(self.context)
 
-        forked_context.state = copy.deepcopy(snapshot.simulation_state)
-        forked_context.metrics = copy.deepcopy(snapshot.metrics)
+        L'état et les métriques partagent les couches du snapshot.
+        Le reste du contexte (protocole, agents) et les événements
+        planifiés sont copiés en profondeur, avec un même memo :
+        les callbacks du fork pointent vers les objets du fork.
+
+        share_objects=True : copie superficielle du contexte, le
+        protocole et les agents restent partagés avec le parent
+        (fork en lecture seule uniquement).
+        """
+        state = _thaw(None, snapshot.simulation_state)
+        metrics = _thaw(None, snapshot.metrics)
+
+        if share_objects:
+            forked_scheduler = snapshot.scheduler_state.clone()
+            forked_context = copy.copy(self.context)
+        else:
+            # l'état vivant du parent est remplacé par celui du fork
+            memo = {
+                id(self.context.state): state,
+                id(self.context.metrics): metrics,
+            }
+            forked_context = copy.deepcopy(self.context, memo)
+            forked_scheduler = copy.deepcopy(snapshot.scheduler_state, memo)
+
+        forked_context.state = state
+        forked_context.metrics = metrics
 
         return TimeMachine(
             scheduler=forked_scheduler,
@@ -127,4 +167,31 @@ class TimeMachine:
     def last_snapshot(self) -> TimeSnapshot:
         if not self.snapshots:
             return None
-        return self.snapshots[-1]
\ No newline at end of file
+        return self.snapshots[-1]
+
+
+# ============================================================
+# State helpers
+# ============================================================
+
+def _freeze(value):
+    if isinstance(value, CowState):
+        return value.snapshot()
+    if isinstance(value, MetricsRegistry):
+        return value.freeze()
+    return copy.deepcopy(value)
+
+
+def _thaw(current, frozen):
+    """
+    État vivant à partir d'un snapshot : réutilise l'état
+    courant si possible (restore), sinon nouvelle couche (fork).
+    """
+    if isinstance(frozen, CowState):
+        if isinstance(current, CowState):
+            current.restore(frozen)
+            return current
+        return frozen.fork()
+    if isinstance(frozen, FrozenMetrics):
+        return frozen.thaw()
+    return copy.deepcopy(frozen)
@@ -0,0 +1,194 @@
+"""
+Streaming Aggregates
+--------------------
+
+Agrégats en mémoire constante et fusionnables
+pour les métriques de simulation :
+
+- StreamingStats : count, sum, min, max, moyenne / variance (Welford)
+- DDSketch       : quantiles à erreur relative bornée
+
+Chaque agrégat se met à jour en O(1) et se fusionne avec
+un autre (shards par thread ou par processus).
+"""
+
+import math
+from typing import Dict
+
+
+# ============================================================
+# Streaming statistics
+# ============================================================
+
+class StreamingStats:
+    """
+    Statistiques exactes en une passe (algorithme de Welford).
+    """
+
+    __slots__ = ("count", "total", "min", "max", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "StreamingStats"):
+        """
+        Fusion parallèle (Chan et al.).
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.total = other.total
+            self.min = other.min
+            self.max = other.max
+            self.mean = other.mean
+            self._m2 = other._m2
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+# ============================================================
+# DDSketch
+# ============================================================
+
+class DDSketch:
+    """
+    Sketch de quantiles à erreur relative `relative_accuracy`.
+
+    Les valeurs sont rangées dans des buckets logarithmiques ;
+    deux sketches de même précision se fusionnent par addition
+    des buckets. Au-delà de `max_bins` buckets, les plus bas
+    sont regroupés (seuls les petits quantiles perdent en précision).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    # ------------------
+    # Updates
+    # ------------------
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float):
+        self.count += 1
+
+        if value > 0:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+            if len(self.positive) > self.max_bins:
+                _collapse(self.positive, self.max_bins, lowest=True)
+        elif value < 0:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+            if len(self.negative) > self.max_bins:
+                _collapse(self.negative, self.max_bins, lowest=False)
+        else:
+            self.zero_count += 1
+
+    def merge(self, other: "DDSketch"):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        for key, n in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + n
+        for key, n in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + n
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+        if len(self.positive) > self.max_bins:
+            _collapse(self.positive, self.max_bins, lowest=True)
+        if len(self.negative) > self.max_bins:
+            _collapse(self.negative, self.max_bins, lowest=False)
+
+    # ------------------
+    # Queries
+    # ------------------
+
+    def quantile(self, q: float):
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be in [0, 1]")
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # du plus négatif au plus positif
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+
+        return self._value(max(self.positive))
+
+
+def _collapse(bins: Dict[int, int], max_bins: int, lowest: bool):
+    """
+    Regroupe les buckets extrêmes dans le premier bucket conservé.
+    """
+    keys = sorted(bins, reverse=not lowest)
+    excess = keys[:len(keys) - max_bins + 1]
+    target = keys[len(excess)]
+
+    for key in excess:
+        bins[target] += bins.pop(key)
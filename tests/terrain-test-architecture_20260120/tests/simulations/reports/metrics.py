@@ -1,44 +1,154 @@
 # tests/simulations/metrics.py
 
+import threading
 import time
 import numpy as np
+from types import MappingProxyType
 from collections import defaultdict
 
+from tests.simulations.reports.aggregates import StreamingStats, DDSketch
+
+
+QUANTILES = (0.50, 0.95, 0.99)
+
+
+class MetricsShard:
+    """
+    Shard de métriques possédé par un seul thread (ou processus).
+
+    Un shard n'est écrit que par son propriétaire, mais `merge`
+    le lit depuis un autre thread : le verrou du shard est pris
+    par les écritures (jamais contendu hors fusion) et par la
+    lecture dans `merge`, qui voit donc un état cohérent.
+    Picklable (sans le verrou), pour être renvoyé par un worker.
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.stats = {}
+        self.sketches = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def inc(self, key: str, value: int = 1):
+        with self._lock:
+            self.counters[key] += value
+
+    def record(self, key: str, value: float):
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = StreamingStats()
+                self.sketches[key] = DDSketch()
+            stats.add(value)
+            self.sketches[key].add(value)
+
+    def merge(self, other: "MetricsShard"):
+        """
+        Fusionne `other` dans ce shard (appelé par le propriétaire de self).
+        """
+        with other._lock:
+            for key, value in other.counters.items():
+                self.counters[key] += value
+
+            for key, stats in other.stats.items():
+                if key not in self.stats:
+                    self.stats[key] = StreamingStats()
+                    self.sketches[key] = DDSketch()
+                self.stats[key].merge(stats)
+                self.sketches[key].merge(other.sketches[key])
+
 
 class MetricsCollector:
     """
     Collecteur central de métriques du protocole
     (économiques, sécurité, stress, cartographie 3D)
+
+    Mémoire constante : chaque métrique est un agrégat en flux
+    (count, sum, min, max, variance, sketch de quantiles).
+    Un shard par thread : `record` et `inc` sont en O(1), sous le
+    verrou du shard (non contendu hors fusion) ; `snapshot` et
+    `export` fusionnent les shards en O(shards).
     """
 
     def __init__(self):
         self.start_time = time.time()
 
-        self.counters = defaultdict(int)
-        self.values = defaultdict(list)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
         self.snapshots = []
 
         # Terrain / NFT metrics
         self.terrain_maps = []
 
+    # -----------------------------
+    # SHARDS
+    # -----------------------------
+
+    def _shard(self) -> MetricsShard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = MetricsShard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def merge_shard(self, shard: MetricsShard):
+        """
+        Intègre un shard produit ailleurs (ex : processus worker).
+        """
+        with self._shards_lock:
+            self._shards.append(shard)
+
+    def merged(self) -> MetricsShard:
+        total = MetricsShard()
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+    @property
+    def counters(self) -> MappingProxyType:
+        """
+        Vue en lecture seule des compteurs fusionnés.
+
+        Les compteurs vivent dans les shards : une affectation
+        (`counters[k] += 1`) lève TypeError, utiliser inc().
+        """
+        return MappingProxyType(dict(self.merged().counters))
+
     # -----------------------------
     # BASIC METRICS
     # -----------------------------
 
     def inc(self, key: str, value: int = 1):
-        self.counters[key] += value
+        self._shard().inc(key, value)
 
     def record(self, key: str, value: float):
-        self.values[key].append(value)
+        self._shard().record(key, value)
 
     def snapshot(self, label: str):
+        merged = self.merged()
         self.snapshots.append({
             "time": time.time() - self.start_time,
             "label": label,
-            "counters": dict(self.counters),
+            "counters": dict(merged.counters),
             "averages": {
-                k: float(np.mean(v)) if v else 0.0
-                for k, v in self.values.items()
+                k: float(s.mean) if s.count else 0.0
+                for k, s in merged.stats.items()
             }
         })
 
@@ -66,17 +176,25 @@ class MetricsCollector:
     # -----------------------------
 
     def export(self) -> dict:
+        merged = self.merged()
         return {
             "runtime": time.time() - self.start_time,
-            "counters": dict(self.counters),
+            "counters": dict(merged.counters),
             "metrics": {
                 k: {
-                    "avg": float(np.mean(v)),
-                    "min": float(np.min(v)),
-                    "max": float(np.max(v)),
+                    "count": s.count,
+                    "sum": float(s.total),
+                    "avg": float(s.mean),
+                    "min": float(s.min),
+                    "max": float(s.max),
+                    "std": float(s.std),
+                    **{
+                        f"p{int(q * 100)}": merged.sketches[k].quantile(q)
+                        for q in QUANTILES
+                    },
                 }
-                for k, v in self.values.items()
+                for k, s in merged.stats.items()
             },
             "terrain_maps": self.terrain_maps,
             "snapshots": self.snapshots
-  }
+        }
@@ -14,6 +14,8 @@ Cible :
 
 from typing import Dict, Any
 
+from tests.simulations.reports.time_series import TimeSeries
+
 
 class SimulationReportGenerator:
     """
@@ -57,28 +59,29 @@ class SimulationReportGenerator:
     # Time series helpers
     # ------------------
 
-    def _max_in_series(self, name: str):
-        series = self.metrics.get("time_series", {}).get(name, [])
-        if not series:
+    def _series(self, name: str):
+        """
+        Série colonnaire (TimeSeries) ; les anciens snapshots
+        en liste de points {"value": ...} sont convertis.
+        """
+        series = self.metrics.get("time_series", {}).get(name)
+        if series is None:
             return None
-        return max(point["value"] for point in series)
+        if not isinstance(series, TimeSeries):
+            series = TimeSeries.from_points(series)
+        return series if len(series) else None
+
+    def _max_in_series(self, name: str):
+        series = self._series(name)
+        return series.max() if series is not None else None
 
     def _min_in_series(self, name: str):
-        series = self.metrics.get("time_series", {}).get(name, [])
-        if not series:
-            return None
-        return min(point["value"] for point in series)
+        series = self._series(name)
+        return series.min() if series is not None else None
 
     def _price_drawdown(self):
-        series = self.metrics.get("time_series", {}).get("nft_price", [])
-        if not series:
-            return None
-
-        prices = [p["value"] for p in series]
-        peak = max(prices)
-        trough = min(prices)
-
-        return (peak - trough) / peak if peak > 0 else None
+        series = self._series("nft_price")
+        return series.drawdown() if series is not None else None
 
     # ------------------
     # Full report
@@ -91,5 +94,21 @@ class SimulationReportGenerator:
         return {
             "summary": self.executive_summary(),
             "risk_metrics": self.risk_metrics(),
-            "raw_metrics": self.metrics,
+            "raw_metrics": self._raw_metrics(),
+        }
+
+    def _raw_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot sérialisable en JSON (TimeSeries -> to_dict()).
+        """
+        time_series = self.metrics.get("time_series")
+        if not time_series:
+            return self.metrics
+
+        return {
+            **self.metrics,
+            "time_series": {
+                name: series.to_dict() if isinstance(series, TimeSeries) else series
+                for name, series in time_series.items()
+            },
         }
\ No newline at end of file
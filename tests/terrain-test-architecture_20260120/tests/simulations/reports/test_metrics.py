@@ -0,0 +1,65 @@
+import pickle
+import threading
+
+import pytest
+
+from tests.simulations.reports.metrics import MetricsCollector, MetricsShard
+
+
+def test_counters_are_read_only():
+    metrics = MetricsCollector()
+    metrics.inc("borrows")
+
+    with pytest.raises(TypeError):
+        metrics.counters["borrows"] += 1
+
+    assert metrics.counters["borrows"] == 1
+
+
+def test_counters_merge_thread_shards():
+    metrics = MetricsCollector()
+
+    def work():
+        for _ in range(1_000):
+            metrics.inc("repays")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.counters["repays"] == 4_000
+    assert metrics.export()["counters"]["repays"] == 4_000
+
+
+def test_merge_waits_for_the_owner_write():
+    shard = MetricsShard()
+    shard.inc("borrows")
+    total = MetricsShard()
+
+    # the owner is mid-write: merge must not read the shard meanwhile
+    shard._lock.acquire()
+    merger = threading.Thread(target=total.merge, args=(shard,))
+    merger.start()
+    merger.join(timeout=0.1)
+    assert merger.is_alive()
+
+    shard.counters["borrows"] += 1
+    shard._lock.release()
+    merger.join()
+    assert total.counters["borrows"] == 2
+
+
+def test_shards_survive_pickling():
+    shard = MetricsShard()
+    shard.inc("borrows", 3)
+    shard.record("hf", 1.5)
+
+    restored = pickle.loads(pickle.dumps(shard))
+    restored.inc("borrows")
+
+    metrics = MetricsCollector()
+    metrics.merge_shard(restored)
+    assert metrics.counters["borrows"] == 4
+    assert metrics.export()["metrics"]["hf"]["count"] == 1
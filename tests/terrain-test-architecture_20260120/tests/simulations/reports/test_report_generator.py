@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from tests.simulations.reports.report_generator import SimulationReportGenerator
+from tests.simulations.reports.time_series import TimeSeries
+
+
+def test_report_with_time_series_is_json_serializable():
+    prices = TimeSeries(bucket_width=10)
+    for t, price in enumerate([100, 120, 90, 110]):
+        prices.record(t, price)
+
+    report = SimulationReportGenerator({
+        "counters": {"liquidations": 3},
+        "time_series": {"nft_price": prices},
+    }).generate()
+
+    encoded = json.loads(json.dumps(report))
+    assert encoded["raw_metrics"]["time_series"]["nft_price"]["max"] == [120.0]
+    assert report["risk_metrics"]["price_drawdown"] == pytest.approx(0.25)
+
+
+def test_drawdown_ignores_rise_after_trough_in_same_bucket():
+    series = TimeSeries(bucket_width=10)
+    for t, price in enumerate([100, 50, 200]):
+        series.record(t, price)
+
+    # creux (50) avant le pic (200) : drawdown 50 %, pas 75 %
+    assert series.drawdown() == pytest.approx(0.5)
+
+
+def test_drawdown_across_buckets():
+    series = TimeSeries(bucket_width=10)
+    series.record(0, 100)
+    series.record(5, 80)
+    series.record(10, 120)
+    series.record(15, 60)
+
+    assert series.drawdown() == pytest.approx(0.5)
+    assert series.range(10, 19).drawdown() == pytest.approx(0.5)
+    assert series.range(0, 9).drawdown() == pytest.approx(0.2)
+
+
+def test_record_many_points_are_simultaneous():
+    series = TimeSeries(bucket_width=10)
+    series.record_many(0, [1.0, 3.0, 2.0])
+
+    assert series.drawdown() == 0.0
+    series.record(1, 1.5)
+    assert series.drawdown() == pytest.approx(0.5)
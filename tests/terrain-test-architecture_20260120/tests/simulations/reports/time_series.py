@@ -0,0 +1,290 @@
+"""
+Time Series Store
+-----------------
+
+Stockage colonnaire des séries temporelles de simulation.
+
+Chaque série est agrégée en buckets de temps fixes
+(min, max, somme, count, drawdown interne) dans des tableaux
+NumPy préalloués :
+une simulation longue produit une série compacte, et les
+requêtes (range, max, min, drawdown) sont vectorisées.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+DEFAULT_CAPACITY = 1_024
+
+_COLUMNS = ("_time", "_min", "_max", "_sum", "_count", "_dd")
+
+
+# ============================================================
+# Time series
+# ============================================================
+
+class TimeSeries:
+    """
+    Série downsamplée en buckets de `bucket_width` unités de temps.
+
+    Les points doivent arriver dans l'ordre chronologique
+    (temps simulé monotone).
+    """
+
+    def __init__(self, bucket_width: int = 1, capacity: int = DEFAULT_CAPACITY):
+        if bucket_width <= 0:
+            raise ValueError("bucket_width must be > 0")
+
+        self.bucket_width = bucket_width
+        self._size = 0
+
+        self._time = np.empty(capacity, dtype=np.int64)
+        self._min = np.empty(capacity, dtype=np.float64)
+        self._max = np.empty(capacity, dtype=np.float64)
+        self._sum = np.empty(capacity, dtype=np.float64)
+        self._count = np.empty(capacity, dtype=np.int64)
+        self._dd = np.empty(capacity, dtype=np.float64)
+
+    # ------------------
+    # Storage
+    # ------------------
+
+    def _grow(self, needed: int):
+        capacity = len(self._time)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def __len__(self):
+        return self._size
+
+    # ------------------
+    # Recording
+    # ------------------
+
+    def record(self, timestamp: int, value: float):
+        bucket = (int(timestamp) // self.bucket_width) * self.bucket_width
+        i = self._size - 1
+
+        if i >= 0 and self._time[i] == bucket:
+            # _max est le pic des points déjà reçus dans le bucket :
+            # le drawdown interne suit l'ordre d'arrivée
+            peak = self._max[i]
+            if peak > 0 and (peak - value) / peak > self._dd[i]:
+                self._dd[i] = (peak - value) / peak
+            if value < self._min[i]:
+                self._min[i] = value
+            if value > self._max[i]:
+                self._max[i] = value
+            self._sum[i] += value
+            self._count[i] += 1
+            return
+
+        if i >= 0 and bucket < self._time[i]:
+            raise ValueError("Time series points must be recorded in time order")
+
+        self._grow(self._size + 1)
+        i = self._size
+        self._time[i] = bucket
+        self._min[i] = value
+        self._max[i] = value
+        self._sum[i] = value
+        self._count[i] = 1
+        self._dd[i] = 0.0
+        self._size += 1
+
+    def record_many(self, timestamp: int, values: np.ndarray):
+        """
+        Plusieurs points au même instant (ex : un HF par borrower).
+
+        Points simultanés : pas de drawdown entre eux, seulement
+        depuis les points précédents du bucket.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+
+        low = float(values.min())
+
+        # bucket créé / mis à jour avec le min, puis le reste agrégé
+        self.record(timestamp, low)
+        i = self._size - 1
+        self._max[i] = max(self._max[i], float(values.max()))
+        self._sum[i] += float(values.sum()) - low
+        self._count[i] += values.size - 1
+
+    # ------------------
+    # Snapshots
+    # ------------------
+
+    def bounds(self) -> tuple:
+        """
+        Snapshot en O(1) : colonnes partagées, taille, copie du dernier bucket.
+
+        Les points arrivent dans l'ordre : seul le dernier bucket peut
+        encore être agrégé en place, les précédents ne sont plus écrits
+        (et _grow réalloue sans toucher aux anciennes colonnes).
+        """
+        columns = tuple(getattr(self, name) for name in _COLUMNS)
+        last = tuple(c[self._size - 1] for c in columns) if self._size else None
+        return (self.bucket_width, self._size, columns, last)
+
+    @classmethod
+    def from_bounds(cls, bounds: tuple) -> "TimeSeries":
+        """
+        Série vivante à partir de bounds() (copie des buckets, O(taille)).
+        """
+        bucket_width, size, columns, last = bounds
+        series = cls(bucket_width, capacity=max(2 * size, DEFAULT_CAPACITY))
+
+        for name, column in zip(_COLUMNS, columns):
+            getattr(series, name)[:size] = column[:size]
+        if size:
+            for name, value in zip(_COLUMNS, last):
+                getattr(series, name)[size - 1] = value
+
+        series._size = size
+        return series
+
+    @classmethod
+    def from_points(cls, points: Iterable[dict], bucket_width: int = 1):
+        """
+        Conversion depuis l'ancien format [{"time": t, "value": v}, ...].
+        """
+        series = cls(bucket_width=bucket_width)
+        for n, point in enumerate(points):
+            series.record(point.get("time", n), point["value"])
+        return series
+
+    # ------------------
+    # Columns
+    # ------------------
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._time[:self._size]
+
+    @property
+    def mins(self) -> np.ndarray:
+        return self._min[:self._size]
+
+    @property
+    def maxs(self) -> np.ndarray:
+        return self._max[:self._size]
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._count[:self._size]
+
+    @property
+    def means(self) -> np.ndarray:
+        return self._sum[:self._size] / self._count[:self._size]
+
+    # ------------------
+    # Queries
+    # ------------------
+
+    def range(self, start: Optional[int] = None, end: Optional[int] = None) -> "TimeSeries":
+        """
+        Sous-série des buckets dans [start, end] (vue, sans copie).
+        """
+        times = self.times
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = self._size if end is None else int(np.searchsorted(times, end, side="right"))
+
+        view = TimeSeries.__new__(TimeSeries)
+        view.bucket_width = self.bucket_width
+        view._size = max(hi - lo, 0)
+        view._time = self._time[lo:hi]
+        view._min = self._min[lo:hi]
+        view._max = self._max[lo:hi]
+        view._sum = self._sum[lo:hi]
+        view._count = self._count[lo:hi]
+        view._dd = self._dd[lo:hi]
+        return view
+
+    def max(self) -> Optional[float]:
+        return float(self.maxs.max()) if self._size else None
+
+    def min(self) -> Optional[float]:
+        return float(self.mins.min()) if self._size else None
+
+    def drawdown(self) -> Optional[float]:
+        """
+        Max drawdown : plus forte baisse relative depuis un pic antérieur.
+
+        Le max et le min d'un bucket ne sont pas ordonnés entre eux :
+        - entre buckets : pic = max des buckets strictement précédents,
+          creux = min du bucket
+        - dans un bucket : drawdown calculé à l'enregistrement
+        """
+        if not self._size:
+            return None
+
+        peaks = np.empty(self._size, dtype=np.float64)
+        peaks[0] = -np.inf
+        np.maximum.accumulate(self.maxs[:-1], out=peaks[1:])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            across = np.where(peaks > 0, (peaks - self.mins) / peaks, 0.0)
+        return float(max(across.max(), self._dd[:self._size].max(), 0.0))
+
+    def to_dict(self) -> Dict[str, list]:
+        return {
+            "time": self.times.tolist(),
+            "min": self.mins.tolist(),
+            "max": self.maxs.tolist(),
+            "mean": self.means.tolist(),
+            "count": self.counts.tolist(),
+        }
+
+
+# ============================================================
+# Store
+# ============================================================
+
+class TimeSeriesStore:
+    """
+    Ensemble de séries nommées, même largeur de bucket.
+    """
+
+    def __init__(self, bucket_width: int = 1):
+        self.bucket_width = bucket_width
+        self.series: Dict[str, TimeSeries] = {}
+
+    def _get(self, name: str) -> TimeSeries:
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = TimeSeries(self.bucket_width)
+        return series
+
+    def record(self, name: str, timestamp: int, value: float):
+        self._get(name).record(timestamp, value)
+
+    def record_many(self, name: str, timestamp: int, values: np.ndarray):
+        self._get(name).record_many(timestamp, values)
+
+    def bounds(self) -> Dict[str, tuple]:
+        return {name: series.bounds() for name, series in self.series.items()}
+
+    @classmethod
+    def from_bounds(cls, bucket_width: int, bounds: Dict[str, tuple]) -> "TimeSeriesStore":
+        store = cls(bucket_width=bucket_width)
+        store.series = {
+            name: TimeSeries.from_bounds(b) for name, b in bounds.items()
+        }
+        return store
+
+    def get(self, name: str) -> Optional[TimeSeries]:
+        return self.series.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.series
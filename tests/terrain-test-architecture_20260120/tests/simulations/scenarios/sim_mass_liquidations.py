@@ -7,11 +7,17 @@ Analyse les cascades de liquidations et la résilience
 du pool de lending sous stress extrême.
 """
 
+import numpy as np
+
 from tests.simulations.engine.simulation_engine import SimulationEngine
+from tests.simulations.engine.liquidation_cascade import MAX_CASCADE_ROUNDS
 from tests.simulations.engine.metrics import MetricsRegistry
 from tests.simulations.reports.report_generator import SimulationReportGenerator
 
 
+DEFAULT_CRASH_DEPTH = 0.5
+
+
 # ============================================================
 # Borrower swarm agent
 # ============================================================
@@ -42,17 +48,31 @@ class BorrowerSwarmAgent:
     def open_positions(self, context, _payload):
         pool = context.protocol["lending_pool"]
 
-        for user in self.borrowers:
-            max_borrow = pool.getMaxBorrow(user)
-            pool.borrow(user, max_borrow * 0.9)
+        if hasattr(pool, "borrow_many"):
+            # Pool vectorisé : toutes les positions en un lot
+            idx = pool.indices(self.borrowers)
+            borrowed = pool.borrow_many(idx, pool.max_borrows(idx) * 0.9)
+            context.metrics_registry.inc(
+                "borrow_events",
+                int(np.count_nonzero(borrowed))
+            )
+        else:
+            for user in self.borrowers:
+                max_borrow = pool.getMaxBorrow(user)
+                pool.borrow(user, max_borrow * 0.9)
 
-            context.metrics_registry.inc("borrow_events")
+                context.metrics_registry.inc("borrow_events")
 
         print(f"[MASS] {len(self.borrowers)} positions opened")
 
     def market_crash(self, context, _payload):
         # Le crash est abstrait : il se reflète dans le health factor
         context.state["market_crash"] = True
+
+        pool = context.protocol["lending_pool"]
+        if hasattr(pool, "apply_price_shock"):
+            depth = context.state.get("crash_depth", DEFAULT_CRASH_DEPTH)
+            pool.apply_price_shock(1 - depth)
         context.metrics_registry.inc("market_crashes")
 
         print("[MASS] Market crash triggered")
@@ -65,24 +85,76 @@ class BorrowerSwarmAgent:
 class LiquidatorSwarmAgent:
     """
     Groupe de liquidateurs traitant les positions insolvables.
+
+    depth_curve : DepthCurve optionnelle ; le collatéral saisi est
+    revendu et fait baisser le floor du pool (cascade, pool vectorisé).
     """
 
-    def __init__(self, capacity_per_tick=5):
+    def __init__(self, capacity_per_tick=5, depth_curve=None):
         self.capacity = capacity_per_tick
+        self.depth_curve = depth_curve
+        self.inventory = 0.0
+        self._impact = 1.0
+
+    def _apply_impact(self, pool):
+        # floor = prix fondamental * impact de l'inventaire vendu
+        fundamental = pool.nft_price / self._impact
+        self._impact = float(self.depth_curve.impact(self.inventory))
+        pool.setPrice(fundamental * self._impact)
+
+    def _liquidate_batch(self, engine: SimulationEngine, pool) -> int:
+        curve = self.depth_curve
+        if curve is not None:
+            self.inventory *= 1 - curve.absorption
+            self._apply_impact(pool)
+
+        total = 0
+
+        # Point fixe du bloc : ventes -> floor -> nouveaux HF < 1
+        for _ in range(MAX_CASCADE_ROUNDS):
+            liquidated = pool.liquidate_many(
+                worst_first=True,
+                limit=self.capacity - total
+            )
+            if not liquidated.size:
+                break
+
+            total += liquidated.size
+            if curve is None:
+                break
+
+            self.inventory += float(pool.collateral_units[liquidated].sum())
+            self._apply_impact(pool)
+
+        if curve is not None:
+            engine.context.metrics_registry.record(
+                "nft_price",
+                engine.current_time(),
+                pool.nft_price
+            )
+        return total
 
     def on_tick(self, engine: SimulationEngine):
         pool = engine.context.protocol["lending_pool"]
 
-        liquidated_this_tick = 0
+        if hasattr(pool, "liquidate_many"):
+            # Détection vectorisée + liquidation en lot
+            liquidated_this_tick = self._liquidate_batch(engine, pool)
+            engine.context.metrics_registry.inc(
+                "liquidations",
+                liquidated_this_tick
+            )
+        else:
+            liquidated_this_tick = 0
 
-        for borrower in pool.getUnderwaterBorrowers():
-            if liquidated_this_tick >= self.capacity:
-                break
+            for borrower in pool.getUnderwaterBorrowers():
+                if liquidated_this_tick >= self.capacity:
+                    break
 
-            pool.liquidate(borrower)
-            liquidated_this_tick += 1
+                pool.liquidate(borrower)
+                liquidated_this_tick += 1
 
-            engine.context.metrics_registry.inc("liquidations")
+                engine.context.metrics_registry.inc("liquidations")
 
         if liquidated_this_tick > 0:
             engine.context.metrics_registry.record(
@@ -96,7 +168,13 @@ class LiquidatorSwarmAgent:
 # Simulation runner
 # ============================================================
 
-def run_mass_liquidation_simulation(protocol, borrowers, duration=300):
+def run_mass_liquidation_simulation(
+    protocol,
+    borrowers,
+    duration=300,
+    liquidator_capacity=10,
+    depth_curve=None
+):
     """
     Lance la simulation de liquidations en masse.
     """
@@ -104,16 +182,22 @@ def run_mass_liquidation_simulation(protocol, borrowers, duration=300):
     engine = SimulationEngine(protocol=protocol)
     engine.context.metrics_registry = MetricsRegistry()
 
+    # Pool vectorisé : blocs (cooldowns, plafonds) = temps du moteur
+    pool = protocol["lending_pool"]
+    if hasattr(pool, "clock"):
+        pool.clock = engine.clock
+
     engine.register_agent(
         BorrowerSwarmAgent(borrowers)
     )
 
     engine.register_agent(
-        LiquidatorSwarmAgent(capacity_per_tick=10)
+        LiquidatorSwarmAgent(
+            capacity_per_tick=liquidator_capacity,
+            depth_curve=depth_curve
+        )
     )
 
-    pool = protocol["lending_pool"]
-
     # Initial metrics
     engine.context.metrics_registry.set_gauge(
         "initial_liquidity",
@@ -147,43 +231,38 @@ def run_mass_liquidation_simulation(protocol, borrowers, duration=300):
 # ============================================================
 
 if __name__ == "__main__":
-    # Mock protocol for standalone stress testing
-    class MockPool:
-        def __init__(self, borrowers):
-            self.borrowers = borrowers
-            self.liquidity = 2_000_000
-            self.underwater = set()
-
-        def totalLiquidity(self):
-            return self.liquidity
-
-        def isSolvent(self):
-            return self.liquidity > 0
-
-        def getMaxBorrow(self, _):
-            return 100_000
-
-        def borrow(self, user, amount):
-            self.liquidity -= amount
-            self.underwater.add(user)
-
-        def getUnderwaterBorrowers(self):
-            return list(self.underwater)
-
-        def liquidate(self, user):
-            if user in self.underwater:
-                self.underwater.remove(user)
-
-    borrowers = [f"0xB{i}" for i in range(30)]
-
-    protocol = {
-        "lending_pool": MockPool(borrowers)
-    }
+    import os
+    import time
+
+    from tests.simulations.engine.mock_pool import VectorizedLendingPool
+    from tests.simulations.engine.liquidation_cascade import DepthCurve
+
+    # Pool vectorisé : 1M borrowers par défaut
+    n_borrowers = int(os.getenv("MASS_BORROWERS", 1_000_000))
+    borrowers = [f"0xB{i}" for i in range(n_borrowers)]
+
+    rng = np.random.default_rng(42)
+    protocol = {}
+    protocol["lending_pool"] = VectorizedLendingPool(
+        borrowers,
+        liquidity=n_borrowers * 100_000,
+        nft_price=100_000,
+        collateral_units=rng.lognormal(0.0, 0.3, size=n_borrowers),
+        max_liquidations_per_block=n_borrowers // 20
+    )
 
+    started = time.time()
     report = run_mass_liquidation_simulation(
         protocol,
-        borrowers
+        borrowers,
+        liquidator_capacity=n_borrowers // 20,
+        depth_curve=DepthCurve(
+            marketplace_depth=n_borrowers / 10,
+            amm_reserve=n_borrowers / 25
+        )
     )
 
     print("\n=== MASS LIQUIDATION REPORT ===")
-    print(report)
\ No newline at end of file
+    print(report["summary"])
+    print(report["risk_metrics"])
+    print(f"{n_borrowers} borrowers in {time.time() - started:.2f}s")
@@ -11,6 +11,8 @@ Analyse l'impact des oscillations de prix sur :
 
 import random
 
+import numpy as np
+
 from tests.simulations.engine.simulation_engine import SimulationEngine
 from tests.simulations.engine.metrics import MetricsRegistry
 from tests.simulations.reports.report_generator import SimulationReportGenerator
@@ -23,21 +25,30 @@ from tests.simulations.reports.report_generator import SimulationReportGenerator
 class OracleVolatilityAgent:
     """
     Agent simulant une forte volatilité de prix NFT.
+
+    price_path : trajectoire pré-générée optionnelle (un prix par tick,
+    ex : une ligne de PricePathEngine) à la place de la marche aléatoire.
     """
 
-    def __init__(self, base_price, volatility_pct=0.15):
+    def __init__(self, base_price, volatility_pct=0.15, price_path=None):
         self.base_price = base_price
         self.volatility = volatility_pct
         self.current_price = base_price
+        self.price_path = price_path
+        self.step = 0
 
     def on_tick(self, engine: SimulationEngine):
-        # Random walk
-        delta = random.uniform(
-            -self.volatility,
-            self.volatility
-        )
+        if self.price_path is not None:
+            self.step = min(self.step + 1, len(self.price_path) - 1)
+            self.current_price = float(self.price_path[self.step])
+        else:
+            # Random walk
+            delta = random.uniform(
+                -self.volatility,
+                self.volatility
+            )
 
-        self.current_price *= (1 + delta)
+            self.current_price *= (1 + delta)
 
         oracle = engine.context.protocol["oracle"]
         oracle.setPrice(self.current_price)
@@ -60,23 +71,35 @@ class HealthMonitorAgent:
 
     def __init__(self, borrowers):
         self.borrowers = borrowers
+        self._indices = None
 
     def on_tick(self, engine: SimulationEngine):
         pool = engine.context.protocol["lending_pool"]
 
-        for user in self.borrowers:
-            hf = pool.healthFactor(user)
-
-            engine.context.metrics_registry.record(
-                "health_factor",
-                engine.current_time(),
-                hf
+        if hasattr(pool, "health_factors"):
+            # Pool vectorisé : HF de tous les borrowers en un calcul
+            if self._indices is None:
+                self._indices = pool.indices(self.borrowers)
+            health_factors = pool.health_factors(self._indices)
+        else:
+            health_factors = np.array(
+                [pool.healthFactor(user) for user in self.borrowers],
+                dtype=np.float64
             )
 
-            if hf < 1:
-                engine.context.metrics_registry.inc(
-                    "health_factor_below_one"
-                )
+        # Un seul point agrégé par tick (min / max / moyenne des HF)
+        engine.context.metrics_registry.record_many(
+            "health_factor",
+            engine.current_time(),
+            health_factors
+        )
+
+        below_one = int(np.count_nonzero(health_factors < 1))
+        if below_one:
+            engine.context.metrics_registry.inc(
+                "health_factor_below_one",
+                below_one
+            )
 
 
 # ============================================================
@@ -93,16 +116,23 @@ class OpportunisticLiquidatorAgent:
 
     def on_tick(self, engine: SimulationEngine):
         pool = engine.context.protocol["lending_pool"]
-        count = 0
 
-        for borrower in pool.getUnderwaterBorrowers():
-            if count >= self.capacity:
-                break
+        if hasattr(pool, "liquidate_many"):
+            count = pool.liquidate_many(
+                pool.underwater()[:self.capacity]
+            ).size
+            engine.context.metrics_registry.inc("liquidations", count)
+        else:
+            count = 0
 
-            pool.liquidate(borrower)
-            count += 1
+            for borrower in pool.getUnderwaterBorrowers():
+                if count >= self.capacity:
+                    break
 
-            engine.context.metrics_registry.inc("liquidations")
+                pool.liquidate(borrower)
+                count += 1
+
+                engine.context.metrics_registry.inc("liquidations")
 
         if count > 0:
             engine.context.metrics_registry.record(
@@ -120,7 +150,8 @@ def run_price_volatility_simulation(
     protocol,
     borrowers,
     base_price,
-    duration=300
+    duration=300,
+    price_path=None
 ):
     """
     Lance la simulation de volatilité des prix.
@@ -129,8 +160,13 @@ def run_price_volatility_simulation(
     engine = SimulationEngine(protocol=protocol)
     engine.context.metrics_registry = MetricsRegistry()
 
+    # Pool vectorisé : blocs (cooldowns, plafonds) = temps du moteur
+    pool = protocol["lending_pool"]
+    if hasattr(pool, "clock"):
+        pool.clock = engine.clock
+
     engine.register_agent(
-        OracleVolatilityAgent(base_price)
+        OracleVolatilityAgent(base_price, price_path=price_path)
     )
 
     engine.register_agent(
@@ -141,8 +177,6 @@ def run_price_volatility_simulation(
         OpportunisticLiquidatorAgent()
     )
 
-    pool = protocol["lending_pool"]
-
     # Initial metrics
     engine.context.metrics_registry.set_gauge(
         "initial_liquidity",
@@ -176,46 +210,30 @@ def run_price_volatility_simulation(
 # ============================================================
 
 if __name__ == "__main__":
-    # Minimal mock protocol for volatility research
-    class MockOracle:
-        def __init__(self):
-            self.price = 0
-
-        def setPrice(self, price):
-            self.price = price
-
-    class MockPool:
-        def __init__(self, borrowers):
-            self.borrowers = borrowers
-            self.liquidity = 1_200_000
-            self.underwater = set()
-
-        def totalLiquidity(self):
-            return self.liquidity
-
-        def isSolvent(self):
-            return self.liquidity > 0
-
-        def healthFactor(self, user):
-            # Simulate noisy HF
-            hf = random.uniform(0.7, 1.3)
-            if hf < 1:
-                self.underwater.add(user)
-            return hf
-
-        def getUnderwaterBorrowers(self):
-            return list(self.underwater)
-
-        def liquidate(self, user):
-            if user in self.underwater:
-                self.underwater.remove(user)
-
-    borrowers = [f"0xB{i}" for i in range(10)]
-
-    protocol = {
-        "oracle": MockOracle(),
-        "lending_pool": MockPool(borrowers)
-    }
+    from tests.simulations.engine.mock_pool import VectorizedLendingPool
+
+    # Pool vectorisé, qui sert aussi d'oracle (setPrice)
+    borrowers = [f"0xB{i}" for i in range(100_000)]
+
+    protocol = {}
+    pool = VectorizedLendingPool(
+        borrowers,
+        liquidity=len(borrowers) * 100_000,
+        nft_price=100_000,
+        collateral_units=np.random.default_rng(7).lognormal(
+            0.0, 0.3, size=len(borrowers)
+        ),
+        max_liquidations_per_block=1_000
+    )
+    protocol["oracle"] = pool
+    protocol["lending_pool"] = pool
+
+    # Positions ouvertes à 80-100% de la LTV
+    idx = pool.indices(borrowers)
+    pool.borrow_many(
+        idx,
+        pool.max_borrows(idx) * np.random.default_rng(8).uniform(0.8, 1.0, len(idx))
+    )
 
     report = run_price_volatility_simulation(
         protocol=protocol,
@@ -224,4 +242,5 @@ if __name__ == "__main__":
     )
 
     print("\n=== PRICE VOLATILITY REPORT ===")
-    print(report)
\ No newline at end of file
+    print(report["summary"])
+    print(report["risk_metrics"])